@@ -2,6 +2,13 @@ import pygame
 import json
 import os
 from core.camera import camera
+from core import image_loader
+from core.surface_cache import SurfaceCache, MB
+
+# Frame surfaces dipakai bersama oleh sprite dengan spritesheet yang sama
+# (misal banyak NPC dengan sprite sama): (path, x, y, w, h) -> surface
+frame_cache = SurfaceCache('sprite frames', max_bytes=32 * MB)
+
 
 class AnimatedSprite:
     """
@@ -47,7 +54,7 @@ class AnimatedSprite:
     def _load_aseprite_sprite(self, spritesheet_path, json_path):
         """Load spritesheet dan metadata dari Aseprite export"""
         # Load spritesheet image
-        self.spritesheet = pygame.image.load(spritesheet_path).convert_alpha()
+        self.spritesheet = image_loader.load_image(spritesheet_path)
 
         # Load JSON metadata
         with open(json_path, 'r') as f:
@@ -110,8 +117,12 @@ class AnimatedSprite:
             surf_list = []
             for frame_data in frames:
                 rect = frame_data['rect']
-                frame_surface = pygame.Surface((rect['w'], rect['h']), pygame.SRCALPHA)
-                frame_surface.blit(self.spritesheet, (0, 0), (rect['x'], rect['y'], rect['w'], rect['h']))
+                key = (spritesheet_path, rect['x'], rect['y'], rect['w'], rect['h'])
+                frame_surface = frame_cache.get(key)
+                if frame_surface is None:
+                    frame_surface = pygame.Surface((rect['w'], rect['h']), pygame.SRCALPHA)
+                    frame_surface.blit(self.spritesheet, (0, 0), (rect['x'], rect['y'], rect['w'], rect['h']))
+                    frame_cache.set(key, frame_surface)
                 surf_list.append(frame_surface)
             self.frame_surfaces[anim_name] = surf_list
         else:
@@ -249,7 +260,7 @@ class SimpleAnimatedSprite:
         self.frame_surfaces = []
         if os.path.exists(sprite_path):
             try:
-                self.spritesheet = pygame.image.load(sprite_path).convert_alpha()
+                self.spritesheet = image_loader.load_image(sprite_path)
                 self.using_fallback = False
                 # Pre-extract frames
                 for i in range(self.num_frames):
@@ -1,3 +1,4 @@
+import math
 import pygame
 
 
@@ -15,6 +16,73 @@ class Camera:
 camera = Camera()
 
 
+class NativeScaleView:
+	"""
+	Render world pada skala 1:1 ke surface internal, lalu resize ke layar
+	dengan satu scale/smoothscale per frame.
+
+	Selama begin()..end() camera.zoom = 1.0 dan camera.x/y dibulatkan ke
+	pixel, jadi map, NPC, player, dan particles tidak perlu hitung zoom
+	sendiri dan tidak ada jitter pembulatan antar tile/sprite.
+
+	Pemakaian:
+		world = view.begin(screen)
+		tiled_map.draw(world)
+		player.draw(world)
+		view.end(screen)
+	"""
+
+	def __init__(self, smooth=True):
+		self.smooth = smooth
+		self.world_surface = None
+		self._scaled_surface = None
+		self._saved = None
+
+	def begin(self, screen):
+		"""Siapkan world surface dan set camera ke zoom 1.0"""
+		zoom = max(1e-6, camera.zoom)
+		screen_w, screen_h = screen.get_size()
+		self._saved = (camera.x, camera.y, camera.width, camera.height, camera.zoom)
+		camera.x = math.floor(camera.x)
+		camera.y = math.floor(camera.y)
+		camera.zoom = 1.0
+
+		if abs(zoom - 1.0) < 1e-6:
+			# Tidak perlu scale: gambar langsung ke screen
+			return screen
+
+		# +1 untuk sisa pixel dari posisi kamera yang pecahan
+		size = (math.ceil(screen_w / zoom) + 1, math.ceil(screen_h / zoom) + 1)
+		if self.world_surface is None or self.world_surface.get_size() != size:
+			self.world_surface = pygame.Surface(size, 0, screen)
+		camera.width, camera.height = size
+		return self.world_surface
+
+	def end(self, screen):
+		"""Kembalikan camera dan scale world surface ke screen"""
+		origin_x, origin_y = camera.x, camera.y
+		camera.x, camera.y, camera.width, camera.height, camera.zoom = self._saved
+		self._saved = None
+
+		zoom = camera.zoom
+		if abs(zoom - 1.0) < 1e-6:
+			return
+
+		world = self.world_surface
+		size = (round(world.get_width() * zoom), round(world.get_height() * zoom))
+		if self._scaled_surface is None or self._scaled_surface.get_size() != size:
+			self._scaled_surface = pygame.Surface(size, 0, screen)
+		if self.smooth:
+			pygame.transform.smoothscale(world, size, self._scaled_surface)
+		else:
+			pygame.transform.scale(world, size, self._scaled_surface)
+
+		# Offset sisa posisi kamera, dibulatkan sama seperti posisi chunk map
+		offset_x = math.floor(origin_x * zoom) - math.floor(camera.x * zoom)
+		offset_y = math.floor(origin_y * zoom) - math.floor(camera.y * zoom)
+		screen.blit(self._scaled_surface, (offset_x, offset_y))
+
+
 def create_screen(width, height, title):
 	pygame.display.set_caption(title)
 
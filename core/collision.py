@@ -32,6 +32,16 @@ class CollisionBox:
             self.height
         )
 
+    def get_bounds(self, entity_x, entity_y):
+        """Get (left, top, width, height) float untuk continuous collision
+        (get_rect membulatkan posisi ke int)"""
+        return (
+            entity_x + self.offset_x,
+            entity_y + self.offset_y,
+            self.width,
+            self.height
+        )
+
     def get_circle(self, entity_x, entity_y):
         """Get circle data (center_x, center_y, radius)"""
         center_x = entity_x + self.offset_x + self.width // 2
@@ -0,0 +1,137 @@
+"""
+Central image loader
+
+Semua image di-load lewat sini supaya di-convert sekali ke format display
+(convert / convert_alpha) dan tidak perlu konversi pixel format setiap blit.
+
+- Image tanpa pixel transparan -> convert()
+- Image dengan alpha -> convert_alpha()
+- rle=True untuk image yang selalu di-blit utuh (sprite, tile map lama):
+  RLEACCEL, jauh lebih cepat untuk blit utuh tapi mahal jika di-subsurface
+  atau di-lock, jadi jangan dipakai untuk tileset yang dipotong-potong.
+
+Setelah display dibuat ulang (apply_settings), panggil reconvert_all() supaya
+semua image di-convert ke format display yang baru. Object yang menyimpan
+surface hasil loader bisa daftar lewat add_reconvert_listener().
+"""
+
+import os
+import threading
+import weakref
+import pygame
+
+_lock = threading.Lock()
+_cache = {}       # (path, rle) -> pygame.Surface
+_listeners = []   # weakref ke callback
+
+
+def _display_ready():
+    return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+
+def _has_transparency(surface):
+    if surface.get_colorkey() is not None:
+        return True
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return False
+    w, h = surface.get_size()
+    # Mask bit aktif jika alpha > 254, jadi kurang dari w*h berarti ada transparansi
+    return pygame.mask.from_surface(surface, 254).count() != w * h
+
+
+def convert_surface(surface, rle=False):
+    """
+    Convert surface ke format display.
+
+    Returns surface asli jika display belum dibuat (di-convert nanti oleh
+    reconvert_all).
+    """
+    if not _display_ready():
+        return surface
+
+    colorkey = surface.get_colorkey()
+    if colorkey is not None:
+        converted = surface.convert()
+        converted.set_colorkey(colorkey, pygame.RLEACCEL if rle else 0)
+    elif rle:
+        # RLE pada surface alpha: run opaque/transparan di-blit tanpa blending
+        converted = surface.convert_alpha()
+        converted.set_alpha(255, pygame.RLEACCEL)
+    elif _has_transparency(surface):
+        converted = surface.convert_alpha()
+    else:
+        converted = surface.convert()
+    return converted
+
+
+def load_image(path, rle=False):
+    """
+    Load image (cached per path) dalam format display.
+
+    Aman dipanggil dari worker thread (misal loading tileset paralel).
+
+    Args:
+        path: Path ke file image
+        rle: Pakai RLEACCEL (hanya untuk image yang di-blit utuh)
+
+    Raises:
+        pygame.error / FileNotFoundError jika image tidak bisa di-load
+    """
+    key = (os.path.normpath(path), rle)
+    with _lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    surface = convert_surface(pygame.image.load(path), rle)
+    with _lock:
+        # Thread lain mungkin sudah load image yang sama
+        surface = _cache.setdefault(key, surface)
+    return surface
+
+
+def get_cached(path, rle=False):
+    """Return surface dari cache (tanpa load), atau None"""
+    with _lock:
+        return _cache.get((os.path.normpath(path), rle))
+
+
+def forget(path):
+    """Buang image dari cache (misal file berubah), load berikutnya baca ulang"""
+    path = os.path.normpath(path)
+    with _lock:
+        for rle in (False, True):
+            _cache.pop((path, rle), None)
+
+
+def add_reconvert_listener(callback):
+    """
+    Daftarkan callback() yang dipanggil setelah reconvert_all().
+
+    Bound method disimpan sebagai weak reference, jadi object yang sudah
+    tidak dipakai otomatis lepas.
+    """
+    if hasattr(callback, '__self__'):
+        _listeners.append(weakref.WeakMethod(callback))
+    else:
+        _listeners.append(weakref.ref(callback))
+
+
+def reconvert_all():
+    """Convert ulang semua cached image ke format display saat ini"""
+    if not _display_ready():
+        return
+
+    with _lock:
+        for key, surface in list(_cache.items()):
+            _cache[key] = convert_surface(surface, rle=key[1])
+
+    alive = []
+    for ref in _listeners:
+        callback = ref()
+        if callback is None:
+            continue
+        alive.append(ref)
+        callback()
+    _listeners[:] = alive
+    print(f"[IMAGES] Re-converted {len(_cache)} images to display format")
@@ -1,11 +1,17 @@
 import pygame
 from core.camera import camera
+from core import image_loader
 
 class TileKinds:
   def __init__(self, name, image, is_solid):
     self.name = name
-    self.image = pygame.image.load(image)
+    self.image_path = image
+    self.image = image_loader.load_image(image, rle=True)
     self.is_solid = is_solid
+    image_loader.add_reconvert_listener(self._reconvert)
+
+  def _reconvert(self):
+    self.image = image_loader.load_image(self.image_path, rle=True)
 
 class Map:
   def __init__(self, map_file, tile_kinds, tile_size):
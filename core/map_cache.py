@@ -0,0 +1,219 @@
+"""
+Compiled map cache untuk TiledMap
+
+Hasil parse .tmx (beserta .tsx eksternal) disimpan ke file biner di sebelah
+file .tmx supaya load berikutnya tidak perlu parse XML, decode base64/zlib,
+dan probe path tileset lagi.
+
+Format file:
+- MAGIC (8 bytes) + header length (uint32 little-endian)
+- Header JSON: metadata map, tilesets, layers, objects, tile properties,
+  signature semua file sumber, dan tabel (offset, count) untuk tile arrays
+- Padding ke kelipatan 4 byte, lalu blob uint32 little-endian berisi
+  semua tile ID
+
+Cache invalid otomatis jika mtime/size salah satu file sumber berubah.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b'AMIKMAP\x03'  # byte terakhir = versi format
+CACHE_SUFFIX = '.cache'
+_HEADER_LEN = struct.Struct('<I')
+
+
+def cache_path_for(tmx_file):
+    """Path file compiled cache untuk sebuah .tmx"""
+    return tmx_file + CACHE_SUFFIX
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def build_signature(paths):
+    """Signature (mtime, size) untuk setiap file sumber"""
+    return {path: _file_signature(path) for path in paths}
+
+
+def is_signature_valid(signature):
+    """True jika semua file sumber masih sama seperti saat cache ditulis"""
+    for path, sig in signature.items():
+        if _file_signature(path) != sig:
+            return False
+    return True
+
+
+def _uint32_array(values):
+    """Convert sequence of tile IDs ke array('I') little-endian"""
+    data = values if isinstance(values, array) and values.typecode == 'I' else array('I', values)
+    if sys.byteorder == 'big':
+        data = array('I', data)
+        data.byteswap()
+    return data
+
+
+def save_compiled_map(tmx_file, header, tile_arrays, dependencies):
+    """
+    Tulis compiled cache untuk tmx_file.
+
+    Args:
+        tmx_file: Path ke file .tmx
+        header: Dict JSON-serializable (metadata map)
+        tile_arrays: List of sequences berisi tile ID (uint32)
+        dependencies: List path file sumber (.tmx, .tsx, images)
+
+    Returns:
+        True jika berhasil ditulis
+    """
+    cache_path = cache_path_for(tmx_file)
+    tmp_path = cache_path + '.tmp'
+
+    blob_parts = []
+    table = []
+    offset = 0
+    for values in tile_arrays:
+        data = _uint32_array(values)
+        table.append([offset, len(data)])
+        blob_parts.append(data.tobytes())
+        offset += len(data) * 4
+
+    header = dict(header)
+    header['signature'] = build_signature(dependencies)
+    header['arrays'] = table
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    prefix_len = len(MAGIC) + _HEADER_LEN.size + len(header_bytes)
+    padding = b'\0' * (-prefix_len % 4)
+
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LEN.pack(len(header_bytes)))
+            f.write(header_bytes)
+            f.write(padding)
+            for part in blob_parts:
+                f.write(part)
+        os.replace(tmp_path, cache_path)
+        return True
+    except OSError as e:
+        print(f"⚠️  Failed to write map cache {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+class CompiledMapReader:
+    """
+    Akses tile arrays di compiled cache lewat mmap yang tetap terbuka.
+
+    Dipakai streaming mode TiledMap: chunk di-decode saat dibutuhkan saja.
+    read() aman dipanggil dari worker thread.
+    """
+
+    def __init__(self, cache_path, file, mm, blob_start, table):
+        self.cache_path = cache_path
+        self._file = file
+        self._mm = mm
+        self._blob_start = blob_start
+        self._table = table
+
+    def __len__(self):
+        return len(self._table)
+
+    def __getitem__(self, index):
+        return self.read(index)
+
+    def read(self, index):
+        """Return array('I') untuk tile array ke-index"""
+        offset, count = self._table[index]
+        start = self._blob_start + offset
+        data = array('I')
+        data.frombytes(self._mm[start:start + count * 4])
+        if sys.byteorder == 'big':
+            data.byteswap()
+        return data
+
+    def detach(self):
+        """Salin isi cache ke memory lalu tutup mmap dan file.
+
+        read() tetap jalan dari salinan; file cache bebas ditimpa (Windows
+        menolak os.replace selama file masih di-mmap).
+        """
+        if self._file is not None:
+            data = self._mm[:]
+            self.close()
+            self._mm = data
+
+    def close(self):
+        if self._file is not None:
+            self._mm.close()
+            self._file.close()
+            self._file = None
+        self._mm = None
+
+
+def open_compiled_map(tmx_file):
+    """
+    Buka compiled cache untuk tmx_file tanpa membaca tile arrays.
+
+    Returns:
+        (header, CompiledMapReader) jika cache ada dan masih valid, None jika tidak.
+        Panggil reader.close() jika sudah tidak dipakai.
+    """
+    cache_path = cache_path_for(tmx_file)
+    if not os.path.exists(cache_path):
+        return None
+
+    f = None
+    mm = None
+    try:
+        f = open(cache_path, 'rb')
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = None
+        if mm[:len(MAGIC)] == MAGIC:
+            pos = len(MAGIC)
+            (header_len,) = _HEADER_LEN.unpack_from(mm, pos)
+            pos += _HEADER_LEN.size
+            header = json.loads(mm[pos:pos + header_len].decode('utf-8'))
+            pos += header_len
+        if header is not None and is_signature_valid(header.get('signature', {})):
+            return header, CompiledMapReader(cache_path, f, mm, pos + (-pos % 4), header['arrays'])
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"⚠️  Ignoring unreadable map cache {cache_path}: {e}")
+
+    if mm is not None:
+        mm.close()
+    if f is not None:
+        f.close()
+    return None
+
+
+def load_compiled_map(tmx_file):
+    """
+    Load compiled cache untuk tmx_file via mmap.
+
+    Returns:
+        (header, tile_arrays) jika cache ada dan masih valid, None jika tidak.
+        tile_arrays adalah list of array('I').
+    """
+    opened = open_compiled_map(tmx_file)
+    if opened is None:
+        return None
+
+    header, reader = opened
+    try:
+        tile_arrays = [reader.read(index) for index in range(len(reader))]
+    finally:
+        reader.close()
+    return header, tile_arrays
@@ -0,0 +1,139 @@
+"""
+Map manager untuk world dengan beberapa map (per gedung / lantai)
+
+Menyimpan pasangan TiledMap + TiledMapCollision yang baru dipakai di LRU,
+dan me-load map tujuan transition (object dengan property target_map) di
+background thread supaya pindah map lewat pintu tidak perlu parse blocking.
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from core.tiled_map import TiledMap, TiledMapCollision
+
+
+class MapManager:
+    """LRU TiledMap/TiledMapCollision yang sudah di-load, plus prefetch"""
+
+    def __init__(self, max_maps=4, collision_backend='geometric', **map_options):
+        """
+        Args:
+            max_maps: Jumlah map yang disimpan (termasuk map aktif)
+            collision_backend: Backend TiledMapCollision ('geometric' atau 'mask')
+            map_options: Keyword arguments untuk setiap TiledMap
+        """
+        self.max_maps = max(1, int(max_maps))
+        self.collision_backend = collision_backend
+        self.map_options = map_options
+        self._maps = OrderedDict()  # path -> (TiledMap, TiledMapCollision)
+        self._pending = {}          # path -> Future (prefetch)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='map-prefetch')
+        self.current_path = None
+        self._inside_transition = None
+        self._arrived = False
+
+    def _key(self, tmx_file):
+        return os.path.normpath(tmx_file)
+
+    def _load(self, tmx_file):
+        tiled_map = TiledMap(tmx_file, **self.map_options)
+        return tiled_map, TiledMapCollision(tiled_map, backend=self.collision_backend)
+
+    @property
+    def current(self):
+        """(TiledMap, TiledMapCollision) aktif, atau None"""
+        return self._maps.get(self.current_path)
+
+    def get(self, tmx_file):
+        """
+        Return (TiledMap, TiledMapCollision) untuk tmx_file.
+
+        Dari LRU jika ada, menunggu hasil prefetch jika sedang di-load, atau
+        load langsung (blocking) jika belum pernah diminta.
+        """
+        key = self._key(tmx_file)
+        pair = self._maps.get(key)
+        if pair is not None:
+            self._maps.move_to_end(key)
+            return pair
+
+        future = self._pending.pop(key, None)
+        if future is not None and not future.cancel():
+            pair = future.result()
+        else:
+            pair = self._load(key)
+        self._store(key, pair)
+        return pair
+
+    def activate(self, tmx_file):
+        """Jadikan tmx_file map aktif dan prefetch map tujuan transition-nya"""
+        pair = self.get(tmx_file)
+        self.current_path = self._key(tmx_file)
+        self._inside_transition = None
+        self._arrived = True
+        for transition in pair[0].get_transitions():
+            self.prefetch(transition['target_map'])
+        return pair
+
+    def prefetch(self, tmx_file):
+        """Load tmx_file di background (no-op jika sudah ada / sedang di-load)"""
+        key = self._key(tmx_file)
+        if key in self._maps or key in self._pending:
+            return
+        if not os.path.exists(key):
+            print(f"⚠️  Transition target not found: {key}")
+            return
+        self._pending[key] = self._pool.submit(self._load, key)
+
+    def collect(self):
+        """Pindahkan map hasil prefetch yang sudah selesai ke LRU (main thread)"""
+        for key in [key for key, future in self._pending.items() if future.done()]:
+            future = self._pending.pop(key)
+            if future.cancelled():
+                continue
+            if future.exception() is not None:
+                print(f"⚠️  Failed to prefetch map {key}: {future.exception()}")
+                continue
+            self._store(key, future.result())
+            print(f"[MAP] Prefetched {key}")
+
+    def find_transition(self, rect):
+        """
+        Return transition yang baru dimasuki rect (world pixels), atau None.
+
+        Transition hanya terpicu saat rect masuk, jadi spawn di dalam area
+        transition pada map tujuan tidak langsung memindahkan player lagi.
+        """
+        current = self.current
+        if current is None:
+            return None
+        hit = current[0].get_transition_at(rect)
+        entered = hit if hit is not None and hit is not self._inside_transition else None
+        self._inside_transition = hit
+        if self._arrived:
+            self._arrived = False
+            return None
+        return entered
+
+    def _store(self, key, pair):
+        self._maps[key] = pair
+        self._maps.move_to_end(key)
+        while len(self._maps) > self.max_maps:
+            old_key = next((k for k in self._maps if k != self.current_path), None)
+            if old_key is None:
+                break
+            old_map, _ = self._maps.pop(old_key)
+            old_map.close()
+            print(f"[MAP] Evicted {old_key} from map cache")
+
+    def close(self):
+        """Hentikan prefetch dan tutup semua map"""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        for future in self._pending.values():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                future.result()[0].close()
+        self._pending.clear()
+        for tiled_map, _ in self._maps.values():
+            tiled_map.close()
+        self._maps.clear()
+        self.current_path = None
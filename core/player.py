@@ -3,6 +3,7 @@ from core.input import is_key_pressed
 from core.camera import camera
 from core.collision import CollisionBox
 from core.animated_sprite import AnimatedSprite
+from core.surface_cache import render_text
 
 
 class Player:
@@ -282,6 +283,21 @@ class Player:
 
     def _move_with_collision(self, map_collision):
         """Movement dengan collision detection"""
+        if hasattr(map_collision, 'move_box'):
+            # Swept collision: satu query per axis, tidak tembus di kecepatan apapun
+            left, top, width, height = self.collision_box.get_bounds(self.x, self.y)
+            new_left, new_top, hit_x, hit_y = map_collision.move_box(
+                left, top, width, height, self.velocity_x, self.velocity_y
+            )
+            self.x += new_left - left
+            self.y += new_top - top
+            if hit_x:
+                self.velocity_x = 0
+            if hit_y:
+                self.velocity_y = 0
+            return
+
+        # Collision system tanpa sweep (MapCollision): gerak per pixel
         def _step_move(axis: str, delta: float):
             if delta == 0:
                 return
@@ -321,7 +337,7 @@ class Player:
     def _draw_name(self, screen):
         """Draw nama di atas karakter"""
         # Render name text
-        name_surface = self.name_font.render(self.name, True, self.name_color)
+        name_surface = render_text(self.name_font, self.name, True, self.name_color)
 
         # Calculate position (centered above sprite), in screen space respecting zoom
         z = getattr(camera, 'zoom', 1.0)
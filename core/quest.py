@@ -1,5 +1,6 @@
 import pygame
 import random
+from core.surface_cache import render_text
 
 class Quest:
     """Single quest dengan informasi lengkap"""
@@ -624,7 +625,7 @@ class QuestManager:
         pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 2)
 
         progress_text = f"{self.total_progress} / 100 Tugas"
-        text_surface = self.font.render(progress_text, True, (255, 255, 255))
+        text_surface = render_text(self.font, progress_text, True, (255, 255, 255))
         screen.blit(text_surface,
                    (bar_x + bar_width // 2 - text_surface.get_width() // 2,
                     bar_y + bar_height // 2 - text_surface.get_height() // 2))
@@ -632,12 +633,12 @@ class QuestManager:
     def draw_quest_list(self, screen, x, y):
         """Draw daftar quest aktif"""
         if not self.active_quests:
-            no_quest = self.font_small.render("Tidak ada quest aktif", True, (150, 150, 150))
+            no_quest = render_text(self.font_small, "Tidak ada quest aktif", True, (150, 150, 150))
             screen.blit(no_quest, (x, y))
             return
 
-        title = self.font.render(f"Quest Aktif ({len(self.active_quests)}/{self.MAX_QUESTS}):",
-                                True, (255, 255, 100))
+        title = render_text(self.font, f"Quest Aktif ({len(self.active_quests)}/{self.MAX_QUESTS}):",
+                            True, (255, 255, 100))
         screen.blit(title, (x, y))
         y += 30
 
@@ -647,17 +648,17 @@ class QuestManager:
             pygame.draw.rect(screen, (40, 40, 60), (x, y, box_width, box_height))
             pygame.draw.rect(screen, (100, 100, 150), (x, y, box_width, box_height), 2)
 
-            num_text = self.font.render(f"{i+1}.", True, (200, 200, 200))
+            num_text = render_text(self.font, f"{i+1}.", True, (200, 200, 200))
             screen.blit(num_text, (x + 10, y + 5))
 
-            giver = self.font_small.render(quest.giver_name, True, (100, 200, 255))
+            giver = render_text(self.font_small, quest.giver_name, True, (100, 200, 255))
             screen.blit(giver, (x + 10, y + 28))
 
             desc = quest.description[:25] + "..." if len(quest.description) > 25 else quest.description
-            desc_surf = self.font_small.render(desc, True, (200, 200, 200))
+            desc_surf = render_text(self.font_small, desc, True, (200, 200, 200))
             screen.blit(desc_surf, (x + 40, y + 8))
 
-            hint = self.font_small.render(f"[{i+1}]", True, (150, 150, 150))
+            hint = render_text(self.font_small, f"[{i+1}]", True, (150, 150, 150))
             screen.blit(hint, (x + box_width - hint.get_width() - 10, y + 28))
 
             y += box_height + 10
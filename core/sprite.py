@@ -1,15 +1,28 @@
 import pygame
 from core.camera import camera
+from core import image_loader
 
 loaded = {}
 sprites = []
 
+
+def _reconvert_loaded():
+    """Ambil ulang image yang sudah di-convert ulang setelah display berubah"""
+    for path in loaded:
+        loaded[path] = image_loader.load_image(path, rle=True)
+    for sprite in sprites:
+        sprite.image = loaded[sprite.image_path]
+
+
+image_loader.add_reconvert_listener(_reconvert_loaded)
+
 class Sprite:
     def __init__(self, image, x, y):
+        self.image_path = image
         if image in loaded:
             self.image = loaded[image]
         else:
-            self.image = pygame.image.load(image)
+            self.image = image_loader.load_image(image, rle=True)
             loaded[image] = self.image
 
         self.x = x
@@ -0,0 +1,207 @@
+"""
+Surface caches dengan batas memori (bytes)
+
+SurfaceCache adalah LRU yang dibatasi jumlah byte pixel (width x height x
+bytesize), bukan jumlah entry, jadi tile 64px di zoom 2x tidak bisa memakan
+memori 16x lipat dengan limit yang sama. Setiap cache punya counter
+hit/miss/eviction untuk melihat apakah cache thrashing.
+
+Semua cache terdaftar di satu MemoryBudget (default: global_budget) yang
+dipakai bersama oleh map, sprite, dan text cache. Jika total melewati budget,
+entry yang paling lama tidak dipakai (lintas cache) dibuang duluan.
+"""
+
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+import pygame
+
+MB = 1024 * 1024
+
+# Biaya per entry di luar pixel, supaya penanda kecil (False/None) tetap terbatas
+ENTRY_OVERHEAD = 64
+
+# Urutan pemakaian lintas cache (untuk eviction global)
+_ticks = itertools.count()
+
+
+def surface_bytes(value):
+    """Perkiraan memori pixel untuk surface/mask (atau tuple/list berisinya)"""
+    if isinstance(value, pygame.Surface):
+        return value.get_width() * value.get_height() * value.get_bytesize()
+    if isinstance(value, pygame.mask.Mask):
+        width, height = value.get_size()
+        return width * height // 8
+    if isinstance(value, (tuple, list)):
+        return sum(surface_bytes(item) for item in value)
+    return 0
+
+
+class MemoryBudget:
+    """Budget memori bersama untuk beberapa SurfaceCache"""
+
+    def __init__(self, limit_bytes):
+        self.limit_bytes = int(limit_bytes)
+        self._lock = threading.Lock()
+        self._caches = weakref.WeakSet()
+
+    def register(self, cache):
+        # Cache bisa dibuat di worker thread (misal prefetch map)
+        with self._lock:
+            self._caches.add(cache)
+
+    def caches(self):
+        with self._lock:
+            return list(self._caches)
+
+    @property
+    def used_bytes(self):
+        return sum(cache.bytes for cache in self.caches())
+
+    def enforce(self):
+        """Buang entry paling lama (lintas cache) sampai total <= limit"""
+        caches = self.caches()
+        used = sum(cache.bytes for cache in caches)
+        while used > self.limit_bytes:
+            candidates = [cache for cache in caches if len(cache)]
+            if not candidates:
+                break
+            oldest = min(candidates, key=lambda cache: cache.oldest_tick())
+            # Entry yang baru saja di-set tidak ikut dibuang
+            if oldest.oldest_tick() == max(cache.newest_tick() for cache in candidates):
+                break
+            used -= oldest.evict_oldest()
+
+    def stats(self):
+        """List of stats() dari semua cache"""
+        return [cache.stats() for cache in self.caches()]
+
+    def report(self):
+        """Ringkasan satu baris per cache (untuk log/debug overlay)"""
+        lines = [f"[CACHE] budget {self.used_bytes / MB:.1f}/{self.limit_bytes / MB:.0f} MB"]
+        for stats in sorted(self.stats(), key=lambda s: s['name']):
+            lines.append(
+                f"  {stats['name']}: {stats['entries']} entries, {stats['bytes'] / MB:.1f} MB, "
+                f"hit {stats['hit_rate'] * 100:.0f}% ({stats['hits']}/{stats['misses']}), "
+                f"evicted {stats['evictions']}"
+            )
+        return lines
+
+
+# Budget bersama (limit bisa diubah dari settings, lihat game.py)
+global_budget = MemoryBudget(256 * MB)
+
+
+class SurfaceCache:
+    """LRU cache untuk surfaces, dibatasi bytes"""
+
+    def __init__(self, name, max_bytes=None, budget=global_budget):
+        """
+        Args:
+            name: Nama cache (untuk stats)
+            max_bytes: Batas memori cache ini sendiri (None = hanya budget)
+            budget: MemoryBudget bersama, atau None
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.budget = budget
+        self._entries = OrderedDict()  # key -> (value, nbytes, tick)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if budget is not None:
+            budget.register(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def keys(self):
+        return list(self._entries)
+
+    def get(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Re-insert supaya jadi yang terbaru dipakai
+        self._entries[key] = (entry[0], entry[1], next(_ticks))
+        return entry[0]
+
+    def peek(self, key):
+        """Seperti get() tapi tidak mengubah urutan LRU dan stats"""
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def set(self, key, value):
+        self.pop(key)
+        nbytes = surface_bytes(value) + ENTRY_OVERHEAD
+        self._entries[key] = (value, nbytes, next(_ticks))
+        self.bytes += nbytes
+        # Entry baru selalu disimpan, walau sendirian lebih besar dari limit
+        while self.max_bytes is not None and self.bytes > self.max_bytes and len(self._entries) > 1:
+            self.evict_oldest()
+        if self.budget is not None:
+            self.budget.enforce()
+
+    def pop(self, key):
+        """Hapus key (bukan eviction). Returns value atau None"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self.bytes -= entry[1]
+        return entry[0]
+
+    def remove_if(self, matches):
+        """Hapus semua entry yang key-nya lolos matches(key)"""
+        for key in [key for key in self._entries if matches(key)]:
+            self.pop(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def oldest_tick(self):
+        return next(iter(self._entries.values()))[2]
+
+    def newest_tick(self):
+        return next(reversed(self._entries.values()))[2]
+
+    def evict_oldest(self):
+        """Buang entry paling lama. Returns jumlah bytes yang dibebaskan"""
+        _, (_, nbytes, _) = self._entries.popitem(last=False)
+        self.bytes -= nbytes
+        self.evictions += 1
+        return nbytes
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Text yang di-render ulang setiap frame (nama player, HUD quest)
+text_cache = SurfaceCache('text', max_bytes=8 * MB)
+
+
+def render_text(font, text, antialias, color, background=None):
+    """font.render() yang di-cache per (font, text, warna)"""
+    key = (font, text, antialias, tuple(color), None if background is None else tuple(background))
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = font.render(text, antialias, color, background)
+        text_cache.set(key, surface)
+    return surface
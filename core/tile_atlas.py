@@ -0,0 +1,126 @@
+"""
+Texture atlas untuk tiles dari semua tileset TMX
+
+Semua tile yang dipakai map di-pack ke beberapa surface besar (atlas pages)
+dengan layout grid per ukuran tile, plus tabel GID -> (page, rect).
+Render path bisa batch blit dari satu source surface dan memakai atlas yang
+sudah di-scale per zoom, bukan scale tile satu per satu.
+"""
+
+import math
+import pygame
+from core.surface_cache import SurfaceCache, MB
+
+
+class TileAtlas:
+    """Pack tile surfaces ke atlas pages dengan lookup per GID"""
+
+    def __init__(self, tiles, max_page_size=2048):
+        """
+        Args:
+            tiles: Dict {gid: pygame.Surface}
+            max_page_size: Ukuran maksimum (px) sisi atlas page
+        """
+        self.max_page_size = max_page_size
+        self.pages = []        # List of pygame.Surface
+        self.page_cells = []   # Ukuran cell (tile_w, tile_h) per page
+        self.entries = {}      # gid -> (page_index, pygame.Rect)
+        # (page_index, zoom) -> (surface, cell_w, cell_h), dibatasi bytes
+        self._scaled_pages = SurfaceCache('tile atlas (zoom)', max_bytes=64 * MB)
+        self._build(tiles)
+
+    def _build(self, tiles):
+        # Kelompokkan per ukuran tile supaya setiap page berupa grid seragam
+        groups = {}
+        for gid in sorted(tiles):
+            surface = tiles[gid]
+            groups.setdefault(surface.get_size(), []).append((gid, surface))
+
+        for (tile_w, tile_h), items in groups.items():
+            max_cols = max(1, self.max_page_size // tile_w)
+            max_rows = max(1, self.max_page_size // tile_h)
+            per_page = max_cols * max_rows
+
+            for start in range(0, len(items), per_page):
+                page_items = items[start:start + per_page]
+                cols = min(max_cols, math.ceil(math.sqrt(len(page_items))))
+                rows = math.ceil(len(page_items) / cols)
+                page = pygame.Surface((cols * tile_w, rows * tile_h), pygame.SRCALPHA)
+                page_index = len(self.pages)
+
+                blit_sequence = []
+                for i, (gid, surface) in enumerate(page_items):
+                    rect = pygame.Rect((i % cols) * tile_w, (i // cols) * tile_h, tile_w, tile_h)
+                    blit_sequence.append((surface, rect.topleft))
+                    self.entries[gid] = (page_index, rect)
+                page.blits(blit_sequence, doreturn=False)
+
+                self.pages.append(page)
+                self.page_cells.append((tile_w, tile_h))
+
+    def __contains__(self, gid):
+        return gid in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, gid):
+        """Return (page_surface, rect) untuk gid, atau None jika tidak di atlas"""
+        entry = self.entries.get(gid)
+        if entry is None:
+            return None
+        page_index, rect = entry
+        return self.pages[page_index], rect
+
+    def get_scaled_page(self, page_index, zoom):
+        """
+        Return (surface, cell_w, cell_h) untuk page yang sudah di-scale.
+
+        Setiap cell di-scale sendiri ke grid baru (bukan scale satu page utuh)
+        supaya filter smoothscale tidak bleed ke tile tetangga. Hasilnya
+        di-cache per zoom, jadi biayanya hanya sekali per level zoom.
+        """
+        key = (page_index, round(float(zoom), 3))
+        cached = self._scaled_pages.get(key)
+        if cached is not None:
+            return cached
+
+        page = self.pages[page_index]
+        tile_w, tile_h = self.page_cells[page_index]
+        cell_w = max(1, int(tile_w * zoom))
+        cell_h = max(1, int(tile_h * zoom))
+        cols = page.get_width() // tile_w
+        rows = page.get_height() // tile_h
+        scaled = pygame.Surface((cols * cell_w, rows * cell_h), pygame.SRCALPHA)
+
+        blit_sequence = []
+        for row in range(rows):
+            for col in range(cols):
+                cell = page.subsurface((col * tile_w, row * tile_h, tile_w, tile_h))
+                try:
+                    cell = pygame.transform.smoothscale(cell, (cell_w, cell_h))
+                except Exception:
+                    cell = pygame.transform.scale(cell, (cell_w, cell_h))
+                blit_sequence.append((cell, (col * cell_w, row * cell_h)))
+        scaled.blits(blit_sequence, doreturn=False)
+
+        cached = (scaled, cell_w, cell_h)
+        self._scaled_pages.set(key, cached)
+        return cached
+
+    def lookup_scaled(self, gid, zoom):
+        """Return (scaled_page_surface, rect) untuk gid pada zoom tertentu"""
+        entry = self.entries.get(gid)
+        if entry is None:
+            return None
+        page_index, rect = entry
+        tile_w, tile_h = self.page_cells[page_index]
+        scaled, cell_w, cell_h = self.get_scaled_page(page_index, zoom)
+        col = rect.x // tile_w
+        row = rect.y // tile_h
+        return scaled, pygame.Rect(col * cell_w, row * cell_h, cell_w, cell_h)
+
+    def clear_scaled(self, keep_zooms=()):
+        """Buang scaled pages (misal saat zoom berubah), kecuali zoom di keep_zooms"""
+        keep = {round(float(zoom), 3) for zoom in keep_zooms}
+        self._scaled_pages.remove_if(lambda key: key[1] not in keep)
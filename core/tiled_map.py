@@ -13,38 +13,404 @@ import pygame
 import xml.etree.ElementTree as ET
 import os
 import base64
+import bisect
 import zlib
 import gzip
+import math
+import operator
+import sys
 import time
-from collections import OrderedDict
+from array import array
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from core.camera import camera
+from core import image_loader, map_cache
+from core.tile_atlas import TileAtlas
+from core.surface_cache import SurfaceCache, MB, global_budget
+
+# Ukuran chunk sintetis saat fixed-size layers di-flatten
+FLATTEN_CHUNK_SIZE = 16
+
+# Level zoom pyramid: chunk surfaces di-scale ke level ini di background
+# dan disimpan lintas perubahan zoom. Zoom di antaranya memakai level terdekat.
+ZOOM_LEVELS = (0.5, 0.75, 1.0, 1.5, 2.0)
+# Zoom di antara level baru di-smoothscale persis setelah zoom tidak berubah
+# selama sekian frame (supaya drag slider tidak membanjiri worker)
+ZOOM_SETTLE_FRAMES = 15
+# Level of detail: di bawah LOD_ZOOM map digambar dari super-tile (gabungan
+# beberapa chunk) yang di-bake langsung di resolusi LOD_LEVELS, jadi jumlah
+# blit per frame tetap kecil saat zoom out jauh (overview / map screen)
+LOD_ZOOM = 0.5
+LOD_LEVELS = (0.5, 0.25, 0.125, 0.0625)
+# Ukuran target (pixels) satu super-tile di level LOD-nya
+LOD_TILE_SIZE = 512
+# Ukuran cell (pixels) spatial hash collision shapes di TiledMapCollision
+COLLISION_CELL_SIZE = 128
+# Toleransi (pixels) sweep collision: box berhenti sejarak SWEEP_SKIN dari
+# permukaan, dan kontak dalam SWEEP_EPSILON dianggap bersentuhan (bukan overlap)
+SWEEP_SKIN = 1e-3
+SWEEP_EPSILON = 1e-6
+# Backend TiledMapCollision: 'geometric' (shapes + tile grid) atau 'mask'
+# (pygame.mask.Mask per chunk, di-rasterize saat pertama dipakai)
+COLLISION_BACKENDS = ('geometric', 'mask')
+# Ukuran chunk (tiles) collision mask untuk map non-infinite
+MASK_CHUNK_TILES = 16
+# Interval (detik) pengecekan file map untuk hot reload
+HOT_RELOAD_INTERVAL = 0.5
+
+
+# Penanda slot lookup table GID yang belum di-resolve
+_UNRESOLVED = object()
+
+# Data map yang diambil dari hasil parse baru saat hot reload
+_HOT_RELOAD_ATTRS = (
+    'width', 'height', 'tile_width', 'tile_height', 'is_infinite',
+    'layers', 'render_layers', 'foreground_layers', 'tilesets', 'objects',
+    'tile_properties', '_tileset_meta', '_dependencies', '_pending_tilesets',
+    '_used_gids', '_tile_lut', '_tileset_firstgids', 'atlas', '_opaque_cache',
+    'streaming', '_stream_reader', '_stream_pool', '_stream_layers',
+    '_stream_units', '_stream_atlas', '_collision_source_ids', '_collision_sources',
+    '_solid_lut', 'tile_animations', '_animated_gids', '_tile_overhang',
+)
+
+
+def nearest_zoom_level(zoom):
+    """Return level di ZOOM_LEVELS yang paling dekat dengan zoom"""
+    return min(ZOOM_LEVELS, key=lambda level: abs(level - zoom))
+
+
+def lod_level_for(zoom):
+    """Level LOD terkecil yang masih >= zoom (di-downscale saat digambar)"""
+    candidates = [level for level in LOD_LEVELS if level >= zoom - 1e-6]
+    return min(candidates) if candidates else min(LOD_LEVELS)
+
+
+def _iter_stacked_tiles(sources, width, height, is_opaque):
+    """Yield (col, row, gid) untuk tumpukan tile rows (bawah ke atas).
+
+    Tile di bawah tile opaque di-skip. Dipakai bake di main thread maupun
+    di worker streaming (is_opaque berupa lookup yang sudah dihitung).
+    """
+    top_first = sources[::-1]
+    for row_idx in range(height):
+        rows = [source[row_idx] for source in top_first if row_idx < len(source)]
+        for col_idx in range(width):
+            stack = []
+            for row in rows:
+                gid = row[col_idx]
+                if gid != 0:
+                    stack.append(gid)
+                    if is_opaque(gid):
+                        break
+            for gid in reversed(stack):
+                yield col_idx, row_idx, gid
 
 
-class LRUCache:
-    """Simple LRU cache using OrderedDict."""
-    def __init__(self, maxsize=256):
-        self.maxsize = int(maxsize)
-        self.od = OrderedDict()
+def _solid_bytes(data, solid_lut):
+    """Grid solid (bytearray row-major, 1 = solid) dari tile array GID.
+
+    Lookup semua tile sekaligus di C lewat itemgetter, tanpa loop Python per
+    tile (itemgetter dengan satu key tidak mengembalikan tuple).
+
+    GID di luar lookup table (misal dengan flag flip/rotate Tiled di bit
+    atas, yang juga tidak digambar get_tile_surface) dianggap tidak solid.
+    """
+    size = len(solid_lut)
+    if data and max(data) >= size:
+        data = [gid if gid < size else 0 for gid in data]
+    if len(data) > 1:
+        return bytearray(operator.itemgetter(*data)(solid_lut))
+    return bytearray(solid_lut[gid] for gid in data)
+
+
+def _merge_solid(grids):
+    """OR beberapa grid solid berukuran sama (satu grid per collision layer)"""
+    if len(grids) == 1:
+        return grids[0]
+    merged = 0
+    for grid in grids:
+        merged |= int.from_bytes(grid, 'little')
+    return bytearray(merged.to_bytes(len(grids[0]), 'little'))
+
+
+class AnimationClock:
+    """
+    Clock bersama untuk animasi tile Tiled (<animation> di tileset).
+
+    Semua map memakai waktu yang sama, jadi tile animasi tetap sinkron dan
+    tidak ada timer per tile. Game loop memanggil tick(dt) sekali per frame;
+    TiledMap me-resolve frame semua GID animasi sekali per tick.
+    """
+
+    def __init__(self):
+        self.time_ms = 0
+        self.ticks = 0
+
+    def tick(self, dt_ms):
+        self.time_ms += dt_ms
+        self.ticks += 1
+
+
+animation_clock = AnimationClock()
+
+
+def _animation_frame(animation, time_ms):
+    """GID frame animasi yang aktif pada time_ms"""
+    t = time_ms % animation['duration']
+    for frame_gid, duration in animation['frames']:
+        if t < duration:
+            return frame_gid
+        t -= duration
+    return animation['frames'][-1][0]
+
+
+_DEBUG_FONT = None
+
+
+def _debug_font():
+    """Font label debug overlay (dibuat sekali)"""
+    global _DEBUG_FONT
+    if _DEBUG_FONT is None:
+        _DEBUG_FONT = pygame.font.Font(None, 20)
+    return _DEBUG_FONT
+
+
+# Polygon collision yang sudah di-preprocess saat load (lihat
+# TiledMapCollision._set_collision_shapes):
+# - bbox: (left, top, right, bottom)
+# - points: tuple of (x, y)
+# - edges: tuple of (ax, ay, ex, ey, nx, ny), (nx, ny) = normal keluar (unit)
+# - parts: convex decomposition, tuple of (bbox, axes); axes berisi
+#   (nx, ny, min, max) = proyeksi part ke setiap normal edge-nya
+PolygonRecord = namedtuple('PolygonRecord', 'bbox points edges parts')
+
+
+def _polygon_area2(points):
+    """Dua kali signed area (shoelace); tanda = winding"""
+    area = 0.0
+    count = len(points)
+    for i in range(count):
+        x1, y1 = points[i]
+        x2, y2 = points[(i + 1) % count]
+        area += x1 * y2 - x2 * y1
+    return area
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _clean_polygon(points):
+    """Buang titik duplikat dan titik collinear (tidak mengubah bentuk)"""
+    cleaned = []
+    for point in points:
+        point = (float(point[0]), float(point[1]))
+        if not cleaned or point != cleaned[-1]:
+            cleaned.append(point)
+    if len(cleaned) > 1 and cleaned[0] == cleaned[-1]:
+        cleaned.pop()
+    changed = True
+    while changed and len(cleaned) > 3:
+        changed = False
+        for i in range(len(cleaned)):
+            if _cross(cleaned[i - 1], cleaned[i], cleaned[(i + 1) % len(cleaned)]) == 0:
+                cleaned.pop(i)
+                changed = True
+                break
+    return cleaned
+
+
+def _is_convex(points, sign):
+    count = len(points)
+    return all(_cross(points[i - 1], points[i], points[(i + 1) % count]) * sign >= 0
+               for i in range(count))
+
+
+def _convex_hull(points):
+    """Monotone chain (fallback untuk polygon yang self-intersecting)"""
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def _convex_parts(points):
+    """
+    Convex decomposition: ear clipping jadi segitiga, lalu segitiga yang
+    berbagi edge digabung selama hasilnya tetap convex (Hertel-Mehlhorn).
+
+    Returns:
+        List of polygon convex (list of (x, y))
+    """
+    if len(points) < 3:
+        return []
+    sign = 1.0 if _polygon_area2(points) > 0 else -1.0
+    if _is_convex(points, sign):
+        return [points]
+
+    # Ear clipping (dengan index ke points)
+    remaining = list(range(len(points)))
+    parts = []
+    while len(remaining) > 3:
+        count = len(remaining)
+        for i in range(count):
+            a, b, c = remaining[i - 1], remaining[i], remaining[(i + 1) % count]
+            pa, pb, pc = points[a], points[b], points[c]
+            if _cross(pa, pb, pc) * sign <= 0:
+                continue
+            if any(_cross(pa, pb, points[j]) * sign >= 0 and
+                   _cross(pb, pc, points[j]) * sign >= 0 and
+                   _cross(pc, pa, points[j]) * sign >= 0
+                   for j in remaining if j not in (a, b, c)):
+                continue
+            parts.append([a, b, c])
+            remaining.pop(i)
+            break
+        else:
+            # Polygon tidak valid (self-intersecting): pakai convex hull saja
+            return [_convex_hull(points)]
+    parts.append(remaining)
+
+    # Gabungkan part yang berbagi edge selama tetap convex
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(parts)):
+            for j in range(i + 1, len(parts)):
+                joined = _join_parts(parts[i], parts[j])
+                if joined is not None and _is_convex([points[k] for k in joined], sign):
+                    parts[i] = joined
+                    parts.pop(j)
+                    merged = True
+                    break
+            if merged:
+                break
+    return [[points[k] for k in part] for part in parts]
+
+
+def _join_parts(first, second):
+    """Gabungkan dua polygon (index, winding sama) lewat edge bersama, atau None"""
+    for i in range(len(first)):
+        a, b = first[i], first[(i + 1) % len(first)]
+        for j in range(len(second)):
+            if second[j] == b and second[(j + 1) % len(second)] == a:
+                # first: ... a, b ...; second: ... b, a, x, y ... -> a, (x, y ...), b
+                rest = [second[(j + 2 + k) % len(second)] for k in range(len(second) - 2)]
+                return first[:i + 1] + rest + first[i + 1:]
+    return None
+
+
+def _build_polygon_record(points):
+    """Preprocess polygon collision jadi PolygonRecord, atau None jika degenerate"""
+    points = _clean_polygon(points)
+    if len(points) < 3:
+        return None
+    area = _polygon_area2(points)
+    if area == 0:
+        return None
+    outward = 1.0 if area > 0 else -1.0
+
+    edges = []
+    count = len(points)
+    for i in range(count):
+        ax, ay = points[i]
+        bx, by = points[(i + 1) % count]
+        ex, ey = bx - ax, by - ay
+        length = math.hypot(ex, ey)
+        edges.append((ax, ay, ex, ey, outward * ey / length, -outward * ex / length))
+
+    parts = []
+    for part in _convex_parts(points):
+        axes = []
+        for i in range(len(part)):
+            ex = part[(i + 1) % len(part)][0] - part[i][0]
+            ey = part[(i + 1) % len(part)][1] - part[i][1]
+            length = math.hypot(ex, ey)
+            if length == 0:
+                continue
+            nx, ny = ey / length, -ex / length
+            projections = [nx * x + ny * y for x, y in part]
+            axes.append((nx, ny, min(projections), max(projections)))
+        xs = [p[0] for p in part]
+        ys = [p[1] for p in part]
+        parts.append(((min(xs), min(ys), max(xs), max(ys)), tuple(axes)))
+
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return PolygonRecord((min(xs), min(ys), max(xs), max(ys)), tuple(points), tuple(edges), tuple(parts))
+
+
+def _polygon_overlaps_rect(record, left, top, right, bottom, eps=0.0):
+    """
+    Separating axis test polygon vs rect (closed [left, right] x [top, bottom]).
+
+    True jika interior overlap lebih dari eps; hanya bersentuhan = False.
+    eps negatif membuat tepi yang bersentuhan ikut dihitung overlap.
+    """
+    bbox = record.bbox
+    if (bbox[0] >= right - eps or bbox[2] <= left + eps or
+            bbox[1] >= bottom - eps or bbox[3] <= top + eps):
+        return False
+    center_x = (left + right) / 2
+    center_y = (top + bottom) / 2
+    half_w = (right - left) / 2
+    half_h = (bottom - top) / 2
+    for (part_left, part_top, part_right, part_bottom), axes in record.parts:
+        # Axis rect (x, y) = bbox part
+        if (part_left >= right - eps or part_right <= left + eps or
+                part_top >= bottom - eps or part_bottom <= top + eps):
+            continue
+        for nx, ny, low, high in axes:
+            center = nx * center_x + ny * center_y
+            extent = abs(nx) * half_w + abs(ny) * half_h
+            if low >= center + extent - eps or high <= center - extent + eps:
+                break
+        else:
+            return True
+    return False
 
-    def get(self, key):
-        try:
-            val = self.od.pop(key)
-            # re-insert to mark as recently used
-            self.od[key] = val
-            return val
-        except KeyError:
-            return None
 
-    def set(self, key, value):
-        if key in self.od:
-            self.od.pop(key)
-        self.od[key] = value
-        # Evict oldest
-        if len(self.od) > self.maxsize:
-            self.od.popitem(last=False)
+def _ray_segment_time(px, py, dx, dy, ax, ay, ex, ey):
+    """Waktu t saat titik p + t*d memotong segment a + u*e (u di 0..1), atau None"""
+    denom = dx * ey - dy * ex
+    if denom == 0:
+        return None
+    qx, qy = ax - px, ay - py
+    t = (qx * ey - qy * ex) / denom
+    u = (qx * dy - qy * dx) / denom
+    if u < 0.0 or u > 1.0:
+        return None
+    return t
+
+
+def _smoothscale_many(surface, targets):
+    """Scale surface ke beberapa ukuran (dipakai worker background zoom pyramid)
 
-    def clear(self):
-        self.od.clear()
+    Args:
+        surface: Source surface (salinan, tidak di-blit main thread)
+        targets: List of (key, (w, h))
+
+    Returns:
+        List of (key, scaled_surface)
+    """
+    results = []
+    for key, size in targets:
+        try:
+            scaled = pygame.transform.smoothscale(surface, size)
+        except Exception:
+            scaled = pygame.transform.scale(surface, size)
+        results.append((key, scaled))
+    return results
 
 
 class TiledMap:
@@ -60,27 +426,129 @@ class TiledMap:
     - Tile properties dan collision detection
     """
 
-    def __init__(self, tmx_file):
+    def __init__(self, tmx_file, use_cache=True, flatten_static_layers=True,
+                 scroll_reuse=True, background_color=None, streaming=False,
+                 stream_margin=1, stream_memory_budget=64 * 1024 * 1024):
         """
         Load TMX file dari Tiled Map Editor
 
         Args:
             tmx_file: Path ke file .tmx
+            use_cache: Pakai/tulis compiled map cache di sebelah file .tmx
+            flatten_static_layers: Gabungkan layer statis berurutan jadi satu
+                render layer saat load (lihat _build_render_layers)
+            scroll_reuse: Simpan hasil render map di back-buffer dan geser
+                (Surface.scroll) saat kamera bergerak, hanya strip tepi yang
+                baru terlihat digambar ulang
+            background_color: Warna di belakang map. Jika None, back-buffer
+                transparan (SRCALPHA) supaya fill dari game tetap terlihat
+            streaming: (Infinite map) tile data, baked surface, dan collision
+                grid per chunk hanya di-load di sekitar kamera oleh worker
+                background, lalu dilepas lagi saat jauh. Butuh compiled cache.
+            stream_margin: Jumlah chunk di luar layar yang di-load duluan;
+                chunk lebih jauh dari margin + 1 dilepas
+            stream_memory_budget: Batas (perkiraan, bytes) data chunk resident;
+                chunk terjauh di luar layar dilepas jika terlewati
         """
         self.tmx_file = tmx_file
         self.base_path = os.path.dirname(tmx_file)
+        self.use_cache = use_cache
+        self.flatten_static_layers = flatten_static_layers
+        self.scroll_reuse = scroll_reuse
+        self.background_color = background_color
+        self.streaming = streaming
+        self.stream_margin = stream_margin
+        self.stream_memory_budget = stream_memory_budget
         self.layers = []
+        # Layer yang benar-benar digambar: hasil flatten dari self.layers,
+        # dan layer yang digambar di atas entities (property above_entities)
+        self.render_layers = []
+        self.foreground_layers = []
         self.tilesets = []
         self.objects = {}
         self.tile_properties = {}
-        # Small runtime caches
-        self._gid_cache = {}
-        self._scaled_cache = None
+        # Animasi tile: gid -> {'frames': [(frame gid, ms)], 'duration': ms}.
+        # _animation_frames berisi frame aktif per gid (lihat _update_animations)
+        self.tile_animations = {}
+        self._animated_gids = frozenset()
+        self._animation_frames = {}
+        self._animation_tick = None
+        # Chunk baked yang berisi tile animasi: key -> (layer, chunk, cells)
+        self._animated_chunks = {}
+        self._animated_lut = None
+        # Metadata tileset dan file sumber (untuk compiled map cache)
+        self._tileset_meta = []
+        self._dependencies = [tmx_file]
+        # Tileset yang GID-nya belum dipakai layer manapun: di-load on demand
+        self._pending_tilesets = []
+        self._used_gids = set()
+        # Lookup table GID -> tile surface (index langsung dengan GID), plus
+        # tabel paralel untuk zoom aktif. Slot _UNRESOLVED diisi saat dipakai.
+        self._tile_lut = [None]
+        self._zoom_tile_lut = None
+        self._zoom_tile_lut_zoom = None
+        self._tileset_firstgids = []
         self._last_zoom = None
         self._timings = {'draw_total': 0.0, 'draw_count': 0, 'tile_scale_time': 0.0}
         self._frame_count = 0
-        # Add simple LRU cache class instance available at module scope
-        self._gid_cache = {}
+        # Baked chunk surfaces: satu surface per (layer, chunk) pada zoom 1.0,
+        # plus versi yang sudah di-scale untuk zoom aktif. Dibatasi bytes dan
+        # ikut global budget (lihat core/surface_cache.py)
+        map_name = os.path.basename(tmx_file)
+        self._chunk_surfaces = SurfaceCache(f'{map_name} chunks', max_bytes=96 * MB)
+        self._scaled_chunk_surfaces = SurfaceCache(f'{map_name} chunks (zoom)', max_bytes=48 * MB)
+        # Zoom pyramid: (layer, cx, cy, level) -> surface, diisi oleh worker
+        # background dan tidak di-clear saat zoom berubah
+        self._zoom_pyramid = SurfaceCache(f'{map_name} zoom pyramid', max_bytes=96 * MB)
+        # Hasil scale cepat dari level terdekat, dipakai sampai versi
+        # smoothscale untuk zoom persis selesai di background
+        self._provisional_chunk_surfaces = {}
+        # Debug overlay (collision/spawns) yang di-bake per cell dan zoom
+        self._debug_overlays = SurfaceCache(f'{map_name} debug overlay', max_bytes=32 * MB)
+        self._debug_items_cache = None
+        self._debug_items_source = None
+        # LOD super-tiles: (layer, sx, sy, level, None) untuk hasil bake di
+        # level LOD, (layer, sx, sy, level, zoom) untuk versi zoom aktif
+        self._lod_surfaces = SurfaceCache(f'{map_name} LOD', max_bytes=48 * MB)
+        self._lod_provisional = {}
+        # Super-tile yang berisi tile animasi: base key -> (origin, cells),
+        # cells = (col, row) dari origin -> GID yang digambar di cell itu
+        self._lod_animated = {}
+        self._lod_tiles = {}
+        self._prescale_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='map-prescale')
+        self._prescale_jobs = {}
+        self._zoom_settle_frames = 0
+        # World back-buffer untuk scroll reuse (lihat _draw_back_buffer)
+        self._back_buffer = None
+        self._back_buffer_state = None
+        self._back_buffer_origin = (0, 0)
+        self._back_buffer_dirty = True
+        # Area yang perlu digambar ulang, dalam koordinat world * zoom
+        self._back_buffer_dirty_rects = []
+        # Visible source layer per flattened layer (lihat _sync_source_visibility)
+        self._source_visibility = {}
+        # Texture atlas berisi semua tile yang dipakai layers (lihat _build_atlas)
+        self.atlas = None
+        self._opaque_cache = {}
+        # (w, h) pixel tile terbesar yang melewati cell map (lihat get_tile_overhang)
+        self._tile_overhang = None
+        self._transitions = []
+        self._transitions_source = None
+        # Streaming mode (lihat _start_streaming). collision_chunks dipakai
+        # bersama oleh TiledMapCollision: (chunk x, chunk y) -> grid
+        self.collision_chunks = {}
+        # Lookup table GID -> solid (lihat get_solid_lut)
+        self._solid_lut = None
+        self._stream_reader = None
+        self._stream_pool = None
+        self._stream_jobs = {}
+        self._stream_layers = []
+        self._stream_units = {}
+        self._stream_atlas = None
+        self._collision_source_ids = set()
+        self._collision_sources = {}  # (chunk x, chunk y) -> source chunks collision layers
+        self._resident_units = {}
+        self._resident_bytes = 0
 
         # Map properties
         self.width = 0
@@ -91,9 +559,29 @@ class TiledMap:
 
         # Parse TMX file
         self._parse_tmx()
+        image_loader.add_reconvert_listener(self._on_images_reconverted)
+        # Signature file sumber untuk hot reload (lihat poll_hot_reload)
+        self._source_signature = map_cache.build_signature(self._dependencies)
+        self._pending_signature = None
+        self._hot_reload_checked = 0.0
 
     def _parse_tmx(self):
-        """Parse TMX XML file"""
+        """Parse TMX XML file (atau load dari compiled cache jika masih valid)"""
+        if self.use_cache and self.streaming:
+            opened = map_cache.open_compiled_map(self.tmx_file)
+            if opened is not None:
+                # Tile arrays chunk dibaca dari mmap saat chunk dibutuhkan
+                header, self._stream_reader = opened
+                self._load_compiled(header, self._stream_reader,
+                                    lazy_chunks=header['map']['is_infinite'])
+                self._start_streaming()
+                return
+        elif self.use_cache:
+            compiled = map_cache.load_compiled_map(self.tmx_file)
+            if compiled is not None:
+                self._load_compiled(*compiled)
+                return
+
         tree = ET.parse(self.tmx_file)
         root = tree.getroot()
 
@@ -107,46 +595,278 @@ class TiledMap:
         map_type = "INFINITE" if self.is_infinite else "FIXED"
         print(f"[MAP] Loading {map_type} map: {self.width}x{self.height} tiles ({self.tile_width}x{self.tile_height}px)")
 
-        # Parse tilesets
-        for tileset in root.findall('tileset'):
-            self._parse_tileset(tileset)
-
-        # Parse layers
+        # Parse layers dulu supaya tahu GID mana saja yang dipakai
         for layer in root.findall('layer'):
             self._parse_layer(layer)
+        self._used_gids = self._collect_used_gids()
+
+        # Parse tilesets yang dipakai (.tsx + image decode paralel di thread pool),
+        # sisanya ditunda sampai GID-nya diminta
+        tileset_elems = root.findall('tileset')
+        firstgids = sorted(int(tileset.get('firstgid')) for tileset in tileset_elems)
+        used_elems = []
+        for tileset in tileset_elems:
+            firstgid = int(tileset.get('firstgid'))
+            source = tileset.get('source')
+            if source:
+                self._dependencies.append(os.path.join(self.base_path, source))
+            if self._is_range_used(firstgid, self._next_firstgid(firstgids, firstgid)):
+                used_elems.append(tileset)
+            elif source:
+                self._add_pending_tileset({'firstgid': firstgid, 'source': source}, firstgids)
+            else:
+                meta = self._parse_tileset(tileset)
+                if meta is not None:
+                    self._add_pending_tileset({'firstgid': firstgid, 'meta': meta}, firstgids)
+        self._load_tilesets(self._load_tileset_elem, used_elems)
 
         # Parse object groups (untuk collision, spawn points, dll)
         for objectgroup in root.findall('objectgroup'):
             self._parse_objectgroup(objectgroup)
 
+        self._build_atlas()
+        self._build_render_layers()
+        print(f"✅ Map loaded: {len(self.layers)} layers, {len(self.tilesets)} tilesets")
+
+        if self.use_cache:
+            self._save_compiled()
+        if self.streaming:
+            self._start_streaming()
+
+    def _save_compiled(self):
+        """Tulis compiled map cache dari data yang sudah di-parse"""
+        tile_arrays = []
+        layers = []
+        for layer in self.layers:
+            if layer['is_chunked']:
+                chunks = []
+                for chunk in layer['chunks']:
+                    chunks.append({
+                        'x': chunk['x'],
+                        'y': chunk['y'],
+                        'width': chunk['width'],
+                        'height': chunk['height'],
+                        'data': len(tile_arrays)
+                    })
+                    chunk['array_index'] = len(tile_arrays)
+                    tile_arrays.append(chunk['data'])
+                layers.append({
+                    'name': layer['name'],
+                    'visible': layer['visible'],
+                    'properties': layer['properties'],
+                    'is_chunked': True,
+                    'chunks': chunks
+                })
+            else:
+                layers.append({
+                    'name': layer['name'],
+                    'visible': layer['visible'],
+                    'properties': layer['properties'],
+                    'is_chunked': False,
+                    'width': layer['width'],
+                    'height': layer['height'],
+                    'data': len(tile_arrays)
+                })
+                tile_arrays.append(layer['data'])
+
+        header = {
+            'map': {
+                'width': self.width,
+                'height': self.height,
+                'tile_width': self.tile_width,
+                'tile_height': self.tile_height,
+                'is_infinite': self.is_infinite
+            },
+            'tilesets': self._tileset_meta,
+            'pending_tilesets': self._pending_tilesets,
+            'layers': layers,
+            'objects': self.objects
+        }
+        if map_cache.save_compiled_map(self.tmx_file, header, tile_arrays, self._dependencies):
+            print(f"  💾 Compiled map cache written: {map_cache.cache_path_for(self.tmx_file)}")
+
+    def _load_compiled(self, header, tile_arrays, lazy_chunks=False):
+        """Restore map dari compiled cache (tanpa parse XML/decode chunk)
+
+        Args:
+            tile_arrays: List of array('I') atau CompiledMapReader
+            lazy_chunks: Jangan baca tile data chunk (streaming mode); chunk
+                hanya menyimpan 'array_index' ke tile_arrays
+        """
+        map_info = header['map']
+        self.width = map_info['width']
+        self.height = map_info['height']
+        self.tile_width = map_info['tile_width']
+        self.tile_height = map_info['tile_height']
+        self.is_infinite = map_info['is_infinite']
+
+        map_type = "INFINITE" if self.is_infinite else "FIXED"
+        print(f"[MAP] Loading {map_type} map from cache: {self.width}x{self.height} tiles ({self.tile_width}x{self.tile_height}px)")
+
+        for layer in header['layers']:
+            if layer['is_chunked']:
+                chunks = [
+                    (c['x'], c['y'], c['width'], c['height'],
+                     None if lazy_chunks else tile_arrays[c['data']])
+                    for c in layer['chunks']
+                ]
+                self._add_chunked_layer(layer['name'], layer['visible'], chunks,
+                                        layer['properties'])
+                for chunk, c in zip(self.layers[-1]['chunks'], layer['chunks']):
+                    chunk['array_index'] = c['data']
+            else:
+                self._add_fixed_layer(layer['name'], layer['visible'], layer['width'],
+                                      layer['height'], tile_arrays[layer['data']],
+                                      layer['properties'])
+        self._used_gids = self._collect_used_gids()
+
+        # JSON menyimpan key dict sebagai string
+        for meta in header['tilesets']:
+            meta['tile_properties'] = {int(k): v for k, v in meta['tile_properties'].items()}
+            meta['animations'] = {int(k): v for k, v in meta['animations'].items()}
+        for entry in header['pending_tilesets']:
+            if 'meta' in entry:
+                meta = entry['meta']
+                meta['tile_properties'] = {int(k): v for k, v in meta['tile_properties'].items()}
+                meta['animations'] = {int(k): v for k, v in meta['animations'].items()}
+        self._pending_tilesets = header['pending_tilesets']
+        self._load_tilesets(self._load_tileset_meta, header['tilesets'])
+
+        for name, objects in header['objects'].items():
+            for obj in objects:
+                if obj['polygon'] is not None:
+                    obj['polygon'] = [tuple(p) for p in obj['polygon']]
+            self.objects[name] = objects
+            print(f"  📍 Object layer '{name}': {len(objects)} objects")
+
+        self._build_atlas()
+        self._build_render_layers()
         print(f"✅ Map loaded: {len(self.layers)} layers, {len(self.tilesets)} tilesets")
 
+    def _collect_used_gids(self, layers=None):
+        """Kumpulkan semua GID yang dipakai tile layers (default: semua layer)"""
+        used_gids = set()
+        for layer in self.layers if layers is None else layers:
+            if layer['is_chunked']:
+                for chunk in layer['chunks']:
+                    data = chunk['data']
+                    if data is None:
+                        # Chunk belum resident (streaming): baca sementara saja
+                        data = self._stream_reader.read(chunk['array_index'])
+                    used_gids.update(data)
+            else:
+                used_gids.update(layer['data'])
+        used_gids.discard(0)
+        return used_gids
+
+    def _next_firstgid(self, firstgids, firstgid):
+        """Return firstgid tileset berikutnya (batas atas range GID), atau None"""
+        idx = bisect.bisect_right(firstgids, firstgid)
+        return firstgids[idx] if idx < len(firstgids) else None
+
+    def _is_range_used(self, firstgid, end_gid):
+        """True jika ada GID terpakai di range [firstgid, end_gid)"""
+        for gid in self._used_gids:
+            if gid >= firstgid and (end_gid is None or gid < end_gid):
+                return True
+        return False
+
+    def _add_pending_tileset(self, entry, firstgids):
+        """Tunda loading tileset yang belum dipakai layer manapun"""
+        entry['end_gid'] = self._next_firstgid(firstgids, entry['firstgid'])
+        self._pending_tilesets.append(entry)
+
+    def _ensure_tileset_for_gid(self, gid):
+        """Load tileset yang masih pending jika gid berada di range-nya"""
+        for entry in self._pending_tilesets:
+            if gid >= entry['firstgid'] and (entry['end_gid'] is None or gid < entry['end_gid']):
+                break
+        else:
+            return
+
+        self._pending_tilesets.remove(entry)
+        if 'meta' in entry:
+            meta = entry['meta']
+        else:
+            meta = self._parse_external_tileset(entry['firstgid'], entry['source'])
+        result = self._load_tileset_meta(meta) if meta is not None else None
+        if result is not None and self._register_tileset(*result):
+            print(f"[MAP] Loaded tileset on demand: '{meta['name']}' (gid {gid})")
+
+    def _load_tilesets(self, worker, items):
+        """
+        Jalankan worker untuk semua tileset di thread pool, lalu register
+        hasilnya dalam urutan firstgid (dibutuhkan get_tile_surface).
+
+        Args:
+            worker: Callable(item) -> (meta, tileset_data) atau None.
+                tileset_data None jika image tileset gagal di-load
+            items: Tileset elements (dari XML) atau metadata (dari cache)
+        """
+        if not items:
+            return
+
+        max_workers = min(len(items), (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = [result for result in pool.map(worker, items) if result is not None]
+
+        results.sort(key=lambda result: result[0]['firstgid'])
+        for meta, tileset_data in results:
+            self._register_tileset(meta, tileset_data)
+
+    def _load_tileset_elem(self, tileset_elem):
+        """Worker: parse <tileset> (dan .tsx eksternal) lalu load image-nya"""
+        meta = self._parse_tileset(tileset_elem)
+        if meta is None:
+            return None
+        return self._load_tileset_meta(meta)
+
+    def _load_tileset_meta(self, meta):
+        """Worker: load image untuk tileset metadata (tileset_data None jika gagal)"""
+        return meta, self._load_tileset(meta)
+
     def _parse_tileset(self, tileset_elem):
-        """Parse tileset information (embedded or external)"""
+        """Parse tileset information (embedded or external)
+
+        Returns:
+            Tileset metadata dict, atau None jika gagal
+        """
         firstgid = int(tileset_elem.get('firstgid'))
 
         # Check if external tileset
         source = tileset_elem.get('source')
         if source:
-            # Load external .tsx file
-            tsx_path = os.path.join(self.base_path, source)
-            if os.path.exists(tsx_path):
-                try:
-                    tsx_tree = ET.parse(tsx_path)
-                    tsx_root = tsx_tree.getroot()
-                    # Pass tileset directory as base for resolving image paths inside tsx
-                    tsx_dir = os.path.dirname(tsx_path)
-                    self._parse_tileset_data(tsx_root, firstgid, tileset_base=tsx_dir)
-                except Exception as e:
-                    print(f"⚠️  Failed to load external tileset {source}: {e}")
-            else:
-                print(f"⚠️  External tileset not found: {tsx_path}")
+            return self._parse_external_tileset(firstgid, source)
         else:
             # Embedded tileset
-            self._parse_tileset_data(tileset_elem, firstgid, tileset_base=self.base_path)
+            return self._parse_tileset_data(tileset_elem, firstgid, tileset_base=self.base_path)
+
+    def _parse_external_tileset(self, firstgid, source):
+        """Load external .tsx file
+
+        Returns:
+            Tileset metadata dict, atau None jika gagal
+        """
+        tsx_path = os.path.join(self.base_path, source)
+        if os.path.exists(tsx_path):
+            try:
+                tsx_tree = ET.parse(tsx_path)
+                tsx_root = tsx_tree.getroot()
+                # Pass tileset directory as base for resolving image paths inside tsx
+                tsx_dir = os.path.dirname(tsx_path)
+                return self._parse_tileset_data(tsx_root, firstgid, tileset_base=tsx_dir)
+            except Exception as e:
+                print(f"⚠️  Failed to load external tileset {source}: {e}")
+        else:
+            print(f"⚠️  External tileset not found: {tsx_path}")
+        return None
 
     def _parse_tileset_data(self, tileset_elem, firstgid, tileset_base=None):
-        """Parse actual tileset data (dari embedded atau external tileset)"""
+        """Parse actual tileset data (dari embedded atau external tileset)
+
+        Returns:
+            Tileset metadata dict (image belum di-load), atau None
+        """
         name = tileset_elem.get('name', 'unnamed')
         tile_width = int(tileset_elem.get('tilewidth'))
         tile_height = int(tileset_elem.get('tileheight'))
@@ -155,44 +875,93 @@ class TiledMap:
         image_elem = tileset_elem.find('image')
         if image_elem is None:
             print(f"⚠️  No image found for tileset '{name}'")
-            return
+            return None
 
         source = image_elem.get('source')
         image_width_attr = image_elem.get('width')
         image_height_attr = image_elem.get('height')
 
+        # Image path candidates: absolute path, relative ke tileset_base (tsx dir),
+        # relative ke TMX base, lalu as given (current working dir)
+        if os.path.isabs(source):
+            candidates = [source]
+        else:
+            candidates = []
+            if tileset_base:
+                candidates.append(os.path.join(tileset_base, source))
+            candidates.append(os.path.join(self.base_path, source))
+            candidates.append(source)
+
+        # Parse tile properties (collision, etc) dan animasi, keyed by local tile id
+        tile_properties = {}
+        animations = {}
+        for tile in tileset_elem.findall('tile'):
+            tile_id = int(tile.get('id'))
+
+            properties = {}
+            props_elem = tile.find('properties')
+            if props_elem is not None:
+                for prop in props_elem.findall('property'):
+                    prop_name = prop.get('name')
+                    prop_value = prop.get('value')
+                    properties[prop_name] = prop_value
+
+            tile_properties[tile_id] = properties
+
+            animation_elem = tile.find('animation')
+            if animation_elem is not None:
+                frames = [
+                    [int(frame.get('tileid')), max(1, int(frame.get('duration', 100)))]
+                    for frame in animation_elem.findall('frame')
+                ]
+                if frames:
+                    animations[tile_id] = frames
+
+        meta = {
+            'firstgid': firstgid,
+            'name': name,
+            'tile_width': tile_width,
+            'tile_height': tile_height,
+            'image_candidates': candidates,
+            'image_width': int(image_width_attr) if image_width_attr else None,
+            'image_height': int(image_height_attr) if image_height_attr else None,
+            'tile_properties': tile_properties,
+            'animations': animations
+        }
+        return meta
+
+    def _load_tileset(self, meta):
+        """Load tileset image dan potong jadi tiles (aman dipanggil dari worker thread)
+
+        Returns:
+            Tileset data dict, atau None jika image gagal di-load
+        """
+        name = meta['name']
+        tile_width = meta['tile_width']
+        tile_height = meta['tile_height']
+        firstgid = meta['firstgid']
+
         # Load tileset image
         tileset_image = None
+        tried = []
         try:
-            # If source is absolute, use directly
-            if os.path.isabs(source) and os.path.exists(source):
-                tileset_image = pygame.image.load(source)
-            else:
-                # Try relative to tileset_base (tsx dir) first, then TMX base
-                tried = []
-                if tileset_base:
-                    source_path = os.path.join(tileset_base, source)
-                    tried.append(source_path)
-                    if os.path.exists(source_path):
-                        tileset_image = pygame.image.load(source_path)
-                if tileset_image is None:
-                    # Fallback to TMX base path
-                    source_path = os.path.join(self.base_path, source)
-                    tried.append(source_path)
-                    if os.path.exists(source_path):
-                        tileset_image = pygame.image.load(source_path)
-                if tileset_image is None:
-                    # Try as given (current working dir)
-                    tried.append(source)
-                    tileset_image = pygame.image.load(source)
+            for candidate in meta['image_candidates']:
+                tried.append(candidate)
+                if os.path.exists(candidate):
+                    tileset_image = image_loader.load_image(candidate)
+                    # Simpan path yang berhasil supaya cache tidak perlu probe lagi
+                    meta['image_candidates'] = [candidate]
+                    break
+            if tileset_image is None:
+                raise FileNotFoundError("image not found")
         except Exception as e:
-            print(f"⚠️  Failed to load tileset image '{source}' (tried: {tried}): {e}")
-            return
+            print(f"⚠️  Failed to load tileset image '{name}' (tried: {tried}): {e}")
+            return None
 
         # Get image dimensions
-        if image_width_attr and image_height_attr:
-            image_width = int(image_width_attr)
-            image_height = int(image_height_attr)
+        if meta['image_width'] and meta['image_height']:
+            image_width = meta['image_width']
+            image_height = meta['image_height']
         else:
             image_width, image_height = tileset_image.get_size()
 
@@ -200,56 +969,105 @@ class TiledMap:
         cols = image_width // tile_width
         rows = image_height // tile_height
 
-        # Extract individual tiles
-        tiles = []
-        for row in range(rows):
-            for col in range(cols):
-                rect = pygame.Rect(
-                    col * tile_width,
-                    row * tile_height,
-                    tile_width,
-                    tile_height
-                )
-                try:
-                    tile_surface = tileset_image.subsurface(rect)
-                    tiles.append(tile_surface)
-                except:
-                    # Create empty tile if subsurface fails
-                    empty_tile = pygame.Surface((tile_width, tile_height))
-                    empty_tile.fill((255, 0, 255))  # Magenta untuk missing tile
-                    tiles.append(empty_tile)
-
         tileset_data = {
             'firstgid': firstgid,
             'name': name,
-            'tiles': tiles,
+            'image': tileset_image,
+            'image_path': meta['image_candidates'][0],
+            'columns': cols,
+            'tile_count': cols * rows,
+            'tiles': [None] * (cols * rows),
             'tile_width': tile_width,
             'tile_height': tile_height
         }
 
-        # Parse tile properties (collision, etc)
-        for tile in tileset_elem.findall('tile'):
-            tile_id = int(tile.get('id'))
-            global_id = firstgid + tile_id
-
-            properties = {}
-            props_elem = tile.find('properties')
-            if props_elem is not None:
-                for prop in props_elem.findall('property'):
-                    prop_name = prop.get('name')
-                    prop_value = prop.get('value')
-                    properties[prop_name] = prop_value
+        # Extract hanya tiles yang dipakai layers (plus frame animasinya),
+        # sisanya di-slice saat diminta
+        for local_id in range(cols * rows):
+            if firstgid + local_id in self._used_gids:
+                self._slice_tile(tileset_data, local_id)
+        for local_id, frames in meta['animations'].items():
+            if firstgid + local_id in self._used_gids:
+                for frame_id, _ in frames:
+                    if frame_id < cols * rows and tileset_data['tiles'][frame_id] is None:
+                        self._slice_tile(tileset_data, frame_id)
+
+        return tileset_data
+
+    def _slice_tile(self, tileset, local_id):
+        """Extract satu tile dari tileset image (hasilnya disimpan di tileset['tiles'])"""
+        tile_width = tileset['tile_width']
+        tile_height = tileset['tile_height']
+        rect = pygame.Rect(
+            (local_id % tileset['columns']) * tile_width,
+            (local_id // tileset['columns']) * tile_height,
+            tile_width,
+            tile_height
+        )
+        try:
+            tile_surface = tileset['image'].subsurface(rect)
+        except:
+            # Create empty tile if subsurface fails
+            tile_surface = pygame.Surface((tile_width, tile_height))
+            tile_surface.fill((255, 0, 255))  # Magenta untuk missing tile
+        tileset['tiles'][local_id] = tile_surface
+        return tile_surface
 
-            self.tile_properties[global_id] = properties
+    def _register_tileset(self, meta, tileset_data):
+        """Register tileset yang sudah di-load dan tile properties-nya.
 
-        self.tilesets.append(tileset_data)
-        print(f"  📦 Tileset '{name}': {len(tiles)} tiles (firstgid: {firstgid})")
+        Returns:
+            False jika image tileset gagal di-load. Path image yang dicari
+            tetap dicatat di _dependencies, jadi compiled cache jadi invalid
+            dan hot reload jalan begitu file image-nya muncul.
+        """
+        if tileset_data is None:
+            for path in meta['image_candidates']:
+                if path not in self._dependencies:
+                    self._dependencies.append(path)
+            return False
+        firstgid = meta['firstgid']
+        for tile_id, properties in meta['tile_properties'].items():
+            self.tile_properties[firstgid + tile_id] = properties
+        for tile_id, frames in meta['animations'].items():
+            frames = [(firstgid + frame_id, duration) for frame_id, duration in frames
+                      if frame_id < tileset_data['tile_count']]
+            if not frames:
+                continue
+            gid = firstgid + tile_id
+            self.tile_animations[gid] = {
+                'frames': frames,
+                'duration': sum(duration for _, duration in frames)
+            }
+            if gid in self._used_gids:
+                # Frame ikut di-pack ke atlas
+                self._used_gids.update(frame_gid for frame_gid, _ in frames)
+        if meta['animations']:
+            self._animated_gids = frozenset(self.tile_animations)
+
+        # Jaga self.tilesets tetap urut firstgid (juga untuk tileset on-demand)
+        index = bisect.bisect_right(self._tileset_firstgids, firstgid)
+        self.tilesets.insert(index, tileset_data)
+        self._tileset_firstgids.insert(index, firstgid)
+
+        # Perbesar lookup table sampai GID terakhir tileset ini
+        end_gid = firstgid + tileset_data['tile_count']
+        if end_gid > len(self._tile_lut):
+            self._tile_lut.extend([_UNRESOLVED] * (end_gid - len(self._tile_lut)))
+        self._tileset_meta.append(meta)
+        self._dependencies.append(meta['image_candidates'][0])
+        self._tile_overhang = None
+        used = sum(1 for tile in tileset_data['tiles'] if tile is not None)
+        print(f"  📦 Tileset '{meta['name']}': {used}/{tileset_data['tile_count']} tiles used (firstgid: {firstgid})")
+        return True
 
     def _decode_layer_data(self, data_elem, encoding=None, compression=None):
         """Decode layer data berdasarkan encoding dan compression
 
         If `encoding`/`compression` are provided they take precedence (used when
         decoding <chunk> elements where the parent <data> holds the encoding attrs).
+
+        Returns flat array('I') of tile IDs (decoded in bulk, bukan per tile).
         """
         encoding = encoding or data_elem.get('encoding', 'xml')
         compression = compression or data_elem.get('compression')
@@ -257,8 +1075,8 @@ class TiledMap:
         if encoding == 'csv':
             # CSV encoding
             csv_data = data_elem.text.strip()
-            tile_ids = [int(x) for x in csv_data.replace('\n', '').split(',') if x.strip()]
-            return tile_ids
+            tokens = csv_data.replace('\n', '').split(',')
+            return array('I', map(int, filter(str.strip, tokens)))
 
         elif encoding == 'base64':
             # Base64 encoding
@@ -272,21 +1090,15 @@ class TiledMap:
                 raw_data = gzip.decompress(raw_data)
 
             # Convert bytes to tile IDs (little-endian 32-bit integers)
-            tile_ids = []
-            for i in range(0, len(raw_data), 4):
-                if i + 4 <= len(raw_data):
-                    tile_id = int.from_bytes(raw_data[i:i+4], byteorder='little')
-                    tile_ids.append(tile_id)
-
+            tile_ids = array('I')
+            tile_ids.frombytes(raw_data[:len(raw_data) - len(raw_data) % 4])
+            if sys.byteorder == 'big':
+                tile_ids.byteswap()
             return tile_ids
 
         else:
             # XML encoding (fallback)
-            tile_ids = []
-            for tile in data_elem.findall('tile'):
-                gid = int(tile.get('gid', 0))
-                tile_ids.append(gid)
-            return tile_ids
+            return array('I', (int(tile.get('gid', 0)) for tile in data_elem.findall('tile')))
 
     def _parse_layer(self, layer_elem):
         """Parse tile layer (support infinite maps dengan chunks)"""
@@ -295,82 +1107,360 @@ class TiledMap:
         height = int(layer_elem.get('height', 0))
         visible = layer_elem.get('visible', '1') == '1'
 
+        # Custom properties (misal static / above_entities)
+        properties = {}
+        props_elem = layer_elem.find('properties')
+        if props_elem is not None:
+            for prop in props_elem.findall('property'):
+                properties[prop.get('name')] = prop.get('value')
+
         data_elem = layer_elem.find('data')
         if data_elem is None:
             return
 
         # Check for chunks (infinite map)
-        chunks = data_elem.findall('chunk')
+        chunk_elems = data_elem.findall('chunk')
 
-        if chunks:
+        if chunk_elems:
             # Infinite map with chunks
-            layer_data = {
-                'name': name,
-                'visible': visible,
-                'is_chunked': True,
-                'chunks': []
-            }
-
-            for chunk_elem in chunks:
-                chunk_x = int(chunk_elem.get('x'))
-                chunk_y = int(chunk_elem.get('y'))
-                chunk_width = int(chunk_elem.get('width'))
-                chunk_height = int(chunk_elem.get('height'))
-
+            chunks = []
+            for chunk_elem in chunk_elems:
                 # Decode chunk data. encoding/compression stored on parent <data>
                 tile_ids = self._decode_layer_data(
                     chunk_elem,
                     encoding=data_elem.get('encoding'),
                     compression=data_elem.get('compression')
                 )
-
-                # Convert to 2D array
-                tiles = []
-                for row in range(chunk_height):
-                    start = row * chunk_width
-                    end = start + chunk_width
-                    if end <= len(tile_ids):
-                        row_data = tile_ids[start:end]
-                        tiles.append(row_data)
-
-                chunk_data = {
-                    'x': chunk_x,
-                    'y': chunk_y,
-                    'width': chunk_width,
-                    'height': chunk_height,
-                    'tiles': tiles
-                }
-
-                layer_data['chunks'].append(chunk_data)
-
-            print(f"  🗺️  Layer '{name}': {len(chunks)} chunks (infinite)")
+                chunks.append((
+                    int(chunk_elem.get('x')),
+                    int(chunk_elem.get('y')),
+                    int(chunk_elem.get('width')),
+                    int(chunk_elem.get('height')),
+                    tile_ids
+                ))
+            self._add_chunked_layer(name, visible, chunks, properties)
 
         else:
             # Standard fixed-size map
             tile_ids = self._decode_layer_data(data_elem)
+            self._add_fixed_layer(name, visible, width, height, tile_ids, properties)
 
-            # Convert to 2D array
-            tiles = []
-            for row in range(height):
-                start = row * width
-                end = start + width
-                if end <= len(tile_ids):
-                    row_data = tile_ids[start:end]
-                    tiles.append(row_data)
-
-            layer_data = {
-                'name': name,
-                'tiles': tiles,
-                'visible': visible,
-                'is_chunked': False,
-                'width': width,
-                'height': height
+    def _split_rows(self, tile_ids, width, height):
+        """Convert flat tile IDs ke 2D array (list of zero-copy row views)"""
+        view = memoryview(tile_ids)
+        tiles = []
+        for row in range(height):
+            start = row * width
+            end = start + width
+            if end <= len(tile_ids):
+                tiles.append(view[start:end])
+        return tiles
+
+    def _add_chunked_layer(self, name, visible, chunks, properties=None):
+        """Register chunked layer dari list (x, y, width, height, tile_ids)
+
+        tile_ids None berarti tile data chunk belum di-load (streaming mode).
+        """
+        layer_data = {
+            'name': name,
+            'index': len(self.layers),
+            'visible': visible,
+            'properties': properties or {},
+            'is_chunked': True,
+            'chunks': []
+        }
+
+        for chunk_x, chunk_y, chunk_width, chunk_height, tile_ids in chunks:
+            chunk_data = {
+                'x': chunk_x,
+                'y': chunk_y,
+                'width': chunk_width,
+                'height': chunk_height,
+                'data': tile_ids,
+                'tiles': None if tile_ids is None else self._split_rows(tile_ids, chunk_width, chunk_height)
             }
+            layer_data['chunks'].append(chunk_data)
+
+        self._index_chunks(layer_data)
 
-            print(f"  🗺️  Layer '{name}': {width}x{height} tiles")
+        print(f"  🗺️  Layer '{name}': {len(chunks)} chunks (infinite)")
+        self.layers.append(layer_data)
+
+    def _add_fixed_layer(self, name, visible, width, height, tile_ids, properties=None):
+        """Register fixed-size layer dari flat tile IDs"""
+        layer_data = {
+            'name': name,
+            'index': len(self.layers),
+            'data': tile_ids,
+            'tiles': self._split_rows(tile_ids, width, height),
+            'visible': visible,
+            'properties': properties or {},
+            'is_chunked': False,
+            'width': width,
+            'height': height
+        }
 
+        print(f"  🗺️  Layer '{name}': {width}x{height} tiles")
         self.layers.append(layer_data)
 
+    def _build_atlas(self):
+        """Pack semua tile yang dipakai layers ke texture atlas"""
+        tiles = {}
+        for gid in self._used_gids:
+            surface = self.get_tile_surface(gid)
+            if surface is not None:
+                tiles[gid] = surface
+
+        self.atlas = TileAtlas(tiles)
+        # Lookup table menunjuk ke cell atlas (format surface atlas, cepat di-blit)
+        for gid, (page_index, rect) in self.atlas.entries.items():
+            if gid < len(self._tile_lut):
+                self._tile_lut[gid] = self.atlas.pages[page_index].subsurface(rect)
+        print(f"  🧩 Tile atlas: {len(self.atlas)} tiles in {len(self.atlas.pages)} page(s)")
+
+    def _on_images_reconverted(self):
+        """Ambil tileset image yang sudah di-convert ulang (dipanggil image_loader)"""
+        for tileset in self.tilesets:
+            image = image_loader.get_cached(tileset['image_path'])
+            if image is None:
+                continue
+            tileset['image'] = image
+            for local_id, tile in enumerate(tileset['tiles']):
+                if tile is not None:
+                    self._slice_tile(tileset, local_id)
+
+        self._tile_lut = [None] + [_UNRESOLVED] * (len(self._tile_lut) - 1)
+        self._build_atlas()
+        if self.streaming:
+            self._stream_atlas = self._snapshot_atlas()
+        self._reset_render_caches()
+
+    def _reset_render_caches(self):
+        """Buang semua surface turunan (baked/scaled chunks, back-buffer)"""
+        for job in self._prescale_jobs.values():
+            job.cancel()
+        self._prescale_jobs.clear()
+        self._chunk_surfaces.clear()
+        self._scaled_chunk_surfaces.clear()
+        self._zoom_pyramid.clear()
+        self._provisional_chunk_surfaces.clear()
+        self._animated_chunks.clear()
+        self._animated_lut = None
+        self._lod_surfaces.clear()
+        self._lod_provisional.clear()
+        self._lod_animated.clear()
+        self._lod_tiles.clear()
+        self._zoom_tile_lut = None
+        self._back_buffer = None
+        self.invalidate_back_buffer()
+
+    def _layer_flag(self, layer, name, default=False):
+        """Baca boolean custom property dari layer"""
+        value = layer['properties'].get(name)
+        if value is None:
+            return default
+        return str(value).lower() == 'true'
+
+    def _build_render_layers(self):
+        """
+        Susun layer yang digambar setiap frame.
+
+        Layer statis yang berurutan (dan kompatibel) digabung jadi satu
+        flattened layer, jadi satu blit per chunk untuk semua layer tersebut.
+        Property layer di Tiled:
+        - static=false: jangan di-flatten (digambar sendiri)
+        - above_entities=true: digambar setelah NPC/player via draw_foreground
+        """
+        self.render_layers = []
+        self.foreground_layers = []
+        next_index = len(self.layers)
+        group = []
+        # Tile lebih besar dari cell menutup chunk sebelah: layer-nya tidak
+        # di-flatten supaya urutan gambar antar layer tetap per layer
+        overhang = self.get_tile_overhang() != (0, 0)
+
+        def flush():
+            nonlocal next_index
+            if len(group) == 1:
+                self.render_layers.append(group[0])
+            elif group:
+                self.render_layers.append(self._flatten_layers(group, next_index))
+                next_index += 1
+            group.clear()
+
+        for layer in self.layers:
+            if not layer['visible']:
+                continue
+            if self._layer_flag(layer, 'above_entities'):
+                self.foreground_layers.append(layer)
+                continue
+            if not (self.flatten_static_layers and self._layer_flag(layer, 'static', True)) or (
+                    overhang and any(map(self._is_oversized_gid, self._collect_used_gids([layer])))):
+                flush()
+                self.render_layers.append(layer)
+                continue
+            if group and not self._can_flatten_together(group[0], layer):
+                flush()
+            group.append(layer)
+        flush()
+
+    def _can_flatten_together(self, first, layer):
+        """Layer bisa digabung jika layout chunk/ukurannya sama"""
+        if first['is_chunked'] != layer['is_chunked']:
+            return False
+        if first['is_chunked']:
+            return (first['chunk_index'] is not None and layer['chunk_index'] is not None and
+                    first['chunk_width'] == layer['chunk_width'] and
+                    first['chunk_height'] == layer['chunk_height'])
+        return first['width'] == layer['width'] and first['height'] == layer['height']
+
+    def _flatten_layers(self, group, index):
+        """
+        Gabungkan beberapa layer statis jadi satu chunked render layer.
+
+        Setiap chunk menyimpan source chunks dari semua source layer (bawah ke
+        atas); komposisi dan occlusion culling dilakukan saat chunk di-bake.
+        Fixed-size layers dipotong jadi chunk sintetis FLATTEN_CHUNK_SIZE.
+        """
+        merged = {}
+        if group[0]['is_chunked']:
+            chunk_width = group[0]['chunk_width']
+            chunk_height = group[0]['chunk_height']
+            for layer in group:
+                for key, chunk in layer['chunk_index'].items():
+                    entry = merged.get(key)
+                    if entry is None:
+                        entry = merged[key] = {
+                            'x': chunk['x'],
+                            'y': chunk['y'],
+                            'width': chunk_width,
+                            'height': chunk_height,
+                            'source_chunks': [],
+                            'source_layers': []
+                        }
+                    entry['source_chunks'].append(chunk)
+                    entry['source_layers'].append(layer)
+        else:
+            chunk_width = chunk_height = FLATTEN_CHUNK_SIZE
+            width = group[0]['width']
+            height = group[0]['height']
+            for y in range(0, height, chunk_height):
+                for x in range(0, width, chunk_width):
+                    w = min(chunk_width, width - x)
+                    h = min(chunk_height, height - y)
+                    merged[(x // chunk_width, y // chunk_height)] = {
+                        'x': x,
+                        'y': y,
+                        'width': w,
+                        'height': h,
+                        'source_chunks': [
+                            {'tiles': [row[x:x + w] for row in layer['tiles'][y:y + h]]}
+                            for layer in group
+                        ],
+                        'source_layers': list(group)
+                    }
+
+        names = [layer['name'] for layer in group]
+        print(f"  🥞 Flattened static layers: {', '.join(names)}")
+        return {
+            'name': ' + '.join(names),
+            'index': index,
+            'visible': True,
+            'properties': {},
+            'is_chunked': True,
+            'is_flattened': True,
+            'source_layers': names,
+            'sources': list(group),
+            'chunks': list(merged.values()),
+            'chunk_index': merged,
+            'chunk_width': chunk_width,
+            'chunk_height': chunk_height
+        }
+
+    def is_tile_opaque(self, gid):
+        """True jika tile menutup penuh satu cell (tidak ada pixel transparan)"""
+        cached = self._opaque_cache.get(gid)
+        if cached is not None:
+            return cached
+
+        animation = self.tile_animations.get(gid)
+        if animation is not None:
+            # Tile animasi hanya menutupi tile di bawahnya jika semua frame opaque
+            opaque = all(self._is_surface_opaque(self.get_tile_surface(frame_gid))
+                         for frame_gid, _ in animation['frames'])
+        else:
+            opaque = self._is_surface_opaque(self.get_tile_surface(gid))
+        self._opaque_cache[gid] = opaque
+        return opaque
+
+    def _is_surface_opaque(self, surface):
+        if surface is None:
+            return False
+        w, h = surface.get_size()
+        if w < self.tile_width or h < self.tile_height:
+            return False
+        if surface.get_flags() & pygame.SRCALPHA or surface.get_colorkey() is not None:
+            # Mask bit aktif hanya jika alpha == 255 (dan bukan colorkey)
+            return pygame.mask.from_surface(surface, 254).count() == w * h
+        return True
+
+    def _index_chunks(self, layer_data):
+        """Index chunks berdasarkan koordinat grid chunk (chunk_x, chunk_y).
+
+        Tiled selalu menulis chunk dengan ukuran seragam dan sejajar grid,
+        jadi draw path bisa langsung menghitung range chunk yang terlihat.
+        Jika tidak seragam, index di-set None dan draw path scan semua chunk.
+        """
+        chunks = layer_data['chunks']
+        layer_data['chunk_index'] = None
+        if not chunks:
+            return
+
+        chunk_width = chunks[0]['width']
+        chunk_height = chunks[0]['height']
+        index = {}
+        for chunk in chunks:
+            if (chunk['width'] != chunk_width or chunk['height'] != chunk_height or
+                    chunk['x'] % chunk_width or chunk['y'] % chunk_height):
+                return
+            index[(chunk['x'] // chunk_width, chunk['y'] // chunk_height)] = chunk
+
+        layer_data['chunk_width'] = chunk_width
+        layer_data['chunk_height'] = chunk_height
+        layer_data['chunk_index'] = index
+
+    def get_visible_chunks(self, layer, view_left, view_top, view_right, view_bottom):
+        """Return chunks dari layer yang overlap dengan view (world pixels)."""
+        index = layer.get('chunk_index')
+        if index is None:
+            # Fallback: bounding-box test per chunk
+            visible = []
+            for chunk in layer['chunks']:
+                chunk_px_x = chunk['x'] * self.tile_width
+                chunk_px_y = chunk['y'] * self.tile_height
+                chunk_px_w = chunk['width'] * self.tile_width
+                chunk_px_h = chunk['height'] * self.tile_height
+                if (chunk_px_x + chunk_px_w < view_left or chunk_px_x > view_right or
+                    chunk_px_y + chunk_px_h < view_top or chunk_px_y > view_bottom):
+                    continue
+                visible.append(chunk)
+            return visible
+
+        chunk_px_w = layer['chunk_width'] * self.tile_width
+        chunk_px_h = layer['chunk_height'] * self.tile_height
+        first_cx = math.floor(view_left / chunk_px_w)
+        last_cx = math.floor(view_right / chunk_px_w)
+        first_cy = math.floor(view_top / chunk_px_h)
+        last_cy = math.floor(view_bottom / chunk_px_h)
+
+        visible = []
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                chunk = index.get((cx, cy))
+                if chunk is not None:
+                    visible.append(chunk)
+        return visible
+
     def _parse_objectgroup(self, objectgroup_elem):
         """Parse object group (collision, spawn points, etc)"""
         name = objectgroup_elem.get('name')
@@ -445,53 +1535,72 @@ class TiledMap:
 
     def get_tile_surface(self, gid):
         """Get pygame surface untuk tile dengan GID tertentu"""
-        if gid == 0:
-            return None
-        # Use small cache to avoid scanning tilesets every tile draw
-        if gid in self._gid_cache:
-            return self._gid_cache[gid]
-
-        for tileset in reversed(self.tilesets):  # Check from last to first
-            if gid >= tileset['firstgid']:
-                local_id = gid - tileset['firstgid']
-                if local_id < len(tileset['tiles']):
-                    surf = tileset['tiles'][local_id]
-                    self._gid_cache[gid] = surf
-                    return surf
-
-        self._gid_cache[gid] = None
-        return None
-
-    def _ensure_scaled_cache(self):
-        if self._scaled_cache is None:
-            self._scaled_cache = LRUCache(maxsize=512)
+        lut = self._tile_lut
+        if gid < len(lut):
+            surf = lut[gid]
+            if surf is not _UNRESOLVED:
+                return surf
+        return self._resolve_tile_surface(gid)
+
+    def _resolve_tile_surface(self, gid):
+        """Cari tile untuk gid (load tileset pending jika perlu) dan isi lookup table"""
+        self._ensure_tileset_for_gid(gid)
+        surf = None
+        index = bisect.bisect_right(self._tileset_firstgids, gid) - 1
+        if index >= 0:
+            tileset = self.tilesets[index]
+            local_id = gid - tileset['firstgid']
+            if local_id < tileset['tile_count']:
+                surf = tileset['tiles'][local_id]
+                if surf is None:
+                    surf = self._slice_tile(tileset, local_id)
+        if gid < len(self._tile_lut):
+            self._tile_lut[gid] = surf
+        return surf
+
+    def _get_zoom_tile_lut(self, zoom):
+        """Lookup table GID -> tile surface untuk zoom (dibuat ulang saat zoom berubah)"""
+        zoom_key = round(float(zoom), 3)
+        lut = self._zoom_tile_lut
+        if lut is None or self._zoom_tile_lut_zoom != zoom_key or len(lut) != len(self._tile_lut):
+            lut = [_UNRESOLVED] * len(self._tile_lut)
+            lut[0] = None
+            self._zoom_tile_lut = lut
+            self._zoom_tile_lut_zoom = zoom_key
+        return lut
 
     def get_tile_surface_for_zoom(self, gid, zoom):
-        """Return tile surface scaled for current zoom, with LRU caching."""
-        base = self.get_tile_surface(gid)
-        if base is None:
-            return None
-
+        """Return tile surface scaled for zoom (via lookup table zoom aktif)."""
         if abs(zoom - 1.0) < 1e-6:
-            return base
+            return self.get_tile_surface(gid)
 
-        self._ensure_scaled_cache()
-        key = (gid, round(float(zoom), 3))
-        cached = self._scaled_cache.get(key)
-        if cached is not None:
-            return cached
+        lut = self._get_zoom_tile_lut(zoom)
+        if gid < len(lut):
+            scaled = lut[gid]
+            if scaled is not _UNRESOLVED:
+                return scaled
 
-        # Scale and cache
-        t0 = time.perf_counter()
-        try:
-            w = max(1, int(base.get_width() * zoom))
-            h = max(1, int(base.get_height() * zoom))
-            scaled = pygame.transform.smoothscale(base, (w, h))
-        except Exception:
-            scaled = base
-        t1 = time.perf_counter()
-        self._timings['tile_scale_time'] += (t1 - t0)
-        self._scaled_cache.set(key, scaled)
+        base = self.get_tile_surface(gid)
+        if base is None:
+            scaled = None
+        else:
+            entry = self.atlas.lookup_scaled(gid, zoom) if self.atlas is not None else None
+            t0 = time.perf_counter()
+            if entry is not None:
+                scaled = entry[0].subsurface(entry[1])
+            else:
+                try:
+                    w = max(1, int(base.get_width() * zoom))
+                    h = max(1, int(base.get_height() * zoom))
+                    scaled = pygame.transform.smoothscale(base, (w, h))
+                except Exception:
+                    scaled = base
+            self._timings['tile_scale_time'] += time.perf_counter() - t0
+
+        # get_tile_surface bisa memperbesar tabel (tileset on-demand)
+        lut = self._get_zoom_tile_lut(zoom)
+        if gid < len(lut):
+            lut[gid] = scaled
         return scaled
 
     def is_tile_solid(self, gid):
@@ -499,9 +1608,40 @@ class TiledMap:
         if gid == 0:
             return False
 
+        if gid not in self.tile_properties:
+            self._ensure_tileset_for_gid(gid)
         properties = self.tile_properties.get(gid, {})
         return properties.get('solid', 'false').lower() == 'true'
 
+    def get_collision_layers(self):
+        """
+        Tile layers yang membentuk collision grid.
+
+        Layer ditandai dengan custom property collidable=true di Tiled. Jika
+        tidak ada yang ditandai, layer pertama yang dipakai (seperti dulu).
+        """
+        flagged = [layer for layer in self.layers if self._layer_flag(layer, 'collidable')]
+        return flagged or self.layers[:1]
+
+    def get_solid_lut(self):
+        """
+        Lookup table GID -> 1 (solid) / 0 sebagai bytearray, untuk _solid_bytes.
+
+        Hanya GID di collision layers yang dicek is_tile_solid (tileset lain
+        tetap tidak di-load). Panjangnya = range GID tileset (_tile_lut), jadi
+        GID dengan flag flip/rotate tidak memperbesar table (lihat _solid_bytes).
+        """
+        if self._solid_lut is None:
+            solid = [gid for gid in self._collect_used_gids(self.get_collision_layers())
+                     if self.is_tile_solid(gid)]
+            # is_tile_solid bisa load tileset pending (_tile_lut ikut bertambah)
+            lut = bytearray(len(self._tile_lut))
+            for gid in solid:
+                if gid < len(lut):
+                    lut[gid] = 1
+            self._solid_lut = lut
+        return self._solid_lut
+
     def get_collision_rects(self):
         """Return collision shapes from object layer 'Collision'.
 
@@ -592,6 +1732,43 @@ class TiledMap:
 
         return spawns
 
+    def get_transitions(self):
+        """
+        Get transition ke map lain: object (di object layer manapun) dengan
+        property target_map (path .tmx relatif terhadap file map ini) dan
+        opsional target_spawn (nama spawn point di map tujuan).
+
+        Returns:
+            List of {'name', 'rect', 'target_map', 'target_spawn'}
+        """
+        if self._transitions_source is self.objects:
+            return self._transitions
+
+        transitions = []
+        for objects in self.objects.values():
+            for obj in objects:
+                target = obj['properties'].get('target_map')
+                if not target:
+                    continue
+                transitions.append({
+                    'name': obj['name'],
+                    'rect': pygame.Rect(int(obj['x']), int(obj['y']),
+                                        max(1, int(obj['width'])), max(1, int(obj['height']))),
+                    'target_map': os.path.normpath(os.path.join(self.base_path, target)),
+                    'target_spawn': obj['properties'].get('target_spawn')
+                })
+        # Cache sampai objects diganti (misal hot reload)
+        self._transitions = transitions
+        self._transitions_source = self.objects
+        return transitions
+
+    def get_transition_at(self, rect):
+        """Return transition yang overlap dengan rect (world pixels), atau None"""
+        for transition in self.get_transitions():
+            if transition['rect'].colliderect(rect):
+                return transition
+        return None
+
     def get_collision_polygons(self):
         """
         Get collision objects dengan polygon data lengkap (untuk pixel-perfect collision)
@@ -636,20 +1813,49 @@ class TiledMap:
         if self._last_zoom is None:
             self._last_zoom = current_zoom
         if abs(self._last_zoom - current_zoom) > 1e-6:
-            # Clear scaled caches to avoid mismatched sizes and memory growth
-            if self._scaled_cache is not None:
-                self._scaled_cache.clear()
+            # Clear scaled caches to avoid mismatched sizes and memory growth.
+            # Zoom pyramid tetap disimpan; job untuk zoom lama dibatalkan.
+            self._get_zoom_tile_lut(current_zoom)
+            self._scaled_chunk_surfaces.clear()
+            self._provisional_chunk_surfaces.clear()
+            self._debug_overlays.clear()
+            self._lod_surfaces.remove_if(lambda key: key[4] is not None)
+            self._lod_provisional.clear()
+            self._cancel_stale_prescale_jobs(current_zoom)
+            if self.atlas is not None:
+                self.atlas.clear_scaled(keep_zooms=ZOOM_LEVELS)
             self._last_zoom = current_zoom
+            self._zoom_settle_frames = 0
+        else:
+            self._zoom_settle_frames += 1
+            if self._zoom_settle_frames == ZOOM_SETTLE_FRAMES and (
+                    self._provisional_chunk_surfaces or self._lod_provisional):
+                # Gambar ulang supaya chunk provisional minta versi smoothscale
+                self.invalidate_back_buffer()
+        self._sync_source_visibility()
+        self._collect_prescaled()
+        if self.streaming:
+            zoom = max(1e-6, current_zoom)
+            view_w = screen.get_width() / zoom
+            view_h = screen.get_height() / zoom
+            if zoom < LOD_ZOOM:
+                # Mode LOD membaca tile data langsung dari cache; yang resident
+                # cukup area tengah (sekitar player) seukuran view di LOD_ZOOM
+                center_x = camera.x + view_w / 2
+                center_y = camera.y + view_h / 2
+                view_w = screen.get_width() / LOD_ZOOM
+                view_h = screen.get_height() / LOD_ZOOM
+                self.update_streaming(center_x - view_w / 2, center_y - view_h / 2,
+                                      center_x + view_w / 2, center_y + view_h / 2)
+            else:
+                self.update_streaming(camera.x, camera.y, camera.x + view_w, camera.y + view_h)
+        self._update_animations()
 
         t0 = time.perf_counter()
-        for layer in self.layers:
-            if not layer['visible']:
-                continue
-
-            if layer.get('is_chunked', False):
-                self.draw_chunked_layer(screen, layer)
-            else:
-                self.draw_layer(screen, layer)
+        if self.scroll_reuse and all(layer.get('is_chunked', False) for layer in self.render_layers):
+            self._draw_back_buffer(screen)
+        else:
+            self._draw_layers(screen, self.render_layers)
         t1 = time.perf_counter()
         self._timings['draw_total'] += (t1 - t0)
         self._timings['draw_count'] += 1
@@ -657,19 +1863,119 @@ class TiledMap:
         if self._frame_count % 60 == 0:
             avg = self._timings['draw_total'] / max(1, self._timings['draw_count'])
             scale_time = self._timings.get('tile_scale_time', 0.0)
-            print(f"[PROFILE] draw avg {avg*1000:.2f}ms/frame, tile_scale {scale_time*1000:.2f}ms (last 60 frames)")
+            print(f"[PROFILE] draw avg {avg*1000:.2f}ms/frame, tile_scale {scale_time*1000:.2f}ms (last 60 frames), "
+                  f"cache {global_budget.used_bytes / MB:.1f}/{global_budget.limit_bytes / MB:.0f}MB")
             # reset accumulators
             self._timings = {'draw_total': 0.0, 'draw_count': 0, 'tile_scale_time': 0.0}
 
-    def draw_layer(self, screen, layer):
-        """Render single standard layer (only iterate visible tiles)."""
-        if not layer.get('tiles'):
-            return
+    def invalidate_back_buffer(self, rect=None):
+        """Tandai back-buffer perlu digambar ulang.
 
-        layer_width = layer.get('width') or (len(layer['tiles'][0]) if layer['tiles'] else 0)
-        layer_height = layer.get('height') or len(layer['tiles'])
-
-        zoom = getattr(camera, 'zoom', 1.0)
+        Args:
+            rect: pygame.Rect dalam koordinat world pixel (zoom 1.0).
+                Jika None, seluruh back-buffer digambar ulang.
+        """
+        if rect is None:
+            self._back_buffer_dirty = True
+            return
+        overhang_w, overhang_h = self.get_tile_overhang()
+        if overhang_w or overhang_h:
+            # Tile besar dari cell di rect ikut menutup area kanan/bawahnya
+            rect = pygame.Rect(rect.x, rect.y, rect.width + overhang_w, rect.height + overhang_h)
+        zoom = getattr(camera, 'zoom', 1.0)
+        left = math.floor(rect.left * zoom)
+        top = math.floor(rect.top * zoom)
+        self._back_buffer_dirty_rects.append(pygame.Rect(
+            left, top,
+            math.floor(rect.right * zoom) - left + 1,
+            math.floor(rect.bottom * zoom) - top + 1
+        ))
+
+    def _draw_back_buffer(self, screen):
+        """Render map lewat back-buffer yang di-scroll sesuai gerakan kamera.
+
+        Posisi chunk = floor(world * zoom) - floor(camera * zoom), jadi
+        pergeseran kamera selalu berupa delta pixel bulat dan isi buffer lama
+        tetap valid setelah Surface.scroll. Buffer digambar ulang penuh saat
+        zoom, ukuran layar, atau visibility layer berubah.
+        """
+        zoom = getattr(camera, 'zoom', 1.0)
+        width, height = screen.get_size()
+        origin = (math.floor(camera.x * zoom), math.floor(camera.y * zoom))
+        state = (
+            (width, height),
+            round(float(zoom), 3),
+            tuple(layer['visible'] for layer in self.render_layers)
+        )
+
+        buffer = self._back_buffer
+        if buffer is None or buffer.get_size() != (width, height):
+            if self.background_color is None:
+                buffer = pygame.Surface((width, height), pygame.SRCALPHA)
+            else:
+                buffer = pygame.Surface((width, height), 0, screen)
+            self._back_buffer = buffer
+            self._back_buffer_dirty = True
+
+        dx = self._back_buffer_origin[0] - origin[0]
+        dy = self._back_buffer_origin[1] - origin[1]
+        if (self._back_buffer_dirty or state != self._back_buffer_state
+                or abs(dx) >= width or abs(dy) >= height):
+            self._redraw_back_buffer_area(buffer, buffer.get_rect())
+        else:
+            if dx or dy:
+                buffer.scroll(dx, dy)
+                # Strip tepi yang baru terlihat
+                if dx > 0:
+                    self._redraw_back_buffer_area(buffer, pygame.Rect(0, 0, dx, height))
+                elif dx < 0:
+                    self._redraw_back_buffer_area(buffer, pygame.Rect(width + dx, 0, -dx, height))
+                if dy > 0:
+                    self._redraw_back_buffer_area(buffer, pygame.Rect(0, 0, width, dy))
+                elif dy < 0:
+                    self._redraw_back_buffer_area(buffer, pygame.Rect(0, height + dy, width, -dy))
+            for rect in self._back_buffer_dirty_rects:
+                area = rect.move(-origin[0], -origin[1]).clip(buffer.get_rect())
+                if area.width and area.height:
+                    self._redraw_back_buffer_area(buffer, area)
+
+        self._back_buffer_state = state
+        self._back_buffer_origin = origin
+        self._back_buffer_dirty = False
+        self._back_buffer_dirty_rects = []
+        screen.blit(buffer, (0, 0))
+
+    def _redraw_back_buffer_area(self, buffer, area):
+        buffer.set_clip(area)
+        buffer.fill(self.background_color or (0, 0, 0, 0), area)
+        for layer in self.render_layers:
+            if layer['visible']:
+                self.draw_chunked_layer(buffer, layer, area)
+        buffer.set_clip(None)
+
+    def draw_foreground(self, screen):
+        """Render layers yang ditandai above_entities (panggil setelah NPC/player)"""
+        self._draw_layers(screen, self.foreground_layers)
+
+    def _draw_layers(self, screen, layers):
+        for layer in layers:
+            if not layer['visible']:
+                continue
+
+            if layer.get('is_chunked', False):
+                self.draw_chunked_layer(screen, layer)
+            else:
+                self.draw_layer(screen, layer)
+
+    def draw_layer(self, screen, layer):
+        """Render single standard layer (only iterate visible tiles)."""
+        if not layer.get('tiles'):
+            return
+
+        layer_width = layer.get('width') or (len(layer['tiles'][0]) if layer['tiles'] else 0)
+        layer_height = layer.get('height') or len(layer['tiles'])
+
+        zoom = getattr(camera, 'zoom', 1.0)
         view_left = camera.x
         view_top = camera.y
         view_right = camera.x + screen.get_width() / max(1e-6, zoom)
@@ -683,188 +1989,1476 @@ class TiledMap:
         if right < left or bottom < top:
             return
 
+        # Satu index lookup table per tile, lalu satu screen.blits call
+        lut = self._tile_lut if abs(zoom - 1.0) < 1e-6 else self._get_zoom_tile_lut(zoom)
+        if self._animation_frames:
+            lut = self._get_animated_lut(lut, zoom)
+        lut_size = len(lut)
+        blit_sequence = []
         for row_idx in range(top, bottom + 1):
             row = layer['tiles'][row_idx]
+            y = int((row_idx * self.tile_height - camera.y) * zoom)
             for col_idx in range(left, right + 1):
                 gid = row[col_idx]
-                if gid == 0:
-                    continue
-
-                tile_surface = self.get_tile_surface_for_zoom(gid, zoom)
-                if not tile_surface:
+                tile_surface = lut[gid] if gid < lut_size else _UNRESOLVED
+                if tile_surface is None:
                     continue
+                if tile_surface is _UNRESOLVED:
+                    tile_surface = self.get_tile_surface_for_zoom(gid, zoom)
+                    if gid < lut_size:
+                        lut[gid] = tile_surface
+                    if tile_surface is None:
+                        continue
 
                 x = int((col_idx * self.tile_width - camera.x) * zoom)
-                y = int((row_idx * self.tile_height - camera.y) * zoom)
-                screen.blit(tile_surface, (x, y))
+                blit_sequence.append((tile_surface, (x, y)))
+
+        screen.blits(blit_sequence, doreturn=False)
+
+    def _iter_chunk_tiles(self, chunk):
+        """Yield (col, row, gid) untuk semua tile chunk dalam urutan gambar.
+
+        Untuk chunk dari flattened layer, tile di bawah tile opaque di-skip.
+        """
+        if 'source_chunks' not in chunk:
+            for row_idx, row in enumerate(chunk['tiles']):
+                for col_idx, gid in enumerate(row):
+                    if gid != 0:
+                        yield col_idx, row_idx, gid
+            return
 
-    def draw_chunked_layer(self, screen, layer):
-        """Render chunked layer (infinite map)"""
+        sources = [source['tiles'] for source in self._drawn_sources(chunk)]
+        yield from _iter_stacked_tiles(sources, chunk['width'], chunk['height'], self.is_tile_opaque)
+
+    def get_tile_overhang(self):
+        """(w, h) pixel tile terbesar yang melewati ukuran cell map.
+
+        Tile seperti itu digambar dari pojok kiri atas cell dan menutup cell
+        di kanan/bawahnya (juga di chunk sebelah).
+        """
+        if self._tile_overhang is None:
+            self._tile_overhang = (
+                max([tileset['tile_width'] - self.tile_width for tileset in self.tilesets] + [0]),
+                max([tileset['tile_height'] - self.tile_height for tileset in self.tilesets] + [0])
+            )
+        return self._tile_overhang
+
+    def _has_oversized_tiles(self, chunk):
+        """True jika chunk berisi tile yang lebih besar dari cell map (hasilnya
+        disimpan di chunk dict)"""
+        oversized = chunk.get('oversized')
+        if oversized is None:
+            oversized = any(self._is_oversized_gid(gid)
+                            for source in self._stream_sources(chunk)
+                            for gid in set().union(*self._lod_source_tiles(source)))
+            chunk['oversized'] = oversized
+        return oversized
+
+    def _is_oversized_gid(self, gid):
+        """True jika tile gid lebih besar dari cell map"""
+        tile = self.get_tile_surface(gid) if gid else None
+        return tile is not None and (tile.get_width() > self.tile_width or
+                                     tile.get_height() > self.tile_height)
+
+    def _draw_chunk_tiles(self, screen, layer, chunk, zoom, offset_x, offset_y):
+        """Gambar chunk per tile tanpa bake, source layer satu per satu (chunk
+        berisi tile lebih besar dari cell, yang terpotong jika di-bake)"""
+        key = (layer['index'], chunk['x'], chunk['y'])
+        sources = self._drawn_sources(chunk)
+        if (self._animated_gids and key not in self._animated_chunks
+                and all(source['tiles'] is not None for source in sources)):
+            # Supaya frame baru menandai area tile di back-buffer
+            cells = self._animated_cells(chunk)
+            if cells:
+                self._animated_chunks[key] = (chunk, cells)
+
+        tw, th = self.tile_width, self.tile_height
+        frames = self._animation_frames
+        blit_sequence = []
+        for source in sources:
+            for row_idx, row in enumerate(self._lod_source_tiles(source)):
+                y = math.floor((chunk['y'] + row_idx) * th * zoom) - offset_y
+                for col_idx, gid in enumerate(row):
+                    if gid == 0:
+                        continue
+                    tile_surface = self.get_tile_surface_for_zoom(frames.get(gid, gid), zoom)
+                    if tile_surface is not None:
+                        x = math.floor((chunk['x'] + col_idx) * tw * zoom) - offset_x
+                        blit_sequence.append((tile_surface, (x, y)))
+        screen.blits(blit_sequence, doreturn=False)
+
+    def _bake_chunk_surface(self, chunk):
+        """Composite semua tile dalam chunk ke satu surface (zoom 1.0).
+
+        Returns None jika chunk tidak punya tile yang bisa digambar.
+        """
+        blit_sequence = []
+        frames = self._animation_frames
+        for col_idx, row_idx, gid in self._iter_chunk_tiles(chunk):
+            if gid in frames:
+                gid = frames[gid]
+            dest = (col_idx * self.tile_width, row_idx * self.tile_height)
+            entry = self.atlas.lookup(gid)
+            if entry is not None:
+                blit_sequence.append((entry[0], dest, entry[1]))
+                continue
+            tile_surface = self.get_tile_surface(gid)
+            if tile_surface:
+                blit_sequence.append((tile_surface, dest))
+
+        if not blit_sequence:
+            return None
+
+        surface = pygame.Surface(
+            (chunk['width'] * self.tile_width, chunk['height'] * self.tile_height),
+            pygame.SRCALPHA
+        )
+        surface.blits(blit_sequence, doreturn=False)
+        return surface
+
+    def get_chunk_surface(self, layer, chunk):
+        """Return baked surface untuk chunk (dibuat saat pertama kali terlihat)."""
+        key = (layer['index'], chunk['x'], chunk['y'])
+        cached = self._chunk_surfaces.get(key)
+        if cached is None and self.streaming:
+            # Chunk terlihat tapi belum resident: load sekarang juga
+            self._ensure_stream_unit(key)
+            cached = self._chunk_surfaces.get(key)
+        if cached is None:
+            # False menandai chunk kosong supaya tidak di-bake ulang
+            cached = self._bake_chunk_surface(chunk) or False
+            self._chunk_surfaces.set(key, cached)
+            if cached and self._animated_gids:
+                cells = self._animated_cells(chunk)
+                if cells:
+                    self._animated_chunks[key] = (chunk, cells)
+        return cached or None
+
+    def _animated_cells(self, chunk):
+        """Cell chunk yang berisi tile animasi: (col, row) -> set of gid"""
+        animated = self._animated_gids
+        cells = {}
+        for source in self._drawn_sources(chunk):
+            for row_idx, row in enumerate(source['tiles']):
+                for col_idx, gid in enumerate(row):
+                    if gid in animated:
+                        cells.setdefault((col_idx, row_idx), set()).add(gid)
+        return cells
+
+    def _update_animations(self):
+        """Resolve frame aktif semua tile animasi (sekali per tick
+        animation_clock) dan perbarui hanya cell chunk yang frame-nya berganti.
+
+        Tile statis tidak disentuh: chunk tanpa tile animasi tetap memakai
+        surface baked/scaled yang sama.
+        """
+        if not self.tile_animations or self._animation_tick == animation_clock.ticks:
+            return
+        self._animation_tick = animation_clock.ticks
+        changed = set()
+        for gid, animation in self.tile_animations.items():
+            frame_gid = _animation_frame(animation, animation_clock.time_ms)
+            if self._animation_frames.get(gid) != frame_gid:
+                self._animation_frames[gid] = frame_gid
+                changed.add(gid)
+        if not changed:
+            return
+
+        self._animated_lut = None
+        for key, (chunk, cells) in self._animated_chunks.items():
+            dirty = [cell for cell, gids in cells.items() if not gids.isdisjoint(changed)]
+            if dirty:
+                self._patch_animated_chunk(key, chunk, dirty)
+        for key, (origin, cells) in self._lod_animated.items():
+            dirty = {cell: gids for cell, gids in cells.items() if not changed.isdisjoint(gids)}
+            if dirty:
+                self._patch_animated_lod(key, origin, dirty)
+
+    def _animated_cell_composites(self, chunk, cells):
+        """Composite tumpukan tile (frame aktif) per cell pada zoom 1.0"""
+        sources = [source['tiles'] for source in self._drawn_sources(chunk)]
+        if any(tiles is None for tiles in sources):
+            # Unit streaming sudah dilepas
+            return {}
+        frames = self._animation_frames
+        composites = {}
+        for col_idx, row_idx in cells:
+            cell = pygame.Surface((self.tile_width, self.tile_height), pygame.SRCALPHA)
+            for tiles in sources:
+                gid = tiles[row_idx][col_idx]
+                if gid == 0:
+                    continue
+                tile_surface = self.get_tile_surface(frames.get(gid, gid))
+                if tile_surface is not None:
+                    cell.blit(tile_surface, (0, 0))
+            composites[(col_idx, row_idx)] = cell
+        return composites
+
+    def _patch_animated_surface(self, surface, chunk, composites, zoom):
+        """Gambar ulang cell animasi di surface chunk (baked atau scaled)"""
+        tw, th = self.tile_width, self.tile_height
+        chunk_px_x = chunk['x'] * tw
+        chunk_px_y = chunk['y'] * th
+        origin_x = math.floor(chunk_px_x * zoom)
+        origin_y = math.floor(chunk_px_y * zoom)
+        for (col_idx, row_idx), cell in composites.items():
+            left = math.floor((chunk_px_x + col_idx * tw) * zoom) - origin_x
+            top = math.floor((chunk_px_y + row_idx * th) * zoom) - origin_y
+            right = math.floor((chunk_px_x + (col_idx + 1) * tw) * zoom) - origin_x
+            bottom = math.floor((chunk_px_y + (row_idx + 1) * th) * zoom) - origin_y
+            if right <= left or bottom <= top:
+                continue
+            if (right - left, bottom - top) != cell.get_size():
+                cell = pygame.transform.smoothscale(cell, (right - left, bottom - top))
+            surface.fill((0, 0, 0, 0), (left, top, right - left, bottom - top))
+            surface.blit(cell, (left, top))
+
+    def _patch_animated_chunk(self, key, chunk, cells):
+        """Perbarui cell animasi di semua surface chunk yang ter-cache"""
+        composites = self._animated_cell_composites(chunk, cells)
+        if not composites:
+            return
+        targets = [(self._chunk_surfaces.peek(key), 1.0)]
+        for level in ZOOM_LEVELS:
+            if level != 1.0:
+                targets.append((self._zoom_pyramid.peek(key + (level,)), level))
         zoom = getattr(camera, 'zoom', 1.0)
-        view_left = camera.x
-        view_top = camera.y
-        view_right = camera.x + screen.get_width() / max(1e-6, zoom)
-        view_bottom = camera.y + screen.get_height() / max(1e-6, zoom)
+        zoom_key = round(float(zoom), 3)
+        if zoom_key not in ZOOM_LEVELS:
+            targets.append((self._scaled_chunk_surfaces.peek(key + (zoom_key,)), zoom))
+        targets.append((self._provisional_chunk_surfaces.get(key + (zoom_key,)), zoom))
+        for surface, surface_zoom in targets:
+            if surface:
+                self._patch_animated_surface(surface, chunk, composites, surface_zoom)
+
+        tw, th = self.tile_width, self.tile_height
+        for col_idx, row_idx in composites:
+            self.invalidate_back_buffer(pygame.Rect(
+                (chunk['x'] + col_idx) * tw, (chunk['y'] + row_idx) * th, tw, th
+            ))
+
+    def _patch_animated_lod(self, key, origin, cells):
+        """Perbarui cell animasi di super-tile LOD: digambar ulang seperti
+        _bake_lod_surface, lalu di-scale ke versi zoom aktif"""
+        zoom = getattr(camera, 'zoom', 1.0)
+        zoom_key = key[:4] + (round(float(zoom), 3),)
+        base = self._lod_surfaces.peek(key)
+        if not base:
+            # Super-tile sudah dilepas: versi zoom ikut dibuang, di-bake ulang saat terlihat
+            self._lod_surfaces.pop(zoom_key)
+            self._lod_provisional.pop(zoom_key, None)
+            return
 
-        for chunk in layer['chunks']:
-            chunk_px_x = chunk['x'] * self.tile_width
-            chunk_px_y = chunk['y'] * self.tile_height
-            chunk_px_w = chunk['width'] * self.tile_width
-            chunk_px_h = chunk['height'] * self.tile_height
+        level = key[3]
+        tw, th = self.tile_width, self.tile_height
+        origin_x = math.floor(origin['x'] * tw * level)
+        origin_y = math.floor(origin['y'] * th * level)
+        frames = self._animation_frames
+        composites = {}
+        for (col_idx, row_idx), gids in cells.items():
+            left = math.floor((origin['x'] + col_idx) * tw * level) - origin_x
+            top = math.floor((origin['y'] + row_idx) * th * level) - origin_y
+            area = pygame.Rect(left, top,
+                               math.floor((origin['x'] + col_idx + 1) * tw * level) - origin_x - left,
+                               math.floor((origin['y'] + row_idx + 1) * th * level) - origin_y - top)
+            if not (area.width and area.height):
+                continue
+            base.fill((0, 0, 0, 0), area)
+            for gid in gids:
+                tile = self._get_lod_tile(frames.get(gid, gid), level)
+                if tile is not None:
+                    base.blit(tile, area.topleft, (0, 0, area.width, area.height))
+            composites[(col_idx, row_idx)] = base.subsurface(area)
+
+        if abs(zoom - level) > 1e-6:
+            for surface in (self._lod_surfaces.peek(zoom_key), self._lod_provisional.get(zoom_key)):
+                if surface:
+                    self._patch_animated_surface(surface, origin, composites, zoom)
+
+        for col_idx, row_idx in composites:
+            self.invalidate_back_buffer(pygame.Rect(
+                (origin['x'] + col_idx) * tw, (origin['y'] + row_idx) * th, tw, th
+            ))
+
+    def _get_animated_lut(self, lut, zoom):
+        """Salinan lookup table dengan slot tile animasi menunjuk ke frame aktif
+        (untuk layer yang digambar per tile, lihat draw_layer)"""
+        zoom_key = round(float(zoom), 3)
+        cached = self._animated_lut
+        if cached is not None and cached[0] == zoom_key and len(cached[1]) == len(lut):
+            return cached[1]
+        animated = list(lut)
+        for gid, frame_gid in self._animation_frames.items():
+            if gid < len(animated):
+                animated[gid] = self.get_tile_surface_for_zoom(frame_gid, zoom)
+        self._animated_lut = (zoom_key, animated)
+        return animated
+
+    def _chunk_size_for_zoom(self, chunk, base, zoom):
+        """Ukuran chunk pada zoom, dihitung dari tepi chunk yang sudah dibulatkan
+        supaya chunk bersebelahan tidak menyisakan celah"""
+        chunk_px_x = chunk['x'] * self.tile_width
+        chunk_px_y = chunk['y'] * self.tile_height
+        w = max(1, math.floor((chunk_px_x + base.get_width()) * zoom) - math.floor(chunk_px_x * zoom))
+        h = max(1, math.floor((chunk_px_y + base.get_height()) * zoom) - math.floor(chunk_px_y * zoom))
+        return w, h
+
+    def get_chunk_surface_for_zoom(self, layer, chunk, zoom):
+        """Return baked chunk surface yang sudah di-scale untuk zoom.
+
+        Level ZOOM_LEVELS diambil dari zoom pyramid yang diisi di background.
+        Sebelum hasilnya siap (atau untuk zoom di antara level), chunk di-scale
+        cepat dari level terdekat supaya frame loop tidak pernah menunggu
+        smoothscale.
+        """
+        base = self.get_chunk_surface(layer, chunk)
+        if base is None:
+            return None
 
-            # Cull whole chunk if outside view
-            if (chunk_px_x + chunk_px_w < view_left or chunk_px_x > view_right or
-                chunk_px_y + chunk_px_h < view_top or chunk_px_y > view_bottom):
+        if abs(zoom - 1.0) < 1e-6:
+            return base
+
+        zoom_key = round(float(zoom), 3)
+        level = nearest_zoom_level(zoom)
+        key = (layer['index'], chunk['x'], chunk['y'], zoom_key)
+        is_level = abs(level - zoom) < 1e-6
+
+        if is_level:
+            cached = self._zoom_pyramid.get(key)
+        else:
+            cached = self._scaled_chunk_surfaces.get(key)
+        if cached is not None:
+            return cached
+
+        # Antri level terdekat + tetangganya, lalu zoom persis (jika bukan
+        # level) setelah zoom berhenti berubah
+        targets = self._missing_pyramid_levels(layer, chunk, level)
+        if not is_level and self._zoom_settle_frames >= ZOOM_SETTLE_FRAMES:
+            targets.append((key, zoom))
+        self._submit_prescale(chunk, base, targets)
+
+        provisional = self._provisional_chunk_surfaces.get(key)
+        if provisional is not None:
+            return provisional
+
+        source = base
+        if level != 1.0:
+            source = self._zoom_pyramid.get((layer['index'], chunk['x'], chunk['y'], level)) or base
+
+        t0 = time.perf_counter()
+        provisional = pygame.transform.scale(source, self._chunk_size_for_zoom(chunk, base, zoom))
+        self._timings['tile_scale_time'] += time.perf_counter() - t0
+        self._provisional_chunk_surfaces[key] = provisional
+        return provisional
+
+    def _missing_pyramid_levels(self, layer, chunk, level):
+        """List of (key, zoom) untuk level terdekat dan tetangganya yang belum ada"""
+        index = ZOOM_LEVELS.index(level)
+        missing = []
+        for neighbour in ZOOM_LEVELS[max(0, index - 1):index + 2]:
+            if neighbour == 1.0:
                 continue
+            key = (layer['index'], chunk['x'], chunk['y'], neighbour)
+            if self._zoom_pyramid.get(key) is None:
+                missing.append((key, neighbour))
+        return missing
+
+    def _submit_prescale(self, chunk, base, targets):
+        targets = [
+            (key, self._chunk_size_for_zoom(chunk, base, zoom))
+            for key, zoom in targets
+            if key not in self._prescale_jobs
+        ]
+        if not targets:
+            return
+        # Worker memakai salinan supaya surface asli bebas di-blit main thread
+        job = self._prescale_pool.submit(_smoothscale_many, base.copy(), targets)
+        for key, _ in targets:
+            self._prescale_jobs[key] = job
+
+    def _collect_prescaled(self):
+        """Pindahkan hasil worker yang sudah selesai ke cache (main thread)"""
+        if not self._prescale_jobs:
+            return
+        done = {job for job in self._prescale_jobs.values() if job.done()}
+        current_zoom = round(float(getattr(camera, 'zoom', 1.0)), 3)
+        for job in done:
+            if job.cancelled() or job.exception() is not None:
+                results = []
+            else:
+                results = job.result()
+            for key, scaled in results:
+                if key[3] in ZOOM_LEVELS:
+                    self._zoom_pyramid.set(key, scaled)
+                elif key[3] == current_zoom:
+                    self._scaled_chunk_surfaces.set(key, scaled)
+                else:
+                    continue
+                animated = self._animated_chunks.get(key[:3])
+                if animated is not None:
+                    # Worker men-scale salinan lama: pasang frame aktif
+                    chunk, cells = animated
+                    composites = self._animated_cell_composites(chunk, cells)
+                    self._patch_animated_surface(scaled, chunk, composites, key[3])
+                if self._provisional_chunk_surfaces.pop(key, None) is not None:
+                    # Chunk sudah tergambar versi provisional di back-buffer
+                    self._back_buffer_dirty_rects.append(pygame.Rect(
+                        math.floor(key[1] * self.tile_width * key[3]),
+                        math.floor(key[2] * self.tile_height * key[3]),
+                        scaled.get_width(), scaled.get_height()
+                    ))
+        for key in [key for key, job in self._prescale_jobs.items() if job in done]:
+            del self._prescale_jobs[key]
+
+    def _cancel_stale_prescale_jobs(self, zoom):
+        """Batalkan job yang belum jalan dan tidak relevan lagi untuk zoom baru"""
+        index = ZOOM_LEVELS.index(nearest_zoom_level(zoom))
+        wanted = set(ZOOM_LEVELS[max(0, index - 1):index + 2])
+        jobs = {}
+        for key, job in self._prescale_jobs.items():
+            jobs.setdefault(job, []).append(key)
+        for job, keys in jobs.items():
+            if all(key[3] not in wanted for key in keys) and job.cancel():
+                for key in keys:
+                    del self._prescale_jobs[key]
+
+    def close(self):
+        """Hentikan worker background (panggil saat map tidak dipakai lagi)"""
+        self._prescale_pool.shutdown(wait=False, cancel_futures=True)
+        self._prescale_jobs.clear()
+        self._stop_stream_pool()
+        if self._stream_reader is not None:
+            self._stream_reader.close()
+            self._stream_reader = None
+        # Lepas surfaces dari global budget
+        self._chunk_surfaces.clear()
+        self._scaled_chunk_surfaces.clear()
+        self._zoom_pyramid.clear()
+        self._provisional_chunk_surfaces.clear()
+        self._debug_overlays.clear()
+        self._lod_surfaces.clear()
+        self._lod_provisional.clear()
+        self._lod_animated.clear()
+
+    def _stop_stream_pool(self):
+        """Hentikan worker streaming (tunggu job yang sedang jalan sebelum
+        mmap ditutup/dilepas)"""
+        if self._stream_pool is not None:
+            self._stream_pool.shutdown(wait=True, cancel_futures=True)
+            self._stream_pool = None
+            self._stream_jobs.clear()
+
+    def _start_streaming(self):
+        """Aktifkan streaming mode: tile data chunk dilepas dan di-load ulang
+        oleh worker background sesuai posisi kamera (lihat update_streaming)"""
+        if not self.is_infinite:
+            print("⚠️  Map streaming only applies to infinite maps; loading all layers")
+            self._disable_streaming()
+            return
+        # Dihitung sebelum tile data dilepas (dipakai worker streaming)
+        self.get_solid_lut()
+        if self._stream_reader is None:
+            opened = map_cache.open_compiled_map(self.tmx_file) if self.use_cache else None
+            if opened is None:
+                print("⚠️  Map streaming needs the compiled map cache; keeping all chunks resident")
+                self._disable_streaming()
+                return
+            self._stream_reader = opened[1]
+            # Data hasil parse XML dilepas, nanti dibaca ulang dari cache
+            for layer in self.layers:
+                for chunk in layer['chunks']:
+                    chunk['data'] = None
+                    chunk['tiles'] = None
 
-            # Compute local tile range within chunk that intersects view
-            start_col = max(0, int((view_left - chunk_px_x) // self.tile_width))
-            end_col = min(chunk['width'] - 1, int((view_right - chunk_px_x) // self.tile_width))
-            start_row = max(0, int((view_top - chunk_px_y) // self.tile_height))
-            end_row = min(chunk['height'] - 1, int((view_bottom - chunk_px_y) // self.tile_height))
+        # Unit streaming = chunk render layer (satu bake per unit). Layer
+        # collision yang tidak digambar tetap di-stream tanpa bake.
+        self._stream_layers = [
+            (layer, True) for layer in self.render_layers + self.foreground_layers
+        ]
+        collision_layers = self.get_collision_layers()
+        self._collision_sources = {}
+        for layer in collision_layers:
+            if not layer['visible']:
+                self._stream_layers.append((layer, False))
+            for chunk in layer['chunks']:
+                self._collision_sources.setdefault((chunk['x'], chunk['y']), []).append(chunk)
+        self._collision_source_ids = {id(chunk) for layer in collision_layers for chunk in layer['chunks']}
+        self._stream_units = {
+            (layer['index'], chunk['x'], chunk['y']): (layer, chunk, bake)
+            for layer, bake in self._stream_layers
+            for chunk in layer['chunks']
+        }
+        self._stream_atlas = self._snapshot_atlas()
+        # Baked surfaces dibatasi budget streaming, bukan limit cache biasa
+        self._chunk_surfaces.max_bytes = max(self._chunk_surfaces.max_bytes, self.stream_memory_budget)
+        self._stream_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='map-stream')
+        print(f"  🌊 Map streaming on: margin {self.stream_margin} chunk(s), "
+              f"budget {self.stream_memory_budget // (1024 * 1024)} MB")
+
+    def _disable_streaming(self):
+        self.streaming = False
+        if self._stream_reader is not None:
+            self._stream_reader.close()
+            self._stream_reader = None
+
+    def _merge_collision_chunk(self, key):
+        """Susun ulang collision_chunks[key] dari grid solid source chunks
+        collision layers yang sedang resident (streaming mode)"""
+        sources = [source for source in self._collision_sources.get(key, ())
+                   if source.get('solid') is not None]
+        if not sources:
+            self.collision_chunks.pop(key, None)
+            return
+        self.collision_chunks[key] = {
+            'grid': _merge_solid([source['solid'] for source in sources]),
+            'width': sources[0]['width'],
+            'height': sources[0]['height']
+        }
 
-            if end_col < start_col or end_row < start_row:
+    def _snapshot_atlas(self):
+        """Salinan atlas untuk bake di worker streaming (main thread tetap
+        blit dari atlas asli), plus lookup opaque yang sudah dihitung"""
+        entries = dict(self.atlas.entries)
+        pages = [page.copy() for page in self.atlas.pages]
+        opaque = {gid: self.is_tile_opaque(gid) for gid in entries}
+        return entries, pages, opaque
+
+    def _stream_sources(self, chunk):
+        return chunk['source_chunks'] if 'source_chunks' in chunk else [chunk]
+
+    def _drawn_sources(self, chunk):
+        """Source chunks yang digambar (tanpa source layer yang disembunyikan)"""
+        if 'source_chunks' not in chunk:
+            return [chunk]
+        return [source for source, layer in zip(chunk['source_chunks'], chunk['source_layers'])
+                if layer['visible']]
+
+    def _stream_gap(self, chunk, view):
+        """Jarak chunk dari view (world pixels), dalam satuan ukuran chunk"""
+        chunk_px_w = chunk['width'] * self.tile_width
+        chunk_px_h = chunk['height'] * self.tile_height
+        left = chunk['x'] * self.tile_width
+        top = chunk['y'] * self.tile_height
+        gap_x = max(view[0] - (left + chunk_px_w), left - view[2], 0) / chunk_px_w
+        gap_y = max(view[1] - (top + chunk_px_h), top - view[3], 0) / chunk_px_h
+        return max(gap_x, gap_y)
+
+    def _load_stream_unit(self, chunk, bake, atlas_snapshot):
+        """Baca tile data, buat collision grid, dan bake surface satu unit.
+
+        Jalan di worker thread: hanya membaca mmap dan snapshot atlas, hasilnya
+        dipasang ke chunk dicts oleh _apply_stream_unit di main thread.
+        """
+        width = chunk['width']
+        height = chunk['height']
+        loaded = []
+        collision = []
+        for source in self._stream_sources(chunk):
+            data = self._stream_reader.read(source['array_index'])
+            tiles = self._split_rows(data, source['width'], source['height'])
+            loaded.append((source, data, tiles))
+            if id(source) in self._collision_source_ids:
+                collision.append((source, _solid_bytes(data, self._solid_lut)))
+
+        surface = _UNRESOLVED
+        drawn = {id(source) for source in self._drawn_sources(chunk)}
+        if bake:
+            entries, pages, opaque = atlas_snapshot
+            animated = self._animated_gids
+            blit_sequence = []
+            stacked = _iter_stacked_tiles([tiles for source, _, tiles in loaded if id(source) in drawn],
+                                          width, height, opaque.get)
+            for col_idx, row_idx, gid in stacked:
+                entry = entries.get(gid)
+                if entry is None or gid in animated:
+                    # Tile di luar atlas atau tile animasi: bake di main thread
+                    # saat terlihat
+                    blit_sequence = None
+                    break
+                dest = (col_idx * self.tile_width, row_idx * self.tile_height)
+                blit_sequence.append((pages[entry[0]], dest, entry[1]))
+            if blit_sequence == []:
+                surface = None
+            elif blit_sequence:
+                surface = pygame.Surface((width * self.tile_width, height * self.tile_height),
+                                         pygame.SRCALPHA)
+                surface.blits(blit_sequence, doreturn=False)
+
+        return {'sources': loaded, 'collision': collision, 'surface': surface,
+                'atlas': atlas_snapshot, 'drawn': drawn}
+
+    def _apply_stream_unit(self, key, layer, chunk, result, bake):
+        """Pasang hasil _load_stream_unit (main thread)"""
+        nbytes = 0
+        for source, data, tiles in result['sources']:
+            source['data'] = data
+            source['tiles'] = tiles
+            nbytes += len(data) * data.itemsize
+        collision_keys = set()
+        for source, solid in result['collision']:
+            source['solid'] = solid
+            nbytes += len(solid)
+            collision_keys.add((source['x'], source['y']))
+        for collision_key in collision_keys:
+            self._merge_collision_chunk(collision_key)
+        self._drop_debug_cells('solid', collision_keys)
+        if bake:
+            # Perkiraan: baked surface RGBA di zoom 1.0
+            nbytes += chunk['width'] * self.tile_width * chunk['height'] * self.tile_height * 4
+            surface = result['surface']
+            # Snapshot lama (image di-convert ulang) atau source layer di-show/hide
+            # selama job jalan: bake ulang di main thread
+            if (surface is not _UNRESOLVED and result['atlas'] is self._stream_atlas and
+                    result['drawn'] == {id(source) for source in self._drawn_sources(chunk)}):
+                self._chunk_surfaces.set(key, surface or False)
+        self._resident_units[key] = (layer, chunk, nbytes)
+        self._resident_bytes += nbytes
+
+    def _evict_stream_unit(self, key):
+        """Lepas tile data, collision grid, dan semua surface satu unit"""
+        layer, chunk, nbytes = self._resident_units.pop(key)
+        self._resident_bytes -= nbytes
+        for source in self._stream_sources(chunk):
+            source['data'] = None
+            source['tiles'] = None
+            if id(source) in self._collision_source_ids:
+                source['solid'] = None
+                self._merge_collision_chunk((source['x'], source['y']))
+                self._drop_debug_cells('solid', [(source['x'], source['y'])])
+        self._chunk_surfaces.pop(key)
+        self._animated_chunks.pop(key, None)
+        zoom_key = round(float(getattr(camera, 'zoom', 1.0)), 3)
+        self._scaled_chunk_surfaces.pop(key + (zoom_key,))
+        self._provisional_chunk_surfaces.pop(key + (zoom_key,), None)
+        for level in ZOOM_LEVELS:
+            self._zoom_pyramid.pop(key + (level,))
+
+    def _ensure_stream_unit(self, key):
+        """Pastikan unit resident sekarang juga (chunk sudah terlihat di layar)"""
+        if key in self._resident_units:
+            return
+        unit = self._stream_units.get(key)
+        if unit is None:
+            return
+        layer, chunk, bake = unit
+        job = self._stream_jobs.pop(key, None)
+        if job is not None and not job.cancel():
+            result = job.result()
+        else:
+            result = self._load_stream_unit(chunk, bake, self._stream_atlas)
+        self._apply_stream_unit(key, layer, chunk, result, bake)
+
+    def _collect_streamed(self):
+        """Pasang unit yang sudah selesai di-load worker"""
+        done = [key for key, job in self._stream_jobs.items() if job.done()]
+        for key in done:
+            job = self._stream_jobs.pop(key)
+            if job.cancelled() or key in self._resident_units:
+                continue
+            if job.exception() is not None:
+                print(f"⚠️  Failed to stream chunk {key}: {job.exception()}")
                 continue
+            layer, chunk, bake = self._stream_units[key]
+            self._apply_stream_unit(key, layer, chunk, job.result(), bake)
 
-            for row_idx in range(start_row, end_row + 1):
-                row = chunk['tiles'][row_idx]
-                for col_idx in range(start_col, end_col + 1):
-                    gid = row[col_idx]
-                    if gid == 0:
-                        continue
+    def update_streaming(self, view_left, view_top, view_right, view_bottom):
+        """Load unit di sekitar view di background dan lepas unit yang jauh.
 
-                    tile_surface = self.get_tile_surface_for_zoom(gid, zoom)
-                    if not tile_surface:
+        Dipanggil draw() setiap frame dengan view dalam world pixels.
+        """
+        if not self.streaming:
+            return
+        self._collect_streamed()
+        view = (view_left, view_top, view_right, view_bottom)
+
+        wanted = {}
+        for layer, bake in self._stream_layers:
+            margin_x = self.stream_margin * layer.get('chunk_width', FLATTEN_CHUNK_SIZE) * self.tile_width
+            margin_y = self.stream_margin * layer.get('chunk_height', FLATTEN_CHUNK_SIZE) * self.tile_height
+            for chunk in self.get_visible_chunks(layer, view_left - margin_x, view_top - margin_y,
+                                                 view_right + margin_x, view_bottom + margin_y):
+                wanted[(layer['index'], chunk['x'], chunk['y'])] = (layer, chunk, bake)
+
+        # Job yang sudah keluar area tidak perlu jalan
+        for key in [key for key in self._stream_jobs if key not in wanted]:
+            if self._stream_jobs[key].cancel():
+                del self._stream_jobs[key]
+
+        # Lepas unit di luar margin + 1, lalu yang terjauh jika lewat budget
+        for key, (layer, chunk, _) in list(self._resident_units.items()):
+            if self._stream_gap(chunk, view) > self.stream_margin + 1:
+                self._evict_stream_unit(key)
+        if self._resident_bytes > self.stream_memory_budget:
+            by_distance = sorted(
+                ((self._stream_gap(chunk, view), key) for key, (_, chunk, _) in self._resident_units.items()),
+                reverse=True
+            )
+            for gap, key in by_distance:
+                if self._resident_bytes <= self.stream_memory_budget or gap <= 0:
+                    break
+                self._evict_stream_unit(key)
+
+        # Antri unit yang belum resident, terdekat duluan. Prefetch berhenti
+        # saat budget penuh; chunk yang terlihat tetap di-load saat digambar.
+        if self._resident_bytes >= self.stream_memory_budget:
+            return
+        missing = [
+            (self._stream_gap(chunk, view), key)
+            for key, (layer, chunk, bake) in wanted.items()
+            if key not in self._resident_units and key not in self._stream_jobs
+        ]
+        missing.sort()
+        for _, key in missing:
+            layer, chunk, bake = wanted[key]
+            self._stream_jobs[key] = self._stream_pool.submit(
+                self._load_stream_unit, chunk, bake, self._stream_atlas)
+
+    def poll_hot_reload(self):
+        """Cek perubahan file .tmx/.tsx/image map (panggil dari game loop).
+
+        Perubahan baru di-reload setelah file tidak berubah lagi selama satu
+        interval (Tiled menulis file bertahap).
+
+        Returns:
+            Dict changes dari hot_reload(), atau None jika tidak ada reload
+        """
+        now = time.monotonic()
+        if now - self._hot_reload_checked < HOT_RELOAD_INTERVAL:
+            return None
+        self._hot_reload_checked = now
+
+        current = map_cache.build_signature(self._dependencies)
+        for path, sig in current.items():
+            # File tileset on-demand mulai diawasi sejak di-load
+            self._source_signature.setdefault(path, sig)
+        changed = {path for path, sig in current.items() if self._source_signature[path] != sig}
+        if not changed:
+            self._pending_signature = None
+            return None
+        if current != self._pending_signature:
+            self._pending_signature = current
+            return None
+
+        self._pending_signature = None
+        self._source_signature.update(current)
+        return self.hot_reload(changed)
+
+    def hot_reload(self, changed_paths=()):
+        """Parse ulang map dan ganti hanya bagian yang berubah.
+
+        Object TiledMap tetap sama (referensi game/player tetap valid). Jika
+        tileset, ukuran tile, atau susunan layer berubah, semua cache render
+        dibuang; jika tidak, hanya chunk yang tile-nya berubah.
+
+        Returns:
+            Dict {'full': bool, 'tile_rects': [pygame.Rect dalam tile],
+            'objects_changed': bool} untuk TiledMapCollision.apply_map_changes,
+            atau None jika map baru gagal di-parse
+        """
+        t0 = time.perf_counter()
+        for path in changed_paths:
+            if not path.endswith(('.tmx', '.tsx')):
+                image_loader.forget(path)
+
+        # Worker streaming dihentikan dan cache lama dilepas dari mmap dulu:
+        # fresh menulis ulang file cache yang sama
+        self._stop_stream_pool()
+        if self._stream_reader is not None:
+            self._stream_reader.detach()
+        try:
+            fresh = TiledMap(self.tmx_file, use_cache=self.use_cache,
+                             flatten_static_layers=self.flatten_static_layers,
+                             scroll_reuse=self.scroll_reuse,
+                             background_color=self.background_color,
+                             streaming=self.streaming, stream_margin=self.stream_margin,
+                             stream_memory_budget=self.stream_memory_budget)
+        except (ET.ParseError, OSError, ValueError, KeyError, TypeError, pygame.error) as e:
+            print(f"⚠️  Hot reload failed, keeping current map: {e}")
+            if self.streaming:
+                self._stream_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='map-stream')
+            return None
+
+        full = self._needs_full_reload(fresh, changed_paths)
+        tile_rects = [] if full else self._diff_tile_layers(fresh)
+        objects_changed = fresh.objects != self.objects
+
+        if self._stream_reader is not None:
+            self._stream_reader.close()
+        old_resident = self._resident_units
+        old_collision_ids = self._collision_source_ids
+
+        for name in _HOT_RELOAD_ATTRS:
+            setattr(self, name, getattr(fresh, name))
+        self._chunk_surfaces.max_bytes = fresh._chunk_surfaces.max_bytes
+        self._zoom_tile_lut = None
+        self._animation_frames = {}
+        self._animation_tick = None
+        self._animated_lut = None
+        self._resident_units = {}
+        self._resident_bytes = 0
+        # Worker dan mmap sekarang milik map ini
+        fresh._stream_pool = None
+        fresh._stream_reader = None
+        fresh.close()
+
+        for job in self._prescale_jobs.values():
+            job.cancel()
+        self._prescale_jobs.clear()
+        self._debug_overlays.clear()
+        self._lod_surfaces.clear()
+        self._lod_provisional.clear()
+        self._lod_animated.clear()
+        tw, th = self.tile_width, self.tile_height
+        world_rects = [pygame.Rect(r.x * tw, r.y * th, r.width * tw, r.height * th) for r in tile_rects]
+        if full:
+            self.collision_chunks.clear()
+            self._reset_render_caches()
+        else:
+            changed = self._chunk_key_matcher(world_rects)
+            if self.streaming:
+                self._carry_over_resident(old_resident, old_collision_ids, changed)
+            self._drop_chunk_surfaces(changed)
+            for rect in world_rects:
+                self.invalidate_back_buffer(rect)
+
+        elapsed = (time.perf_counter() - t0) * 1000
+        scope = "full" if full else f"{len(tile_rects)} changed area(s)"
+        print(f"🔄 Map hot reload: {scope} in {elapsed:.0f}ms")
+        return {'full': full, 'tile_rects': tile_rects, 'objects_changed': objects_changed}
+
+    def _needs_full_reload(self, fresh, changed_paths):
+        """True jika perubahan tidak bisa diterapkan per chunk"""
+        if any(not path.endswith('.tmx') for path in changed_paths):
+            return True
+        if (fresh.tile_width, fresh.tile_height, fresh.is_infinite, fresh.streaming) != \
+                (self.tile_width, self.tile_height, self.is_infinite, self.streaming):
+            return True
+
+        def firstgids(tiled_map):
+            pending = [entry['firstgid'] for entry in tiled_map._pending_tilesets]
+            return sorted(tiled_map._tileset_firstgids + pending)
+        if firstgids(fresh) != firstgids(self):
+            return True
+        if any(self.tile_properties.get(gid) != props for gid, props in fresh.tile_properties.items()):
+            return True
+
+        def layout(tiled_map):
+            return [
+                (layer['name'], layer['visible'], layer['properties'], layer['is_chunked'],
+                 layer.get('width'), layer.get('height'), layer.get('chunk_width'),
+                 layer.get('chunk_height'))
+                for layer in tiled_map.layers
+            ]
+        return layout(fresh) != layout(self)
+
+    def _chunk_data(self, chunk):
+        """Tile array chunk (dibaca dari cache jika belum resident)"""
+        if chunk['data'] is not None:
+            return chunk['data']
+        return self._stream_reader.read(chunk['array_index'])
+
+    def _diff_tile_layers(self, fresh):
+        """Bandingkan tile layers dengan map baru (layout sama).
+
+        Returns:
+            List of pygame.Rect (koordinat tile) untuk chunk/blok yang berubah
+        """
+        rects = []
+        for old, new in zip(self.layers, fresh.layers):
+            if old['is_chunked']:
+                old_chunks = {(c['x'], c['y']): c for c in old['chunks']}
+                new_chunks = {(c['x'], c['y']): c for c in new['chunks']}
+                for key in old_chunks.keys() | new_chunks.keys():
+                    a = old_chunks.get(key)
+                    b = new_chunks.get(key)
+                    if (a is not None and b is not None and
+                            (a['width'], a['height']) == (b['width'], b['height']) and
+                            self._chunk_data(a) == fresh._chunk_data(b)):
                         continue
+                    for chunk in (a, b):
+                        if chunk is not None:
+                            rects.append(pygame.Rect(chunk['x'], chunk['y'], chunk['width'], chunk['height']))
+                continue
 
-                    x = int((chunk_px_x + col_idx * self.tile_width - camera.x) * zoom)
-                    y = int((chunk_px_y + row_idx * self.tile_height - camera.y) * zoom)
-                    screen.blit(tile_surface, (x, y))
+            # Fixed layer: bandingkan per blok FLATTEN_CHUNK_SIZE
+            size = FLATTEN_CHUNK_SIZE
+            for y in range(0, old['height'], size):
+                old_rows = old['tiles'][y:y + size]
+                new_rows = new['tiles'][y:y + size]
+                for x in range(0, old['width'], size):
+                    if any(a[x:x + size] != b[x:x + size] for a, b in zip(old_rows, new_rows)):
+                        rects.append(pygame.Rect(x, y, min(size, old['width'] - x),
+                                                 min(size, old['height'] - y)))
+        return rects
+
+    def _chunk_key_matcher(self, world_rects):
+        """Return matches(key) untuk cache key (layer, x, y, ...) yang chunk-nya
+        menyentuh salah satu world_rects"""
+        layers = {layer['index']: layer for layer in self.render_layers + self.foreground_layers}
+
+        def matches(key):
+            layer = layers.get(key[0])
+            if layer is None:
+                return True
+            rect = pygame.Rect(key[1] * self.tile_width, key[2] * self.tile_height,
+                               layer.get('chunk_width', FLATTEN_CHUNK_SIZE) * self.tile_width,
+                               layer.get('chunk_height', FLATTEN_CHUNK_SIZE) * self.tile_height)
+            return rect.collidelist(world_rects) != -1
+        return matches
 
-    def draw_collision_debug(self, screen):
-        """Draw collision rectangles untuk debugging"""
-        shapes = self.get_collision_rects()
-        for shape in shapes:
-            if shape['type'] == 'rect':
-                rect = shape['rect']
-                debug_rect = pygame.Rect(
-                    rect.x - camera.x,
-                    rect.y - camera.y,
-                    rect.width,
-                    rect.height
-                )
-                surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-                surface.fill((255, 0, 0, 100))
-                screen.blit(surface, debug_rect.topleft)
-                pygame.draw.rect(screen, (255, 0, 0), debug_rect, 2)
-            elif shape['type'] == 'polygon':
-                points = shape['points']
-                if not points:
+    def _sync_source_visibility(self):
+        """
+        Bake ulang flattened layer yang source layer-nya di-show/hide.
+
+        Chunk surfaces, LOD super-tiles dan back-buffer flattened layer berisi
+        gabungan semua source layer, jadi perubahan visible satu source layer
+        tidak terlihat dari state render_layers saja.
+        """
+        visibility = {
+            layer['index']: tuple(source['visible'] for source in layer['sources'])
+            for layer in self.render_layers if layer.get('is_flattened')
+        }
+        changed = {index for index, state in visibility.items()
+                   if self._source_visibility.get(index, state) != state}
+        self._source_visibility = visibility
+        if not changed:
+            return
+        for job in self._prescale_jobs.values():
+            job.cancel()
+        self._prescale_jobs.clear()
+        matches = lambda key: key[0] in changed
+        self._drop_chunk_surfaces(matches)
+        self._lod_surfaces.remove_if(matches)
+        for key in [key for key in self._lod_provisional if matches(key)]:
+            del self._lod_provisional[key]
+        for key in [key for key in self._lod_animated if matches(key)]:
+            del self._lod_animated[key]
+        self.invalidate_back_buffer()
+
+    def _drop_chunk_surfaces(self, matches):
+        """Buang baked/scaled chunk surfaces yang key-nya lolos matches(key)"""
+        for cache in (self._chunk_surfaces, self._scaled_chunk_surfaces, self._zoom_pyramid):
+            cache.remove_if(matches)
+        for key in [key for key in self._provisional_chunk_surfaces if matches(key)]:
+            del self._provisional_chunk_surfaces[key]
+        for key in [key for key in self._animated_chunks if matches(key)]:
+            del self._animated_chunks[key]
+
+    def _carry_over_resident(self, old_resident, old_collision_ids, changed):
+        """Pindahkan data unit streaming yang tidak berubah ke chunk dicts baru"""
+        dropped = set()
+        for key, (_, chunk, nbytes) in old_resident.items():
+            unit = self._stream_units.get(key)
+            old_sources = self._stream_sources(chunk)
+            if unit is None or changed(key):
+                for source in old_sources:
+                    if id(source) in old_collision_ids:
+                        dropped.add((source['x'], source['y']))
+                continue
+            layer, new_chunk, _ = unit
+            for source, new_source in zip(old_sources, self._stream_sources(new_chunk)):
+                new_source['data'] = source['data']
+                new_source['tiles'] = source['tiles']
+                new_source['solid'] = source.get('solid')
+            self._resident_units[key] = (layer, new_chunk, nbytes)
+            self._resident_bytes += nbytes
+        # Collision chunk yang salah satu layer-nya berubah disusun dari
+        # layer lain yang masih resident, sisanya menyusul saat di-load ulang
+        for collision_key in dropped:
+            self._merge_collision_chunk(collision_key)
+
+    def draw_chunked_layer(self, screen, layer, area=None):
+        """Render chunked layer (infinite map), satu blit per chunk
+
+        Args:
+            area: pygame.Rect di screen; jika diberikan hanya chunk yang
+                menyentuh area ini yang digambar
+        """
+        zoom = getattr(camera, 'zoom', 1.0)
+        offset_x = math.floor(camera.x * zoom)
+        offset_y = math.floor(camera.y * zoom)
+        if area is None:
+            view_left = camera.x
+            view_top = camera.y
+            view_right = camera.x + screen.get_width() / max(1e-6, zoom)
+            view_bottom = camera.y + screen.get_height() / max(1e-6, zoom)
+        else:
+            view_left = (offset_x + area.left) / max(1e-6, zoom)
+            view_top = (offset_y + area.top) / max(1e-6, zoom)
+            view_right = (offset_x + area.right) / max(1e-6, zoom)
+            view_bottom = (offset_y + area.bottom) / max(1e-6, zoom)
+
+        if zoom < LOD_ZOOM - 1e-6 and layer.get('chunk_index') is not None:
+            self._draw_lod_layer(screen, layer, zoom, (view_left, view_top, view_right, view_bottom))
+            return
+
+        # Chunk di kiri/atas view bisa punya tile besar yang masuk ke view
+        overhang_w, overhang_h = self.get_tile_overhang()
+        for chunk in self.get_visible_chunks(layer, view_left - overhang_w, view_top - overhang_h,
+                                             view_right, view_bottom):
+            chunk_px_x = chunk['x'] * self.tile_width
+            chunk_px_y = chunk['y'] * self.tile_height
+            if overhang_w or overhang_h:
+                if self._has_oversized_tiles(chunk):
+                    if self.streaming:
+                        self._ensure_stream_unit((layer['index'], chunk['x'], chunk['y']))
+                    self._draw_chunk_tiles(screen, layer, chunk, zoom, offset_x, offset_y)
                     continue
-                # Convert to screen-space points
-                pts = [(p[0] - camera.x, p[1] - camera.y) for p in points]
+                if (chunk_px_x + chunk['width'] * self.tile_width < view_left or
+                        chunk_px_y + chunk['height'] * self.tile_height < view_top):
+                    continue
+
+            chunk_surface = self.get_chunk_surface_for_zoom(layer, chunk, zoom)
+            if chunk_surface is None:
+                continue
 
-                # Compute bounding box of polygon in screen space to minimize surface size
-                xs = [p[0] for p in pts]
-                ys = [p[1] for p in pts]
-                min_x = int(min(xs))
-                min_y = int(min(ys))
-                max_x = int(max(xs))
-                max_y = int(max(ys))
+            x = math.floor(chunk_px_x * zoom) - offset_x
+            y = math.floor(chunk_px_y * zoom) - offset_y
+            screen.blit(chunk_surface, (x, y))
+
+    def _lod_span(self, layer, level):
+        """Jumlah chunk per sisi super-tile untuk level LOD"""
+        chunk_px = max(layer['chunk_width'] * self.tile_width, layer['chunk_height'] * self.tile_height)
+        return max(1, int(LOD_TILE_SIZE // (chunk_px * level)))
+
+    def _draw_lod_layer(self, screen, layer, zoom, view):
+        """Render chunked layer dari super-tile LOD (zoom di bawah LOD_ZOOM)"""
+        level = lod_level_for(zoom)
+        span = self._lod_span(layer, level)
+        super_w = span * layer['chunk_width'] * self.tile_width
+        super_h = span * layer['chunk_height'] * self.tile_height
+        offset_x = math.floor(camera.x * zoom)
+        offset_y = math.floor(camera.y * zoom)
+
+        for sy in range(math.floor(view[1] / super_h), math.floor(view[3] / super_h) + 1):
+            for sx in range(math.floor(view[0] / super_w), math.floor(view[2] / super_w) + 1):
+                surface = self._get_lod_surface(layer, sx, sy, level, span, zoom)
+                if surface is not None:
+                    screen.blit(surface, (math.floor(sx * super_w * zoom) - offset_x,
+                                          math.floor(sy * super_h * zoom) - offset_y))
+
+        # Chunk dengan tile lebih besar dari cell tidak ikut super-tile
+        overhang_w, overhang_h = self.get_tile_overhang()
+        if overhang_w or overhang_h:
+            for chunk in self.get_visible_chunks(layer, view[0] - overhang_w, view[1] - overhang_h,
+                                                 view[2], view[3]):
+                if self._has_oversized_tiles(chunk):
+                    self._draw_chunk_tiles(screen, layer, chunk, zoom, offset_x, offset_y)
+
+    def _lod_size(self, layer, sx, sy, span, zoom):
+        """Ukuran super-tile pada zoom (tepi dibulatkan seperti chunk biasa)"""
+        super_w = span * layer['chunk_width'] * self.tile_width
+        super_h = span * layer['chunk_height'] * self.tile_height
+        return (max(1, math.floor((sx + 1) * super_w * zoom) - math.floor(sx * super_w * zoom)),
+                max(1, math.floor((sy + 1) * super_h * zoom) - math.floor(sy * super_h * zoom)))
+
+    def _get_lod_surface(self, layer, sx, sy, level, span, zoom):
+        """Return super-tile untuk zoom: hasil bake di level LOD, di-scale ke
+        zoom persis (cepat dulu, smoothscale setelah zoom berhenti berubah)"""
+        base_key = (layer['index'], sx, sy, level, None)
+        base = self._lod_surfaces.get(base_key)
+        if base is None:
+            # False menandai super-tile kosong
+            base = self._bake_lod_surface(layer, sx, sy, level, span) or False
+            self._lod_surfaces.set(base_key, base)
+        if not base:
+            return None
+        if abs(zoom - level) < 1e-6:
+            return base
 
-                w = max(1, max_x - min_x)
-                h = max(1, max_y - min_y)
+        key = base_key[:4] + (round(float(zoom), 3),)
+        scaled = self._lod_surfaces.get(key)
+        if scaled is not None:
+            return scaled
+        size = self._lod_size(layer, sx, sy, span, zoom)
+        if self._zoom_settle_frames >= ZOOM_SETTLE_FRAMES:
+            self._lod_provisional.pop(key, None)
+            scaled = pygame.transform.smoothscale(base, size)
+            self._lod_surfaces.set(key, scaled)
+            return scaled
+        provisional = self._lod_provisional.get(key)
+        if provisional is None:
+            provisional = self._lod_provisional[key] = pygame.transform.scale(base, size)
+        return provisional
+
+    def _lod_source_tiles(self, source):
+        """Tile rows source chunk; unit streaming yang tidak resident dibaca
+        sementara dari compiled cache"""
+        if source['tiles'] is not None:
+            return source['tiles']
+        return self._split_rows(self._stream_reader.read(source['array_index']),
+                                source['width'], source['height'])
+
+    def _get_lod_tile(self, gid, level):
+        """Tile surface yang sudah di-downscale untuk level LOD"""
+        key = (gid, level)
+        tile = self._lod_tiles.get(key, _UNRESOLVED)
+        if tile is not _UNRESOLVED:
+            return tile
+        tile = self.get_tile_surface(gid)
+        if tile is not None:
+            # Dibulatkan ke atas supaya tile bersebelahan tidak menyisakan celah
+            size = (max(1, math.ceil(tile.get_width() * level)),
+                    max(1, math.ceil(tile.get_height() * level)))
+            try:
+                tile = pygame.transform.smoothscale(tile, size)
+            except ValueError:
+                tile = pygame.transform.scale(tile, size)
+        self._lod_tiles[key] = tile
+        return tile
+
+    def _bake_lod_surface(self, layer, sx, sy, level, span):
+        """Composite semua tile di span x span chunk langsung di resolusi level
+        (tanpa bake chunk 1.0 dulu). Returns None jika kosong."""
+        tw, th = self.tile_width, self.tile_height
+        origin_x = math.floor(sx * span * layer['chunk_width'] * tw * level)
+        origin_y = math.floor(sy * span * layer['chunk_height'] * th * level)
+        frames = self._animation_frames
+        animated = self._animated_gids
+        origin = {'x': sx * span * layer['chunk_width'], 'y': sy * span * layer['chunk_height']}
+        animated_cells = {}
+        overhang = self.get_tile_overhang() != (0, 0)
+        blit_sequence = []
+        for cy in range(sy * span, (sy + 1) * span):
+            for cx in range(sx * span, (sx + 1) * span):
+                chunk = layer['chunk_index'].get((cx, cy))
+                if chunk is None or (overhang and self._has_oversized_tiles(chunk)):
+                    continue
+                sources = [self._lod_source_tiles(source) for source in self._drawn_sources(chunk)]
+                cell = None
+                for col_idx, row_idx, gid in _iter_stacked_tiles(sources, chunk['width'], chunk['height'],
+                                                                 self.is_tile_opaque):
+                    if animated:
+                        # Tumpukan per cell berurutan (bawah ke atas); cell yang
+                        # berisi tile animasi digambar ulang seluruh tumpukannya
+                        if cell != (col_idx, row_idx):
+                            cell = (col_idx, row_idx)
+                            stack = []
+                        stack.append(gid)
+                        if gid in animated:
+                            animated_cells[(chunk['x'] - origin['x'] + col_idx,
+                                            chunk['y'] - origin['y'] + row_idx)] = stack
+                    tile = self._get_lod_tile(frames.get(gid, gid), level)
+                    if tile is None:
+                        continue
+                    blit_sequence.append((tile, (
+                        math.floor((chunk['x'] + col_idx) * tw * level) - origin_x,
+                        math.floor((chunk['y'] + row_idx) * th * level) - origin_y
+                    )))
+        if not blit_sequence:
+            return None
 
-                # Create small surface and draw filled polygon with alpha
-                poly_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-                local_pts = [(px - min_x, py - min_y) for (px, py) in pts]
-                pygame.draw.polygon(poly_surf, (255, 0, 0, 100), local_pts)
-                screen.blit(poly_surf, (min_x, min_y))
+        surface = pygame.Surface(self._lod_size(layer, sx, sy, span, level), pygame.SRCALPHA)
+        surface.blits(blit_sequence, doreturn=False)
+        if animated_cells:
+            self._lod_animated[(layer['index'], sx, sy, level, None)] = (origin, animated_cells)
+        return surface
 
-                # Draw outline directly on screen (cheaper than large temporary surfaces)
-                pygame.draw.polygon(screen, (255, 0, 0), pts, 2)
+    def draw_collision_debug(self, screen):
+        """Draw collision shapes (object layer 'Collision') untuk debugging"""
+        self.draw_debug_overlay(screen, 'collision')
 
     def draw_spawns_debug(self, screen):
         """Draw spawn points untuk debugging"""
-        spawns = self.get_spawn_points()
-        font = pygame.font.Font(None, 20)
+        self.draw_debug_overlay(screen, 'spawns')
+
+    def draw_debug_overlay(self, screen, kind, solid_tiles=None):
+        """
+        Draw debug overlay yang sudah di-bake per cell (grid chunk layer
+        pertama) dan per zoom, dengan culling yang sama seperti map.
 
-        for name, (x, y) in spawns.items():
-            screen_x = x - camera.x
-            screen_y = y - camera.y
+        Args:
+            kind: 'collision' (shapes), 'spawns', atau 'solid' (tile solid)
+            solid_tiles: Untuk kind 'solid': callable(tile_x, tile_y, w, h)
+                yang yield (tx, ty) tile solid (TiledMapCollision.solid_tiles_in)
+        """
+        zoom = getattr(camera, 'zoom', 1.0)
+        zoom_key = round(float(zoom), 3)
+        cell_w, cell_h = self._debug_cell_size()
+        cell_px_w = cell_w * self.tile_width
+        cell_px_h = cell_h * self.tile_height
+        offset_x = math.floor(camera.x * zoom)
+        offset_y = math.floor(camera.y * zoom)
+        first_cx = math.floor(camera.x / cell_px_w)
+        first_cy = math.floor(camera.y / cell_px_h)
+        last_cx = math.floor((camera.x + screen.get_width() / max(1e-6, zoom)) / cell_px_w)
+        last_cy = math.floor((camera.y + screen.get_height() / max(1e-6, zoom)) / cell_px_h)
+
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                key = (kind, cx * cell_w, cy * cell_h, zoom_key)
+                surface = self._debug_overlays.get(key)
+                if surface is None:
+                    # False menandai cell tanpa isi supaya tidak di-bake ulang
+                    surface = self._bake_debug_cell(kind, key[1], key[2], zoom, solid_tiles) or False
+                    self._debug_overlays.set(key, surface)
+                if surface:
+                    screen.blit(surface, (math.floor(cx * cell_px_w * zoom) - offset_x,
+                                          math.floor(cy * cell_px_h * zoom) - offset_y))
+
+    def _debug_cell_size(self):
+        """Ukuran cell overlay (tiles): sama dengan chunk collision layer
+        supaya cell bisa di-invalidate bersama collision chunk-nya"""
+        layers = self.get_collision_layers()
+        layer = layers[0] if layers else None
+        if layer is not None and layer.get('chunk_index') is not None:
+            return layer['chunk_width'], layer['chunk_height']
+        return FLATTEN_CHUNK_SIZE, FLATTEN_CHUNK_SIZE
+
+    def _debug_items(self):
+        """Collision shapes beserta bounding box (world px) dan spawn points
+        beserta area cross + label (screen px, relatif ke spawn), di-cache
+        sampai objects diganti"""
+        if self._debug_items_source is self.objects:
+            return self._debug_items_cache
+
+        shapes = []
+        for shape in self.get_collision_rects():
+            if shape['type'] == 'rect':
+                shapes.append((shape['rect'], shape))
+            else:
+                xs = [p[0] for p in shape['points']]
+                ys = [p[1] for p in shape['points']]
+                bbox = pygame.Rect(math.floor(min(xs)) - 2, math.floor(min(ys)) - 2,
+                                   math.ceil(max(xs) - min(xs)) + 5, math.ceil(max(ys) - min(ys)) + 5)
+                shapes.append((bbox, shape))
+
+        font = _debug_font()
+        spawns = []
+        for name, (x, y) in self.get_spawn_points().items():
+            label_w, label_h = font.size(name)
+            extent = pygame.Rect(-11, -11, 26 + label_w, max(22, label_h))
+            spawns.append((extent, (name, x, y)))
+
+        self._debug_items_cache = {'collision': shapes, 'spawns': spawns}
+        self._debug_items_source = self.objects
+        return self._debug_items_cache
+
+    def _bake_debug_cell(self, kind, tile_x, tile_y, zoom, solid_tiles):
+        """Gambar isi overlay satu cell ke surface (None jika kosong)"""
+        cell_w, cell_h = self._debug_cell_size()
+        tw, th = self.tile_width, self.tile_height
+        world = pygame.Rect(tile_x * tw, tile_y * th, cell_w * tw, cell_h * th)
+        origin_x = math.floor(world.left * zoom)
+        origin_y = math.floor(world.top * zoom)
+
+        def to_cell(x, y):
+            return x * zoom - origin_x, y * zoom - origin_y
+
+        def scaled_rect(rect):
+            x0, y0 = to_cell(rect.left, rect.top)
+            x1, y1 = to_cell(rect.right, rect.bottom)
+            return pygame.Rect(math.floor(x0), math.floor(y0),
+                               max(1, math.floor(x1) - math.floor(x0)),
+                               max(1, math.floor(y1) - math.floor(y0)))
+
+        surface = pygame.Surface(
+            (math.floor(world.right * zoom) - origin_x, math.floor(world.bottom * zoom) - origin_y),
+            pygame.SRCALPHA
+        )
+        drawn = False
+
+        if kind == 'solid':
+            if solid_tiles is None:
+                return None
+            for tx, ty in solid_tiles(tile_x, tile_y, cell_w, cell_h):
+                surface.fill((255, 0, 0, 80), scaled_rect(pygame.Rect(tx * tw, ty * th, tw, th)))
+                drawn = True
+
+        elif kind == 'collision':
+            for bbox, shape in self._debug_items()['collision']:
+                if not bbox.colliderect(world):
+                    continue
+                if shape['type'] == 'rect':
+                    rect = scaled_rect(shape['rect'])
+                    surface.fill((255, 0, 0, 100), rect)
+                    pygame.draw.rect(surface, (255, 0, 0), rect, 2)
+                else:
+                    pts = [to_cell(x, y) for x, y in shape['points']]
+                    if len(pts) >= 3:
+                        pygame.draw.polygon(surface, (255, 0, 0, 100), pts)
+                    if len(pts) >= 2:
+                        pygame.draw.polygon(surface, (255, 0, 0), pts, 2)
+                drawn = True
+
+        elif kind == 'spawns':
+            font = _debug_font()
+            for extent, (name, x, y) in self._debug_items()['spawns']:
+                # Label tidak ikut zoom: luasnya di world = extent / zoom
+                bbox = pygame.Rect(math.floor(x + extent.left / zoom), math.floor(y + extent.top / zoom),
+                                   math.ceil(extent.width / zoom) + 1, math.ceil(extent.height / zoom) + 1)
+                if not bbox.colliderect(world):
+                    continue
+                sx, sy = to_cell(x, y)
+                # Cross + label dengan ukuran tetap di layar (tidak ikut zoom)
+                pygame.draw.line(surface, (0, 255, 0), (sx - 10, sy), (sx + 10, sy), 2)
+                pygame.draw.line(surface, (0, 255, 0), (sx, sy - 10), (sx, sy + 10), 2)
+                surface.blit(font.render(name, True, (0, 255, 0)), (sx + 15, sy - 10))
+                drawn = True
 
-            # Draw cross
-            pygame.draw.line(screen, (0, 255, 0),
-                           (screen_x - 10, screen_y), (screen_x + 10, screen_y), 2)
-            pygame.draw.line(screen, (0, 255, 0),
-                           (screen_x, screen_y - 10), (screen_x, screen_y + 10), 2)
+        return surface if drawn else None
 
-            # Draw label
-            label = font.render(name, True, (0, 255, 0))
-            screen.blit(label, (screen_x + 15, screen_y - 10))
+    def _drop_debug_cells(self, kind, cells):
+        """Buang overlay cell (tile_x, tile_y) tertentu, misal saat collision chunk berubah"""
+        if len(self._debug_overlays) and cells:
+            cells = set(cells)
+            self._debug_overlays.remove_if(lambda key: key[0] == kind and (key[1], key[2]) in cells)
 
 
 class TiledMapCollision:
     """Collision system untuk Tiled maps (support infinite maps)"""
 
-    def __init__(self, tiled_map):
+    def __init__(self, tiled_map, backend='geometric'):
         """
         Args:
             tiled_map: TiledMap object
+            backend: 'geometric' atau 'mask' (lihat COLLISION_BACKENDS)
         """
         self.map = tiled_map
-        # Collision shapes (rects and polygons)
-        self.collision_shapes = tiled_map.get_collision_rects()
+        if backend not in COLLISION_BACKENDS:
+            print(f"⚠️  Unknown collision backend '{backend}', using 'geometric'")
+            backend = 'geometric'
+        self.backend = backend
+        # Mode 'mask': (Mask, sumber grid) per chunk, key = tile pojok kiri atas chunk.
+        # Sumber grid dicek setiap lookup supaya chunk streaming yang di-load ulang
+        # otomatis di-rasterize ulang
+        map_name = os.path.basename(tiled_map.tmx_file)
+        self._masks = SurfaceCache(f'{map_name} collision mask', max_bytes=8 * MB)
+        self._rect_masks = {}  # (width, height) -> Mask penuh untuk query rect
+        # Collision shapes (rects and polygons), plus spatial hash-nya
+        self._set_collision_shapes(tiled_map.get_collision_rects())
 
         # Generate collision grid dari tile properties
+        self._build_tile_collision()
+
+    def _set_collision_shapes(self, shapes):
+        """Simpan collision shapes dan bangun spatial hash (uniform grid
+        COLLISION_CELL_SIZE) supaya query hanya mengecek shape di cell yang
+        overlap, berapapun jumlah shape di map.
+
+        Polygon di-preprocess jadi PolygonRecord (shape['polygon']): bbox,
+        edges, dan convex parts untuk separating axis test.
+        """
+        self.collision_shapes = []
+        grid = {}
+        for shape in shapes:
+            if shape['type'] == 'polygon':
+                record = _build_polygon_record(shape.get('points') or ())
+                if record is None:
+                    continue
+                shape = dict(shape, polygon=record)
+                bounds = record.bbox
+            else:
+                rect = shape['rect']
+                bounds = (rect.left, rect.top, rect.right, rect.bottom)
+            self.collision_shapes.append(shape)
+            for cell in self._cells_in(*bounds):
+                grid.setdefault(cell, []).append(shape)
+        self._shape_grid = grid
+        self._masks.clear()
+
+    def _cells_in(self, left, top, right, bottom):
+        """Cell spatial hash yang disentuh area (tepi kanan/bawah inklusif)"""
+        size = COLLISION_CELL_SIZE
+        for cell_y in range(int(top // size), int(bottom // size) + 1):
+            for cell_x in range(int(left // size), int(right // size) + 1):
+                yield cell_x, cell_y
+
+    def shapes_near(self, left, top, right, bottom):
+        """Collision shapes yang cell-nya overlap area (tanpa duplikat)"""
+        grid = self._shape_grid
+        cells = list(self._cells_in(left, top, right, bottom))
+        if len(cells) == 1:
+            return grid.get(cells[0], ())
+        shapes = {}
+        for cell in cells:
+            for shape in grid.get(cell, ()):
+                shapes[id(shape)] = shape
+        return shapes.values()
+
+    def _build_tile_collision(self):
+        tiled_map = self.map
+        self._masks.clear()
+        # Ukuran chunk (tiles) dari TMX, untuk lookup tile -> collision chunk
+        chunked = [layer for layer in tiled_map.get_collision_layers() if layer['is_chunked']]
+        if chunked:
+            self._chunk_size = (chunked[0].get('chunk_width') or 16, chunked[0].get('chunk_height') or 16)
+        else:
+            self._chunk_size = (16, 16)
         if not tiled_map.is_infinite:
             self.collision_grid = self._generate_collision_grid()
+            self.collision_chunks = {}
+        elif tiled_map.streaming:
+            # Grid chunk di-load/dilepas bersama chunk map (streaming mode)
+            self.collision_grid = None
+            self.collision_chunks = tiled_map.collision_chunks
         else:
             self.collision_grid = None  # Infinite maps use chunk-based collision
             self.collision_chunks = self._generate_collision_chunks()
 
     def _generate_collision_grid(self):
-        """Generate 2D grid collision dari tile properties (untuk fixed maps)"""
-        grid = []
-
-        # Use first layer untuk collision grid
-        if self.map.layers:
-            layer = self.map.layers[0]
-            if not layer.get('is_chunked', False):
-                for row in layer['tiles']:
-                    grid_row = []
-                    for gid in row:
-                        is_solid = self.map.is_tile_solid(gid)
-                        grid_row.append(1 if is_solid else 0)
-                    grid.append(grid_row)
-
-        return grid
+        """
+        Generate grid collision untuk fixed maps dari semua collision layers.
+
+        Returns:
+            {'grid': bytearray row-major (1 = solid), 'width', 'height'}, atau
+            None jika tidak ada collision layer
+        """
+        layers = [layer for layer in self.map.get_collision_layers() if not layer['is_chunked']]
+        if not layers:
+            return None
+        solid_lut = self.map.get_solid_lut()
+        return {
+            'grid': _merge_solid([_solid_bytes(layer['data'], solid_lut) for layer in layers]),
+            'width': layers[0]['width'],
+            'height': layers[0]['height']
+        }
+
+    def _collision_sources(self):
+        """(chunk x, chunk y) -> chunks collision layers di posisi tersebut"""
+        sources = {}
+        for layer in self.map.get_collision_layers():
+            if layer['is_chunked']:
+                for chunk in layer['chunks']:
+                    sources.setdefault((chunk['x'], chunk['y']), []).append(chunk)
+        return sources
 
     def _generate_collision_chunks(self):
         """Generate collision data untuk infinite maps (chunk-based)"""
-        chunks = {}
+        return {key: self._chunk_collision(chunks) for key, chunks in self._collision_sources().items()}
+
+    def _chunk_collision(self, chunks):
+        """Grid collision satu posisi chunk: OR dari chunk setiap collision layer"""
+        solid_lut = self.map.get_solid_lut()
+        return {
+            'grid': _merge_solid([_solid_bytes(chunk['data'], solid_lut) for chunk in chunks]),
+            'width': chunks[0]['width'],
+            'height': chunks[0]['height']
+        }
 
-        if self.map.layers:
-            layer = self.map.layers[0]
-            if layer.get('is_chunked', False):
-                for chunk in layer['chunks']:
-                    chunk_key = (chunk['x'], chunk['y'])
-                    chunk_grid = []
-
-                    for row in chunk['tiles']:
-                        grid_row = []
-                        for gid in row:
-                            is_solid = self.map.is_tile_solid(gid)
-                            grid_row.append(1 if is_solid else 0)
-                        chunk_grid.append(grid_row)
-
-                    chunks[chunk_key] = {
-                        'grid': chunk_grid,
-                        'width': chunk['width'],
-                        'height': chunk['height']
-                    }
+    def apply_map_changes(self, changes):
+        """Update collision setelah TiledMap.poll_hot_reload() / hot_reload()"""
+        if changes['objects_changed'] or changes['full']:
+            self._set_collision_shapes(self.map.get_collision_rects())
+        if changes['full'] or not self.map.is_infinite:
+            self._build_tile_collision()
+            return
+        if self.map.streaming or not self.map.layers:
+            # Grid chunk diurus TiledMap (lihat _carry_over_resident)
+            return
 
-        return chunks
+        sources = self._collision_sources()
+        tw, th = self.map.tile_width, self.map.tile_height
+        for rect in changes['tile_rects']:
+            for layer in self.map.get_collision_layers():
+                if not layer['is_chunked']:
+                    continue
+                for chunk in self.map.get_visible_chunks(layer, rect.left * tw, rect.top * th,
+                                                         rect.right * tw - 1, rect.bottom * th - 1):
+                    key = (chunk['x'], chunk['y'])
+                    self.collision_chunks[key] = self._chunk_collision(sources[key])
+        for key in [key for key in self.collision_chunks if key not in sources]:
+            del self.collision_chunks[key]
 
 
 
@@ -897,86 +3491,33 @@ class TiledMapCollision:
             p1x, p1y = p2x, p2y
 
         return inside
-    def _rect_corners(self, rect):
-        return [
-            (rect.left, rect.top),
-            (rect.right, rect.top),
-            (rect.right, rect.bottom),
-            (rect.left, rect.bottom)
-        ]
-
-    def _segments_intersect(self, a1, a2, b1, b2):
-        def ccw(p1, p2, p3):
-            return (p3[1]-p1[1]) * (p2[0]-p1[0]) > (p2[1]-p1[1]) * (p3[0]-p1[0])
-        return (ccw(a1, b1, b2) != ccw(a2, b1, b2)) and (ccw(a1, a2, b1) != ccw(a1, a2, b2))
-
-    def _polygon_rect_intersect(self, polygon, rect):
-        # 1) Any polygon point inside rect
-        for px, py in polygon:
-            if rect.collidepoint(px, py):
-                return True
-
-        # 2) Any rect corner inside polygon
-        for cx, cy in self._rect_corners(rect):
-            if self._point_in_polygon(cx, cy, polygon):
-                return True
-
-        # 3) Any edge intersects
-        poly_len = len(polygon)
-        rect_pts = self._rect_corners(rect)
-        rect_edges = []
-        for i in range(4):
-            rect_edges.append((rect_pts[i], rect_pts[(i+1)%4]))
-
-        for i in range(poly_len):
-            a1 = polygon[i]
-            a2 = polygon[(i+1) % poly_len]
-            for b1, b2 in rect_edges:
-                if self._segments_intersect(a1, a2, b1, b2):
-                    return True
 
-        return False
     def is_position_solid(self, x, y):
         """Check apakah posisi solid (with pixel-perfect polygon support)"""
+        if self.backend == 'mask':
+            return self._mask_position_solid(x, y)
         # Check collision objects (polygons and rects) - PRIORITY!
-        for obj in self.collision_shapes:
+        # Hanya shape di cell spatial hash titik ini
+        cell = (int(x // COLLISION_CELL_SIZE), int(y // COLLISION_CELL_SIZE))
+        for obj in self._shape_grid.get(cell, ()):
             if obj['type'] == 'polygon':
-                if self._point_in_polygon(x, y, obj['points']):
+                record = obj['polygon']
+                bbox = record.bbox
+                if (bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3] and
+                        self._point_in_polygon(x, y, record.points)):
                     return True
             elif obj['type'] == 'rect':
                 point_rect = pygame.Rect(x, y, 1, 1)
                 if obj['rect'].colliderect(point_rect):
                     return True
 
-        # Check tile grid
-        if self.collision_grid:
-            # Fixed map
-            tile_x = int(x // self.map.tile_width)
-            tile_y = int(y // self.map.tile_height)
-
-            if (0 <= tile_y < len(self.collision_grid) and
-                0 <= tile_x < len(self.collision_grid[0])):
-                return self.collision_grid[tile_y][tile_x] == 1
-
-        elif self.collision_chunks:
-            # Infinite map - check relevant chunk
-            chunk_x = int(x // (self.map.tile_width * 16))  # Assuming 16x16 chunks
-            chunk_y = int(y // (self.map.tile_height * 16))
-            chunk_key = (chunk_x, chunk_y)
-
-            if chunk_key in self.collision_chunks:
-                chunk = self.collision_chunks[chunk_key]
-                local_x = int((x - chunk_x * self.map.tile_width * 16) // self.map.tile_width)
-                local_y = int((y - chunk_y * self.map.tile_height * 16) // self.map.tile_height)
-
-                if (0 <= local_y < len(chunk['grid']) and
-                    0 <= local_x < len(chunk['grid'][0])):
-                    return chunk['grid'][local_y][local_x] == 1
-
-        return False
+        # Check tile grid (fixed map atau chunk dengan ukuran dari TMX)
+        return self._is_tile_solid_at(int(x // self.map.tile_width), int(y // self.map.tile_height))
 
     def is_rect_colliding(self, rect):
         """Check apakah rectangle colliding"""
+        if self.backend == 'mask':
+            return self._mask_rect_colliding(rect)
         # Check corners and center
         corners = [
             (rect.left, rect.top),
@@ -990,36 +3531,394 @@ class TiledMapCollision:
             if self.is_position_solid(x, y):
                 return True
 
-        # Check against collision rects
-        for shape in self.collision_shapes:
+        # Check against collision shapes di cell yang overlap rect
+        for shape in self.shapes_near(rect.left, rect.top, rect.right, rect.bottom):
             if shape['type'] == 'rect':
                 if rect.colliderect(shape['rect']):
                     return True
             elif shape['type'] == 'polygon':
-                if self._polygon_rect_intersect(shape['points'], rect):
+                # Rect half-open seperti pygame.Rect: bersentuhan di tepi kiri/atas
+                # dihitung collide, di tepi kanan/bawah (eksklusif) tidak
+                eps = SWEEP_EPSILON
+                if _polygon_overlaps_rect(shape['polygon'], rect.left - eps, rect.top - eps,
+                                          rect.right - eps, rect.bottom - eps):
                     return True
 
         return False
 
-    def draw_debug(self, screen):
-        """Draw collision debug"""
-        # Draw grid
+    def _mask_chunk_tiles(self):
+        """Ukuran (tiles) satu chunk collision mask, sama dengan chunk map jika infinite"""
+        if self.map.is_infinite:
+            return self._chunk_size
+        return MASK_CHUNK_TILES, MASK_CHUNK_TILES
+
+    def _mask_chunks_in(self, left, top, right, bottom):
+        """Yield (chunk_x, chunk_y, origin_x, origin_y) untuk chunk mask yang
+        disentuh area world pixels [left, right) x [top, bottom)"""
+        chunk_w, chunk_h = self._mask_chunk_tiles()
+        span_w = chunk_w * self.map.tile_width
+        span_h = chunk_h * self.map.tile_height
+        for row in range(int(top // span_h), int((bottom - 1) // span_h) + 1):
+            for col in range(int(left // span_w), int((right - 1) // span_w) + 1):
+                yield col * chunk_w, row * chunk_h, col * span_w, row * span_h
+
+    def _get_mask(self, chunk_x, chunk_y):
+        """Collision mask satu chunk (di-rasterize saat pertama dipakai)"""
+        key = (chunk_x, chunk_y)
+        source = self.collision_chunks.get(key) if self.map.is_infinite else self.collision_grid
+        cached = self._masks.get(key)
+        if cached is not None and cached[1] is source:
+            return cached[0]
+        mask = self._bake_mask(chunk_x, chunk_y, source)
+        self._masks.set(key, (mask, source))
+        return mask
+
+    def _bake_mask(self, chunk_x, chunk_y, source):
+        """
+        Rasterize tile solid, rect, dan polygon di satu chunk ke Mask.
+
+        Bit (px, py) diset jika is_position_solid() versi geometric True di
+        titik pixel tersebut: rect/tile memakai tepi kiri-atas inklusif, polygon
+        memakai aturan ray casting yang sama dengan _point_in_polygon (per baris).
+        """
+        chunk_w, chunk_h = self._mask_chunk_tiles()
+        tw, th = self.map.tile_width, self.map.tile_height
+        width, height = chunk_w * tw, chunk_h * th
+        origin_x, origin_y = chunk_x * tw, chunk_y * th
+
+        # Digambar ke surface dulu (fill di C), lalu dikonversi sekali ke Mask
+        surface = pygame.Surface((width, height))
+        surface.set_colorkey((0, 0, 0))
+        solid = (255, 255, 255)
+
+        if self.map.is_infinite:
+            # Chunk mask = chunk collision map, grid-nya langsung dipakai
+            cells = source['grid'] if source is not None else ()
+            for index, is_solid in enumerate(cells):
+                if is_solid == 1:
+                    col_idx, row_idx = index % source['width'], index // source['width']
+                    surface.fill(solid, (col_idx * tw, row_idx * th, tw, th))
+        else:
+            for tx, ty in self.solid_tiles_in(chunk_x, chunk_y, chunk_w, chunk_h):
+                surface.fill(solid, ((tx - chunk_x) * tw, (ty - chunk_y) * th, tw, th))
+
+        right, bottom = origin_x + width, origin_y + height
+        for shape in self.shapes_near(origin_x, origin_y, right - 1, bottom - 1):
+            if shape['type'] == 'rect':
+                # Clip manual: fill() dengan x/y negatif tidak memotong lebar/tinggi
+                surface.fill(solid, shape['rect'].move(-origin_x, -origin_y).clip(surface.get_rect()))
+                continue
+            record = shape['polygon']
+            points = record.points
+            count = len(points)
+            first_row = max(origin_y, math.floor(record.bbox[1]))
+            last_row = min(bottom - 1, math.floor(record.bbox[3]))
+            for y in range(first_row, last_row + 1):
+                crossings = []
+                for i in range(count):
+                    x1, y1 = points[i - 1]
+                    x2, y2 = points[i]
+                    if min(y1, y2) < y <= max(y1, y2):
+                        crossings.append(x1 if x1 == x2 else (y - y1) * (x2 - x1) / (y2 - y1) + x1)
+                crossings.sort()
+                # Titik x di dalam jika jumlah crossing >= x ganjil: span (a, b]
+                for i in range(0, len(crossings) - 1, 2):
+                    start = max(origin_x, math.floor(crossings[i]) + 1)
+                    end = min(right, math.floor(crossings[i + 1]) + 1)
+                    if end > start:
+                        surface.fill(solid, (start - origin_x, y - origin_y, end - start, 1))
+
+        return pygame.mask.from_surface(surface)
+
+    def _mask_position_solid(self, x, y):
+        """is_position_solid() lewat collision mask (resolusi 1 pixel)"""
+        x, y = math.floor(x), math.floor(y)
+        chunk_w, chunk_h = self._mask_chunk_tiles()
+        span_w = chunk_w * self.map.tile_width
+        span_h = chunk_h * self.map.tile_height
+        col, row = x // span_w, y // span_h
+        mask = self._get_mask(col * chunk_w, row * chunk_h)
+        return bool(mask.get_at((x - col * span_w, y - row * span_h)))
+
+    def _mask_rect_colliding(self, rect):
+        """is_rect_colliding() lewat Mask.overlap: semua pixel di dalam rect dicek"""
+        return self._mask_area_solid(rect.left, rect.top, rect.width, rect.height)
+
+    def _mask_area_solid(self, left, top, width, height, masks=None):
+        """
+        True jika ada pixel solid di area [left, left + width) x [top, top + height).
+
+        masks: list (Mask, origin_x, origin_y) yang sudah mencakup area (dipakai
+        berulang oleh _mask_sweep), default chunk yang disentuh area
+        """
+        size = (max(1, width), max(1, height))
+        rect_mask = self._rect_masks.get(size)
+        if rect_mask is None:
+            if len(self._rect_masks) >= 256:
+                # Ukuran area sweep bervariasi; jangan tumbuh tanpa batas
+                self._rect_masks.clear()
+            rect_mask = pygame.mask.Mask(size, fill=True)
+            self._rect_masks[size] = rect_mask
+        if masks is None:
+            masks = self._masks_in(left, top, left + size[0], top + size[1])
+        for mask, origin_x, origin_y in masks:
+            if mask.overlap(rect_mask, (left - origin_x, top - origin_y)):
+                return True
+        return False
+
+    def _masks_in(self, left, top, right, bottom):
+        """List (Mask, origin_x, origin_y) untuk chunk yang disentuh area"""
+        return [(self._get_mask(chunk_x, chunk_y), origin_x, origin_y)
+                for chunk_x, chunk_y, origin_x, origin_y in self._mask_chunks_in(left, top, right, bottom)]
+
+    def _mask_sweep(self, left, top, width, height, dx, dy):
+        """
+        sweep_box() satu axis di mode 'mask': cari baris/kolom pixel solid
+        terdekat di depan box dengan binary search Mask.overlap, jadi hanya
+        beberapa query C per gerakan.
+
+        Pixel yang sudah overlap box di posisi awal diabaikan, sama seperti
+        shape yang sudah overlap di backend geometric.
+        """
+        eps = SWEEP_EPSILON
+        if dx:
+            pos, size, delta, cross, cross_size = left, width, dx, top, height
+        else:
+            pos, size, delta, cross, cross_size = top, height, dy, left, width
+        # Pixel di axis lain yang overlap box
+        first = math.floor(cross + eps)
+        span = max(1, math.ceil(cross + cross_size - eps) - first)
+        if delta > 0:
+            start = math.ceil(pos + size - eps)  # pixel pertama di depan box
+            count = math.ceil(pos + size + delta) - start
+        else:
+            end = math.floor(pos + eps)  # pixel terdekat di depan box = end - 1
+            count = end - math.floor(pos + delta)
+        if count <= 0:
+            return 1.0, None
+        low = start if delta > 0 else end - count
+        if dx:
+            masks = self._masks_in(low, first, low + count, first + span)
+        else:
+            masks = self._masks_in(first, low, first + span, low + count)
+
+        def blocked(n):
+            """True jika n pixel terdekat di depan box ada yang solid"""
+            low = start if delta > 0 else end - n
+            if dx:
+                return self._mask_area_solid(low, first, n, span, masks)
+            return self._mask_area_solid(first, low, span, n, masks)
+
+        if not blocked(count):
+            return 1.0, None
+        lo, hi = 0, count
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if blocked(mid):
+                hi = mid
+            else:
+                lo = mid
+        if delta > 0:
+            t = (start + hi - 1 - (pos + size)) / delta
+        else:
+            t = (pos - (end - hi + 1)) / -delta
+        sign = -1.0 if delta > 0 else 1.0
+        return max(0.0, t), ((sign, 0.0) if dx else (0.0, sign))
+
+    def sweep_box(self, left, top, width, height, dx, dy):
+        """
+        Continuous collision: gerakkan box (world pixels, boleh float) sejauh
+        (dx, dy) dan cari kontak pertama dengan tile solid, rect, dan polygon.
+
+        Shape yang sudah overlap box di posisi awal diabaikan (supaya entity
+        yang ter-spawn di dalam collision bisa keluar).
+
+        Returns:
+            (t, normal): t = fraksi gerakan (0..1) sampai kontak, 1.0 jika
+            tidak menabrak; normal = (nx, ny) arah dorong permukaan ke box,
+            atau None jika tidak menabrak
+        """
+        best_t = 1.0
+        best_normal = None
+        if not dx and not dy:
+            return best_t, best_normal
+        if self.backend == 'mask' and not (dx and dy):
+            # Gerakan satu axis (move_box) dijawab collision mask; diagonal
+            # tetap lewat shape geometric di bawah
+            return self._mask_sweep(left, top, width, height, dx, dy)
+
+        area = (min(left, left + dx), min(top, top + dy),
+                max(left, left + dx) + width, max(top, top + dy) + height)
+        box = (left, top, width, height)
+
+        obstacles = list(self._solid_tile_bounds(*area))
+        for shape in self.shapes_near(*area):
+            if shape['type'] == 'rect':
+                rect = shape['rect']
+                obstacles.append((rect.left, rect.top, rect.right, rect.bottom))
+            else:
+                hit = self._sweep_polygon(box, dx, dy, shape['polygon'])
+                if hit is not None and hit[0] < best_t:
+                    best_t, best_normal = hit
+
+        for bounds in obstacles:
+            hit = self._sweep_aabb(box, dx, dy, bounds)
+            if hit is not None and hit[0] < best_t:
+                best_t, best_normal = hit
+
+        return best_t, best_normal
+
+    def move_box(self, left, top, width, height, dx, dy):
+        """
+        Gerakkan box dengan slide: satu sweep_box per axis (x lalu y), jadi
+        box tetap bergeser sepanjang dinding dan tidak tembus pada kecepatan
+        berapapun.
+
+        Returns:
+            (new_left, new_top, hit_x, hit_y)
+        """
+        hit_x = hit_y = False
+        if dx:
+            t, normal = self.sweep_box(left, top, width, height, dx, 0)
+            if normal is not None:
+                hit_x = True
+                dx = math.copysign(max(0.0, abs(dx) * t - SWEEP_SKIN), dx)
+            left += dx
+        if dy:
+            t, normal = self.sweep_box(left, top, width, height, 0, dy)
+            if normal is not None:
+                hit_y = True
+                dy = math.copysign(max(0.0, abs(dy) * t - SWEEP_SKIN), dy)
+            top += dy
+        return left, top, hit_x, hit_y
+
+    def _sweep_aabb(self, box, dx, dy, bounds):
+        """Swept AABB vs AABB (slab test). Returns (t, normal) atau None"""
+        left, top, width, height = box
+        obstacle_left, obstacle_top, obstacle_right, obstacle_bottom = bounds
+        eps = SWEEP_EPSILON
+        if (left < obstacle_right - eps and left + width > obstacle_left + eps and
+                top < obstacle_bottom - eps and top + height > obstacle_top + eps):
+            return None
+
+        t_entry = -math.inf
+        t_exit = math.inf
+        normal = None
+        for pos, size, delta, low, high, axis in (
+                (left, width, dx, obstacle_left, obstacle_right, 0),
+                (top, height, dy, obstacle_top, obstacle_bottom, 1)):
+            if delta == 0:
+                # Tidak bergerak di axis ini: harus sudah overlap (bukan hanya bersentuhan)
+                if pos + size <= low + eps or pos >= high - eps:
+                    return None
+                continue
+            if delta > 0:
+                enter = (low - (pos + size)) / delta
+                leave = (high - pos) / delta
+            else:
+                enter = (high - pos) / delta
+                leave = (low - (pos + size)) / delta
+            if enter > t_entry:
+                t_entry = enter
+                normal = (-1.0 if delta > 0 else 1.0, 0.0) if axis == 0 else (0.0, -1.0 if delta > 0 else 1.0)
+            t_exit = min(t_exit, leave)
+
+        if t_entry >= t_exit or t_entry > 1.0 or t_exit <= 0.0:
+            return None
+        return max(0.0, t_entry), normal
+
+    def _sweep_polygon(self, box, dx, dy, record):
+        """
+        Swept AABB vs polygon (PolygonRecord): kontak pertama antara sudut box
+        dan edge polygon, atau vertex polygon dan edge box. Returns (t, normal)
+        atau None
+        """
+        left, top, width, height = box
+        right = left + width
+        bottom = top + height
+        bbox = record.bbox
+        if (max(left, left + dx) + width < bbox[0] or min(left, left + dx) > bbox[2] or
+                max(top, top + dy) + height < bbox[1] or min(top, top + dy) > bbox[3]):
+            return None
+        if _polygon_overlaps_rect(record, left, top, right, bottom, SWEEP_EPSILON):
+            return None
+
+        t_min = -SWEEP_EPSILON / math.hypot(dx, dy)
+        best = None
+        corners = ((left, top), (right, top), (right, bottom), (left, bottom))
+
+        # 1) Sudut box menabrak edge polygon
+        for ax, ay, ex, ey, nx, ny in record.edges:
+            if nx * dx + ny * dy >= 0:
+                continue  # bergerak menjauh / sejajar edge
+            for px, py in corners:
+                t = _ray_segment_time(px, py, dx, dy, ax, ay, ex, ey)
+                if t is not None and t_min <= t <= 1.0 and (best is None or t < best[0]):
+                    best = (max(0.0, t), (nx, ny))
+
+        # 2) Vertex polygon menabrak edge box (gerak relatif -d)
+        box_edges = (
+            ((left, top), (width, 0.0), (0.0, -1.0)),
+            ((right, top), (0.0, height), (1.0, 0.0)),
+            ((left, bottom), (width, 0.0), (0.0, 1.0)),
+            ((left, top), (0.0, height), (-1.0, 0.0)),
+        )
+        for (sx, sy), (ex, ey), (nx, ny) in box_edges:
+            if nx * dx + ny * dy <= 0:
+                continue  # edge box tidak bergerak ke arah polygon
+            for px, py in record.points:
+                t = _ray_segment_time(px, py, -dx, -dy, sx, sy, ex, ey)
+                if t is not None and t_min <= t <= 1.0 and (best is None or t < best[0]):
+                    best = (max(0.0, t), (-nx, -ny))
+        return best
+
+    def _solid_tile_bounds(self, left, top, right, bottom):
+        """Yield (left, top, right, bottom) world pixels tile solid di area"""
+        tw, th = self.map.tile_width, self.map.tile_height
+        for ty in range(int(top // th), int(bottom // th) + 1):
+            for tx in range(int(left // tw), int(right // tw) + 1):
+                if self._is_tile_solid_at(tx, ty):
+                    yield tx * tw, ty * th, (tx + 1) * tw, (ty + 1) * th
+
+    def _is_tile_solid_at(self, tile_x, tile_y):
+        """Lookup langsung grid collision untuk satu tile"""
+        grid = self.collision_grid
+        if grid:
+            if 0 <= tile_x < grid['width'] and 0 <= tile_y < grid['height']:
+                return grid['grid'][tile_y * grid['width'] + tile_x] == 1
+            return False
+        if self.collision_chunks:
+            chunk_w, chunk_h = self._chunk_size
+            local_x = tile_x % chunk_w
+            local_y = tile_y % chunk_h
+            # Key collision chunk = koordinat tile pojok kiri atas chunk
+            chunk = self.collision_chunks.get((tile_x - local_x, tile_y - local_y))
+            if chunk is not None and local_x < chunk['width'] and local_y < chunk['height']:
+                return chunk['grid'][local_y * chunk['width'] + local_x] == 1
+        return False
+
+    def solid_tiles_in(self, tile_x, tile_y, width, height):
+        """Yield (tx, ty) untuk tile solid di dalam area (koordinat tile)"""
         if self.collision_grid:
-            for y, row in enumerate(self.collision_grid):
-                for x, is_solid in enumerate(row):
-                    if is_solid == 1:
-                        rect = pygame.Rect(
-                            x * self.map.tile_width - camera.x,
-                            y * self.map.tile_height - camera.y,
-                            self.map.tile_width,
-                            self.map.tile_height
-                        )
-                        surface = pygame.Surface((self.map.tile_width, self.map.tile_height))
-                        surface.set_alpha(80)
-                        surface.fill((255, 0, 0))
-                        screen.blit(surface, rect.topleft)
+            cells = self.collision_grid['grid']
+            grid_w = self.collision_grid['width']
+            for ty in range(max(0, tile_y), min(self.collision_grid['height'], tile_y + height)):
+                for tx in range(max(0, tile_x), min(grid_w, tile_x + width)):
+                    if cells[ty * grid_w + tx] == 1:
+                        yield tx, ty
+        elif self.collision_chunks:
+            area = pygame.Rect(tile_x, tile_y, width, height)
+            for (chunk_x, chunk_y), chunk in list(self.collision_chunks.items()):
+                if not area.colliderect((chunk_x, chunk_y, chunk['width'], chunk['height'])):
+                    continue
+                chunk_w = chunk['width']
+                for index, is_solid in enumerate(chunk['grid']):
+                    if is_solid == 1 and area.collidepoint(chunk_x + index % chunk_w, chunk_y + index // chunk_w):
+                        yield chunk_x + index % chunk_w, chunk_y + index // chunk_w
 
-        # Draw collision rects
+    def draw_debug(self, screen):
+        """Draw collision debug (overlay di-bake per cell, lihat TiledMap.draw_debug_overlay)"""
+        self.map.draw_debug_overlay(screen, 'solid', self.solid_tiles_in)
         self.map.draw_collision_debug(screen)
 
 
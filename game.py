@@ -8,7 +8,7 @@ import pygame
 import sys
 from core import input as Input
 from core.player import Player
-from core.camera import create_screen, camera
+from core.camera import create_screen, camera, NativeScaleView
 from core.music import MusicManager
 from core.npc import NPCManager, create_sample_npcs, NPC
 import json
@@ -18,6 +18,8 @@ from core.dialog import DialogueBox, EndingChoice
 from core.ending import EndingScreen
 from core.menu import MainMenu, PauseMenu
 from core.save_system import SaveSystem, GameSettings
+from core import image_loader
+from core.surface_cache import global_budget, MB
 
 # Map imports
 from core.map import TileKinds, Map
@@ -25,7 +27,8 @@ from core.collision import MapCollision
 
 USE_TILED = True
 try:
-    from core.tiled_map import TiledMap, TiledMapCollision
+    from core.tiled_map import TiledMap, TiledMapCollision, animation_clock
+    from core.map_manager import MapManager
 except ImportError:
     print("[WARNING] Tiled map tidak tersedia")
     USE_TILED = False
@@ -109,6 +112,12 @@ try:
 except Exception:
     pass
 
+# Budget memori bersama untuk surface caches (map, sprite, text)
+global_budget.limit_bytes = int(settings.get("cache_memory_mb", 256) * MB)
+
+# Optional: render world 1:1 lalu scale sekali ke layar (lihat NativeScaleView)
+native_view = NativeScaleView() if settings.get("render_native_scale", False) else None
+
 # Set zoom slider initial value
 try:
     main_menu.zoom_slider.value = initial_zoom * 100
@@ -160,6 +169,7 @@ ending_screen = None
 music_manager = None
 map_collision = None
 tiled_map = None
+map_manager = None
 map_obj = None
 
 current_challenge_quest_index = -1
@@ -172,11 +182,28 @@ print(f"[INFO] Available Resolutions: {len(available_resolutions)}")
 print("=" * 60)
 
 
+def change_map(transition):
+    """Pindah ke map tujuan transition (map sudah di-prefetch oleh map_manager)"""
+    global tiled_map, map_collision
+
+    try:
+        tiled_map, map_collision = map_manager.activate(transition['target_map'])
+    except Exception as e:
+        print(f"[ERROR] Failed to load map {transition['target_map']}: {e}")
+        return
+
+    spawns = tiled_map.get_spawn_points()
+    spawn = spawns.get(transition['target_spawn']) or spawns.get('player')
+    if spawn:
+        player.x, player.y = spawn
+    print(f"[MAP] Entered {transition['target_map']}")
+
+
 def initialize_game(player_name, load_save_data=None):
     """Initialize atau reset game"""
     global player, npc_manager, quest_manager, dialogue_box, code_challenge_box
     global ending_choice, ending_screen, music_manager, map_collision
-    global tiled_map, map_obj, game_state, USE_TILED
+    global tiled_map, map_manager, map_obj, game_state, USE_TILED
 
     print("\n[GAME] Initializing game...")
 
@@ -184,8 +211,12 @@ def initialize_game(player_name, load_save_data=None):
     if USE_TILED:
         print("Loading Tiled map...")
         try:
-            tiled_map = TiledMap("maps/campus.tmx")
-            map_collision = TiledMapCollision(tiled_map)
+            if map_manager is None:
+                # Warna sama dengan screen.fill di loop game (back-buffer map opaque)
+                map_manager = MapManager(background_color=(30, 150, 50),
+                                         streaming=settings.get("map_streaming", False),
+                                         collision_backend=settings.get("collision_backend", "geometric"))
+            tiled_map, map_collision = map_manager.activate("maps/campus.tmx")
             spawns = tiled_map.get_spawn_points()
             player_spawn = spawns.get('player', (200, 100))
             print("[OK] Tiled map loaded!")
@@ -356,6 +387,9 @@ def apply_settings(new_width, new_height, new_fullscreen):
 
     pygame.display.set_caption("Simulasi AMIK")
 
+    # Display baru: convert ulang semua image ke format display-nya
+    image_loader.reconvert_all()
+
     # Use actual surface size (handles DPI/scaling / compositor differences)
     real_w, real_h = screen.get_size()
     SCREEN_WIDTH = real_w
@@ -748,14 +782,29 @@ while running:
                 newgame_warning_timer -= 1
 
     elif current_screen == "game":
+        if USE_TILED and map_manager:
+            map_manager.collect()
+        # Hot reload map yang sedang diedit di Tiled (posisi player & quest tetap)
+        if USE_TILED and tiled_map and settings.get("map_hot_reload", False):
+            map_changes = tiled_map.poll_hot_reload()
+            if map_changes:
+                map_collision.apply_map_changes(map_changes)
+
         if pause_menu.active:
             pause_menu.update()
         else:
             dt = clock.get_time()
+            if USE_TILED:
+                # Clock bersama untuk animasi tile Tiled (berhenti saat pause)
+                animation_clock.tick(dt)
 
             if game_state == "playing":
                 if not dialogue_box.active:
                     player.update(map_collision, dt)
+                    if USE_TILED and map_manager:
+                        transition = map_manager.find_transition(player.get_rect())
+                        if transition:
+                            change_map(transition)
                 else:
                     player.sprite.update(dt)
                 dialogue_box.update()
@@ -861,15 +910,30 @@ while running:
         if game_state == "ending_screen":
             ending_screen.draw(screen, quest_manager.completed_quests)
         else:
+            # World (map, NPCs, player) digambar ke world_screen; dengan
+            # native_view ini surface 1:1 yang di-scale sekali ke screen
+            world_screen = screen
+            if native_view:
+                world_screen = native_view.begin(screen)
+                if world_screen is not screen:
+                    world_screen.fill((30, 150, 50))
+
             # Draw map
             if USE_TILED and tiled_map:
-                tiled_map.draw(screen)
+                tiled_map.draw(world_screen)
             elif map_obj:
-                map_obj.draw(screen)
+                map_obj.draw(world_screen)
 
             # Draw NPCs & player
-            npc_manager.draw_all(screen, player)
-            player.draw(screen)
+            npc_manager.draw_all(world_screen, player)
+            player.draw(world_screen)
+
+            # Map layers yang digambar di atas entities
+            if USE_TILED and tiled_map:
+                tiled_map.draw_foreground(world_screen)
+
+            if native_view:
+                native_view.end(screen)
 
             # UI
             if game_state in ["playing", "code_challenge"]:
@@ -897,7 +961,8 @@ while running:
                     f"FPS: {fps}",
                     f"Player: ({int(player.x)}, {int(player.y)})",
                     f"Quests: {len(quest_manager.active_quests)}/5",
-                    f"Progress: {quest_manager.total_progress}/100"
+                    f"Progress: {quest_manager.total_progress}/100",
+                    f"Cache: {global_budget.used_bytes / MB:.0f}/{global_budget.limit_bytes / MB:.0f} MB"
                 ]
 
                 for i, text in enumerate(debug_texts):
@@ -914,5 +979,9 @@ while running:
 print("\n[GAME] Shutting down...")
 if music_manager:
     music_manager.stop()
+if map_manager:
+    map_manager.close()
+for line in global_budget.report():
+    print(line)
 pygame.quit()
 sys.exit()
@@ -0,0 +1,228 @@
+"""
+Collision mask backend vs geometric backend (TiledMapCollision) pada maps/campus.tmx
+
+campus.tmx tidak punya tile dengan property solid, jadi sebagian GID di
+collision layer ditandai solid dulu supaya grid tile ikut teruji.
+"""
+
+import math
+import os
+import random
+import sys
+import time
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.tiled_map import TiledMap, TiledMapCollision, SWEEP_EPSILON  # noqa: E402
+
+MAP_FILE = os.path.join(ROOT, 'maps', 'campus.tmx')
+# Batas waktu menunggu worker streaming (detik)
+STREAM_TIMEOUT = 10.0
+
+
+def setUpModule():
+    global _old_cwd
+    _old_cwd = os.getcwd()
+    os.chdir(ROOT)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+
+def tearDownModule():
+    os.chdir(_old_cwd)
+
+
+def _mark_solid(tiled_map, every=3):
+    """Tandai setiap GID ke-every di collision layers sebagai solid"""
+    gids = sorted(tiled_map._collect_used_gids(tiled_map.get_collision_layers()))[::every]
+    for gid in gids:
+        tiled_map.tile_properties.setdefault(gid, {})['solid'] = 'true'
+    tiled_map._solid_lut = None
+    tiled_map.get_solid_lut()
+    return gids
+
+
+def _map_bounds(collision):
+    """(left, top, right, bottom) world pixels yang mencakup tile dan shapes"""
+    tiled_map = collision.map
+    keys = list(collision.collision_chunks) or [(0, 0)]
+    chunk_w, chunk_h = collision._chunk_size
+    left = min(x for x, _ in keys) * tiled_map.tile_width
+    top = min(y for _, y in keys) * tiled_map.tile_height
+    right = (max(x for x, _ in keys) + chunk_w) * tiled_map.tile_width
+    bottom = (max(y for _, y in keys) + chunk_h) * tiled_map.tile_height
+    return left, top, right, bottom
+
+
+def _box_overlaps_mask(collision, left, top, width, height):
+    """True jika pixel yang ditempati box (float) ada yang solid di mask"""
+    x0 = math.floor(left + SWEEP_EPSILON)
+    y0 = math.floor(top + SWEEP_EPSILON)
+    x1 = math.ceil(left + width - SWEEP_EPSILON)
+    y1 = math.ceil(top + height - SWEEP_EPSILON)
+    return collision._mask_area_solid(x0, y0, x1 - x0, y1 - y0)
+
+
+class CollisionBackendTest(unittest.TestCase):
+    """Mask backend harus menjawab sama dengan geometric (kecuali tepi yang bersentuhan)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.map = TiledMap(MAP_FILE)
+        cls.solid_gids = _mark_solid(cls.map)
+        cls.geometric = TiledMapCollision(cls.map)
+        cls.mask = TiledMapCollision(cls.map, backend='mask')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.map.close()
+
+    def _sample_points(self, count, rng):
+        left, top, right, bottom = _map_bounds(self.geometric)
+        points = [(rng.randint(left, right), rng.randint(top, bottom)) for _ in range(count)]
+        # Titik di sekitar polygon (tepi miring paling rawan beda)
+        polygons = [shape['polygon'].bbox for shape in self.geometric.collision_shapes
+                    if shape['type'] == 'polygon']
+        for _ in range(count):
+            bbox = rng.choice(polygons)
+            points.append((rng.randint(int(bbox[0]) - 2, int(bbox[2]) + 2),
+                           rng.randint(int(bbox[1]) - 2, int(bbox[3]) + 2)))
+        return points
+
+    def test_solid_tiles_present(self):
+        solid = sum(1 for _ in self.geometric.solid_tiles_in(-10000, -10000, 20000, 20000))
+        self.assertGreater(solid, 0)
+
+    def test_position_solid_matches(self):
+        rng = random.Random(3)
+        mismatches = [(x, y) for x, y in self._sample_points(20000, rng)
+                      if self.geometric.is_position_solid(x, y) != self.mask.is_position_solid(x, y)]
+        self.assertEqual(mismatches, [])
+
+    def test_rect_colliding_matches_except_touching_edges(self):
+        rng = random.Random(5)
+        points = self._sample_points(5000, rng)
+        rects = [pygame.Rect(x, y, rng.randint(6, 40), rng.randint(6, 40)) for x, y in points]
+        mismatches = []
+        for rect in rects:
+            if self.geometric.is_rect_colliding(rect) == self.mask.is_rect_colliding(rect):
+                continue
+            mismatches.append(rect)
+            # Beda hanya boleh di tepi: rect sedikit lebih besar collide di kedua
+            # backend, sedikit lebih kecil tidak collide di kedua backend
+            grown, shrunk = rect.inflate(2, 2), rect.inflate(-2, -2)
+            self.assertTrue(self.geometric.is_rect_colliding(grown), rect)
+            self.assertTrue(self.mask.is_rect_colliding(grown), rect)
+            self.assertFalse(self.geometric.is_rect_colliding(shrunk), rect)
+            self.assertFalse(self.mask.is_rect_colliding(shrunk), rect)
+        self.assertLess(len(mismatches), len(rects) // 100)
+
+    def test_move_box_never_enters_mask(self):
+        rng = random.Random(7)
+        spawn = self.map.get_spawn_points().get('player', (200, 100))
+        moves = 0
+        for _ in range(20):
+            x = spawn[0] + rng.uniform(-600, 600)
+            y = spawn[1] + rng.uniform(-600, 600)
+            if _box_overlaps_mask(self.mask, x, y, 24, 24):
+                continue
+            for step in range(150):
+                if step % 15 == 0:
+                    angle = rng.uniform(0, 2 * math.pi)
+                    speed = rng.choice([2, 5, 9, 40, 150])
+                    vx, vy = math.cos(angle) * speed, math.sin(angle) * speed
+                new_x, new_y, _, _ = self.mask.move_box(x, y, 24, 24, vx, vy)
+                # Tidak masuk pixel solid, juga di tengah jalan (tidak tembus)
+                for fraction in (0.25, 0.5, 0.75, 1.0):
+                    self.assertFalse(_box_overlaps_mask(self.mask, x + (new_x - x) * fraction, y, 24, 24))
+                    self.assertFalse(_box_overlaps_mask(self.mask, new_x, y + (new_y - y) * fraction, 24, 24))
+                x, y = new_x, new_y
+                moves += 1
+        self.assertGreater(moves, 0)
+
+    def test_sweep_stops_near_geometric_contact(self):
+        rng = random.Random(11)
+        spawn = self.map.get_spawn_points().get('player', (200, 100))
+        compared = 0
+        for _ in range(3000):
+            x = spawn[0] + rng.uniform(-800, 800)
+            y = spawn[1] + rng.uniform(-800, 800)
+            if self.geometric.is_rect_colliding(pygame.Rect(math.floor(x) - 1, math.floor(y) - 1, 27, 27)):
+                continue
+            dx, dy = rng.choice([(60, 0), (-60, 0), (0, 60), (0, -60)])
+            t_geo, normal_geo = self.geometric.sweep_box(x, y, 24, 24, dx, dy)
+            t_mask, normal_mask = self.mask.sweep_box(x, y, 24, 24, dx, dy)
+            # Tepi polygon di-rasterize per pixel: jarak tempuh beda < 2 pixel
+            # (kontak di ujung gerakan boleh hanya terdeteksi satu backend)
+            self.assertLess(abs(t_geo - t_mask) * 60, 2.0, (x, y, dx, dy))
+            if normal_geo is not None and normal_mask is not None:
+                self.assertEqual(normal_geo[0] > 0.5, normal_mask[0] > 0.5)
+                self.assertEqual(normal_geo[1] > 0.5, normal_mask[1] > 0.5)
+                compared += 1
+        self.assertGreater(compared, 0)
+
+
+class StreamedCollisionMaskTest(unittest.TestCase):
+    """Mask chunk streaming harus mengikuti chunk yang di-evict lalu di-load ulang"""
+
+    @classmethod
+    def setUpClass(cls):
+        # Compiled cache (dibutuhkan streaming) ditulis oleh load biasa
+        cls.reference_map = TiledMap(MAP_FILE)
+        _mark_solid(cls.reference_map)
+        cls.reference = TiledMapCollision(cls.reference_map)
+        cls.map = TiledMap(MAP_FILE, streaming=True)
+        _mark_solid(cls.map)
+        cls.geometric = TiledMapCollision(cls.map)
+        cls.mask = TiledMapCollision(cls.map, backend='mask')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.map.close()
+        cls.reference_map.close()
+
+    def _pump(self, view, done):
+        deadline = time.monotonic() + STREAM_TIMEOUT
+        while not done():
+            self.assertLess(time.monotonic(), deadline, 'streaming timeout')
+            self.map.update_streaming(*view)
+            time.sleep(0.005)
+
+    def _tile_centers(self, key):
+        tile_w, tile_h = self.map.tile_width, self.map.tile_height
+        chunk_w, chunk_h = self.geometric._chunk_size
+        return [((key[0] + col) * tile_w + tile_w // 2, (key[1] + row) * tile_h + tile_h // 2)
+                for row in range(chunk_h) for col in range(chunk_w)]
+
+    def test_evicted_chunk_rebakes_mask(self):
+        self.assertTrue(self.map.streaming)
+        # Chunk dengan tile solid
+        key = next(key for key, chunk in self.reference.collision_chunks.items() if any(chunk['grid']))
+        points = self._tile_centers(key)
+        expected = [self.reference.is_position_solid(x, y) for x, y in points]
+        self.assertTrue(any(expected))
+
+        tile_w, tile_h = self.map.tile_width, self.map.tile_height
+        near = (key[0] * tile_w, key[1] * tile_h, key[0] * tile_w + 320, key[1] * tile_h + 240)
+        far = (near[0] + 200000, near[1] + 200000, near[2] + 200000, near[3] + 200000)
+
+        self._pump(near, lambda: key in self.map.collision_chunks)
+        self.assertEqual([self.mask.is_position_solid(x, y) for x, y in points], expected)
+        self.assertEqual([self.geometric.is_position_solid(x, y) for x, y in points], expected)
+
+        self._pump(far, lambda: key not in self.map.collision_chunks)
+        self.assertEqual([self.mask.is_position_solid(x, y) for x, y in points],
+                         [self.geometric.is_position_solid(x, y) for x, y in points])
+
+        self._pump(near, lambda: key in self.map.collision_chunks)
+        self.assertEqual([self.mask.is_position_solid(x, y) for x, y in points], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()